@@ -0,0 +1,4 @@
+"""
+Performance benchmarks of the module. Run them with
+`python -m instelec bench` or `python -m benchmarks`.
+"""
@@ -0,0 +1,57 @@
+import argparse
+import sys
+
+from .cases import CASES
+from .runner import (
+    append_history, load_json, regressions, report, run_benchmarks,
+    save_json)
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m instelec bench',
+        description='Measures the wall time and peak memory of the '
+                    'calculations over synthetic installations.')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10, 100, 1000],
+        help='numbers of circuits of the installations, up to 100000')
+    parser.add_argument(
+        '--cases', nargs='+', choices=sorted(CASES), default=None,
+        help='cases to run, all of them by default')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--history', default='bench_history.json',
+        help='JSON file the results are appended to')
+    parser.add_argument(
+        '--baseline', default='bench_baseline.json',
+        help='JSON file with the results to compare to')
+    parser.add_argument(
+        '--save-baseline', action='store_true',
+        help='stores the results as the new baseline')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='fraction above the baseline that fails the run')
+    options = parser.parse_args(args)
+
+    results = run_benchmarks(
+        options.sizes, options.cases, options.repeat, options.seed)
+    print(report(results))
+    append_history(options.history, results)
+
+    if options.save_baseline:
+        save_json(options.baseline, results)
+        print(f'Baseline saved to {options.baseline}.')
+        return 0
+
+    found = regressions(
+        results, load_json(options.baseline, {}), options.threshold)
+    if found:
+        print('Regressions:')
+        print('\n'.join(found))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
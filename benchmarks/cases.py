@@ -0,0 +1,304 @@
+"""
+The benchmark cases. Each case receives an installation made by the
+generator and returns the function to be timed.
+"""
+
+from typing import Callable, Dict
+
+import numpy as np
+
+import instelec as ie
+from instelec.table_registry import registry
+from instelec.parallel import shared_table_keys
+from instelec.short_circuit import feeder_impedances_raw, fault_currents_raw
+from instelec.engines.simultaneity_factor import OutOfRangeError
+from instelec.condutor_dimensioning.exceptions import NotInTableError
+from instelec.condutor_dimensioning.temperature_correction import (
+    TemperatureCorrectionAmbient)
+
+CASES: Dict[str, Callable] = {}
+
+
+def case(func):
+    """
+    Registers a benchmark case by the name of the function.
+    """
+    CASES[func.__name__] = func
+    return func
+
+
+def engines(installation):
+    u = ie.ureg
+    return [
+        ie.Engine(ie.PowerTriangle(power*u.kilovolt_ampere, factor), phases)
+        for power, factor, phases in zip(
+            installation['power'].tolist(),
+            installation['power_factor'].tolist(),
+            installation['phase_num'].tolist()
+        )
+    ]
+
+
+def calculators(installation):
+    return [
+        ie.CupperPVC(method, factor, phases)
+        for method, factor, phases in zip(
+            installation['method'].tolist(),
+            installation['power_factor'].tolist(),
+            installation['phase_num'].tolist()
+        )
+    ]
+
+
+def each(func, *columns):
+    """
+    Calls func with each row of the columns, ignoring the circuits
+    out of the tables.
+    """
+    def run():
+        for args in zip(*columns):
+            try:
+                func(*args)
+            except (NotInTableError, OutOfRangeError):
+                pass
+    return run
+
+
+def tabulated(installation) -> np.ndarray:
+    """
+    Returns which circuits have their power in the simultaneity
+    table, as the table has gaps between its intervals.
+    """
+    table = registry.get('simultaneity')
+    powers = (installation['power']*installation['power_factor']
+              * ie.ureg.kilowatt).to(ie.ureg.horsepower).magnitude
+
+    inside = (table.inf_limits[:, np.newaxis] <= powers)\
+        & (powers <= table.sup_limits[:, np.newaxis])
+    return np.any(inside, axis=0)
+
+
+@case
+def power_triangle_arithmetic(installation):
+    triangles = [eng.power for eng in engines(installation)]
+
+    def run():
+        total = 0
+        for triangle in triangles:
+            total = total + 2*triangle
+        return total
+    return run
+
+
+@case
+def power_triangle_array(installation):
+    u = ie.ureg
+    power = installation['power']*u.kilovolt_ampere
+    factor = installation['power_factor']
+    return lambda: ie.PowerTriangleArray(power, factor).sum()
+
+
+@case
+def engine_current(installation):
+    return each(ie.Engine.current, engines(installation))
+
+
+@case
+def engine_group(installation):
+    # Only the engines whose power is in the simultaneity table, so
+    # that the group can be built.
+    selected = tabulated(installation)
+    count = {
+        eng: num for eng, num, inside in zip(
+            engines(installation),
+            installation['count'].tolist(),
+            selected.tolist()
+        ) if inside
+    }
+
+    def run():
+        group = ie.EngineGroup(count)
+        return group.charge_current()
+    return run
+
+
+@case
+def simultaneity_factor(installation):
+    u = ie.ureg
+    powers = list(
+        installation['power']*installation['power_factor']*u.kilowatt)
+    return each(
+        ie.simultaneity_factor, installation['count'].tolist(), powers)
+
+
+@case
+def simultaneity_factors(installation):
+    u = ie.ureg
+    selected = tabulated(installation)
+    counts = installation['count'][selected]
+    powers = (installation['power']*installation['power_factor'])[selected]
+    powers = powers*u.kilowatt
+    return lambda: ie.simultaneity_factors(counts, powers)
+
+
+@case
+def by_amperage(installation):
+    currents = [eng.current() for eng in engines(installation)]
+    return each(
+        lambda calc, current: calc.by_amperage(current),
+        calculators(installation), currents)
+
+
+@case
+def by_voltage_drop_simple(installation):
+    u = ie.ureg
+    currents = [eng.current() for eng in engines(installation)]
+    distances = list(installation['distance']*u.meter)
+    return each(
+        lambda calc, *args: calc.by_voltage_drop_simple(*args),
+        calculators(installation), currents, distances,
+        installation['max_fall'].tolist())
+
+
+@case
+def by_voltage_drop(installation):
+    u = ie.ureg
+    currents = [eng.current() for eng in engines(installation)]
+    distances = list(installation['distance']*u.meter)
+    return each(
+        lambda calc, *args: calc.by_voltage_drop(*args),
+        calculators(installation), currents, distances,
+        installation['max_fall'].tolist())
+
+
+@case
+def by_short_circuit(installation):
+    u = ie.ureg
+    return each(
+        lambda calc, *args: calc.by_short_circuit(*args),
+        calculators(installation),
+        list(installation['short_circuit_current']*u.kiloampere),
+        list(installation['fault_elimination_time']*u.second))
+
+
+@case
+def protection_condutor(installation):
+    u = ie.ureg
+    currents = [eng.current() for eng in engines(installation)]
+    calcs = calculators(installation)
+    sections = []
+    for calc, current in zip(calcs, currents):
+        try:
+            sections.append(calc.by_amperage(current))
+        except NotInTableError:
+            sections.append(1000*u.millimeter**2)
+    return each(
+        lambda calc, section: calc.protection_condutor(section),
+        calcs, sections)
+
+
+@case
+def select_section(installation):
+    currents = [eng.current_raw() for eng in engines(installation)]
+    calc = ie.CupperPVC('B1', 0.8, 3)
+    return each(
+        calc.select_section_raw,
+        currents,
+        installation['distance'].tolist(),
+        installation['max_fall'].tolist(),
+        installation['short_circuit_current'].tolist(),
+        installation['fault_elimination_time'].tolist())
+
+
+@case
+def dimension_batch(installation):
+    currents = [eng.current_raw() for eng in engines(installation)]
+    calc = ie.CupperPVC('B1', 0.8, 3)
+
+    return lambda: calc.dimension_batch(
+        currents,
+        installation['distance'],
+        installation['max_fall'],
+        installation['short_circuit_current'],
+        installation['fault_elimination_time'],
+        installation['method'],
+        installation['phase_num'],
+        installation['power_factor']
+    )
+
+
+@case
+def temperature_corrections(installation):
+    # Ambient temperatures across the whole table, some of them above
+    # what PVC supports.
+    temperatures = np.linspace(5, 70, len(installation['power']))
+    correction = TemperatureCorrectionAmbient('PVC')
+
+    return lambda: correction.correction_factors_raw(temperatures, 'linear')
+
+
+@case
+def dynamic_ampacity(installation):
+    calc = ie.CupperPVC('B1', 0.8, 3)
+    sections = np.resize(
+        calc.amperage.sections[4:16], len(installation['power']))
+    hours = np.arange(8760)
+    profile = 30 + 10*np.sin(2*np.pi*hours/24)
+
+    return lambda: calc.dynamic_ampacity(sections, profile, 40.0, 0.1)
+
+
+@case
+def fault_currents(installation):
+    calc = ie.CupperPVC('B1', 0.8, 3)
+    size = len(installation['power'])
+    sections = np.resize(calc.amperage.sections[4:16], size)
+    # A radial tree, each circuit fed by one of the ones before.
+    rng = np.random.default_rng(0)
+    parents = (rng.random(size)*np.arange(size)).astype(int) - 1
+    source = ie.source_impedance_raw(20)
+
+    def run():
+        impedances = feeder_impedances_raw(
+            calc, sections, installation['distance'])
+        fault_currents_raw(parents, impedances, source)
+    return run
+
+
+def table_lookups(dtype: str) -> Callable:
+    """
+    Registers the case of the scalar lookups of the amperage, nominal
+    current and voltage drop tables stored as dtype. float16 is how
+    the tables were stored before TABLE_DTYPE. The searches convert
+    the columns to float64 once per calculator, so the dtypes are
+    expected to take the same time, float32 only saving memory.
+    """
+    def lookups(installation):
+        currents = [eng.current_raw() for eng in engines(installation)]
+
+        # The tables of the registry are put back after the
+        # calculators are created, so the other cases use them.
+        previous = registry.snapshot()
+        try:
+            for key in shared_table_keys():
+                registry.preload(key, registry.get(*key).astype(dtype))
+            calcs = calculators(installation)
+        finally:
+            registry.restore(previous)
+
+        def lookup(calc, current, distance, max_fall):
+            section = calc.by_amperage_raw(current)
+            calc.nominal_current_raw(section)
+            calc.by_voltage_drop_raw(current, distance, max_fall)
+
+        return each(
+            lookup, calcs, currents,
+            installation['distance'].tolist(),
+            installation['max_fall'].tolist())
+
+    lookups.__name__ = f'table_lookups_{dtype}'
+    return case(lookups)
+
+
+for _dtype in ('float16', 'float32', 'float64'):
+    table_lookups(_dtype)
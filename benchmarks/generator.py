@@ -0,0 +1,37 @@
+"""
+Generates synthetic installations, with any number of circuits, to
+measure how each calculation scales.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+METHODS = ('A1', 'A2', 'B1', 'B2', 'C', 'D')
+
+
+def synthetic_installation(
+    num_circuits: int,
+    seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Returns the columns of an installation with num_circuits circuits.
+    The powers are in kVA, the distances in m, the short circuit
+    currents in kA and the fault elimination times in s.
+    """
+    rng = np.random.default_rng(seed)
+
+    return {
+        'power': rng.uniform(0.5, 60, num_circuits).round(1),
+        'power_factor': rng.uniform(0.7, 0.95, num_circuits).round(2),
+        'phase_num': rng.choice([1, 3], num_circuits),
+        'method': rng.choice(METHODS, num_circuits),
+        'distance': rng.uniform(5, 150, num_circuits).round(),
+        'max_fall': rng.choice([0.02, 0.03, 0.04], num_circuits),
+        'short_circuit_current': rng.uniform(1, 10, num_circuits).round(1),
+        'fault_elimination_time': rng.choice(
+            [0.01, 0.02, 0.1], num_circuits),
+        # Real projects repeat the same loads, so each engine is
+        # repeated from 1 to 4 times.
+        'count': rng.integers(1, 5, num_circuits),
+    }
@@ -0,0 +1,141 @@
+"""
+Runs the benchmark cases, keeps the history of the results and
+compares them to a stored baseline.
+
+The results are, for each case and number of circuits, the wall time
+in seconds, the best of some repetitions, and the peak memory in
+bytes allocated by python while the case runs, measured by
+tracemalloc in a separate run so it does not slow down the timing.
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from .cases import CASES
+from .generator import synthetic_installation
+
+Results = Dict[str, Dict[str, dict]]
+
+# Differences below these are noise, whatever the threshold.
+TOLERANCES = {'seconds': 1e-3, 'peak_bytes': 64*1024}
+
+
+def measure(run, repeat: int = 3) -> dict:
+    """
+    Returns the wall time and the peak memory of run. A first call,
+    not measured, loads the tables the case uses.
+    """
+    run()
+
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_bytes': peak}
+
+
+def run_benchmarks(
+    sizes: Iterable[int],
+    names: Iterable[str] = None,
+    repeat: int = 3,
+    seed: int = 0
+) -> Results:
+    """
+    Runs each case over synthetic installations of each size. The
+    results are keyed by the case name and then by the size.
+    """
+    names = list(names or CASES)
+    results = {name: {} for name in names}
+
+    for size in sizes:
+        installation = synthetic_installation(size, seed)
+        for name in names:
+            run = CASES[name](installation)
+            results[name][str(size)] = measure(run, repeat)
+
+    return results
+
+
+def load_json(path: Path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_json(path: Path, content) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(content, file, indent=2)
+
+
+def append_history(path: Path, results: Results) -> dict:
+    """
+    Appends the results to the history file, with when and where
+    they were measured. Returns the entry appended.
+    """
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    history = load_json(path, [])
+    history.append(entry)
+    save_json(path, history)
+    return entry
+
+
+def regressions(
+    results: Results,
+    baseline: Results,
+    threshold: float
+) -> List[str]:
+    """
+    Returns a description of every measure that got worse than the
+    baseline by more than the threshold, a fraction of the baseline,
+    and by more than the TOLERANCES. The cases and sizes that are not
+    in both are ignored.
+    """
+    found = []
+    for name, sizes in results.items():
+        for size, measures in sizes.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+
+            for key, value in measures.items():
+                limit = max(reference[key]*(1 + threshold),
+                            reference[key] + TOLERANCES.get(key, 0))
+                if value > limit:
+                    found.append(
+                        f'{name}[{size}] {key}: {value:.6g} > '
+                        f'{reference[key]:.6g} (+{threshold:.0%})')
+    return found
+
+
+def report(results: Results) -> str:
+    """
+    Returns the results as a text table.
+    """
+    lines = [f'{"case":<28}{"circuits":>10}{"seconds":>14}{"peak (KiB)":>14}']
+    for name, sizes in results.items():
+        for size, measures in sizes.items():
+            lines.append(
+                f'{name:<28}{size:>10}{measures["seconds"]:>14.6f}'
+                f'{measures["peak_bytes"]/1024:>14.1f}')
+    return '\n'.join(lines)
@@ -1,9 +1,57 @@
 """
 Imports only the classes and functions with which the user
 should interact.
+
+The names are loaded on first access (PEP 562), so importing the
+module is fast and does not import pandas, numpy or pint until
+they are needed.
 """
 
-from .settings import ureg, VOLTAGE_FF, VOLTAGE_FN
-from .power_triangle import PowerTriangle
-from .engines import Engine, EngineGroup, simultaneity_factor
-from .condutor_dimensioning import CupperPVC, CupperEPR, CupperXLPE
+import importlib
+
+# Public names and the modules they are loaded from.
+_LAZY_NAMES = {
+    'ureg': '.settings',
+    'VOLTAGE_FF': '.settings',
+    'VOLTAGE_FN': '.settings',
+    'PowerTriangle': '.power_triangle',
+    'PowerTriangleArray': '.power_triangle',
+    'Engine': '.engines',
+    'EngineGroup': '.engines',
+    'simultaneity_factor': '.engines',
+    'simultaneity_factors': '.engines',
+    'balance_phases': '.engines',
+    'LoadProfile': '.engines',
+    'CupperPVC': '.condutor_dimensioning',
+    'CupperEPR': '.condutor_dimensioning',
+    'CupperXLPE': '.condutor_dimensioning',
+    'Load': '.installation',
+    'Board': '.installation',
+    'Feeder': '.installation',
+    'dimension_project': '.parallel',
+    'dimension_schedule': '.schedule',
+    'short_circuit_study': '.short_circuit',
+    'source_impedance_raw': '.short_circuit',
+    'registry': '.table_registry',
+    'memo': '.condutor_dimensioning.memo',
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+
+    # Cached, so the next accesses do not come back here.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
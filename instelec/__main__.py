@@ -1,6 +1,8 @@
+import argparse
 import os
 import sys
 import shutil
+import time
 from pathlib import Path
 
 
@@ -25,15 +27,108 @@ def create_default_start_files(dst):
             shutil.copytree(source_item, destination_item)
 
 
+def compile_tables():
+    from . import settings
+    from .table_bundle import TableBundle, compile_tables as compile_bundle
+
+    bundle_path = compile_bundle(settings)
+    TableBundle(bundle_path, verify=True)
+    print(f'Tables compiled to {bundle_path}.')
+
+
+def bench(args):
+    try:
+        from benchmarks.__main__ import main
+    except ImportError:
+        print('The benchmarks are run from the root of the repository.')
+        return 1
+
+    return main(args)
+
+
+def dimension(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m instelec dimension',
+        description='Dimensions the condutors of every engine of a load '
+                    'schedule, a CSV or Parquet file with the columns '
+                    'power (kVA), power_factor, phase_num and method.')
+    parser.add_argument('schedule', help='the load schedule')
+    parser.add_argument(
+        '-o', '--output', required=True, help='file the sections are written to')
+    parser.add_argument(
+        '--material', choices=['cupper', 'aluminium'], default='cupper')
+    parser.add_argument(
+        '--insulator', choices=['PVC', 'EPR', 'XLPE'], default='PVC')
+    parser.add_argument(
+        '--temperature', type=float,
+        help='ambient temperature, in °C, of the rows without one or '
+             'with a blank one')
+    parser.add_argument(
+        '--grouping', type=int,
+        help='number of grouped circuits of the rows without one or '
+             'with a blank one')
+    parser.add_argument(
+        '--workers', type=int, default=0,
+        help='number of processes, 0 to dimension in this one')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument(
+        '--format', choices=['csv', 'parquet'],
+        help='format of the output, by default given by its extension')
+    options = parser.parse_args(args)
+
+    from .schedule import dimension_schedule
+
+    start = time.perf_counter()
+    rows = dimension_schedule(
+        options.schedule,
+        options.output,
+        chunk_size=options.chunk_size,
+        defaults={
+            'calculator': options.material.capitalize() + options.insulator,
+            'grouping': options.grouping,
+            'temperature': options.temperature,
+        },
+        workers=options.workers,
+        file_format=options.format
+    )
+    print(f'{rows} circuits dimensioned to {options.output} in '
+          f'{time.perf_counter() - start:.2f} s.')
+    return 0
+
+
+def serve(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m instelec serve',
+        description='Answers sizing requests, lines of JSON, on a unix '
+                    'socket with the tables and units already loaded.')
+    parser.add_argument('--socket', default='/tmp/instelec.sock')
+    options = parser.parse_args(args)
+
+    from .server import serve as serve_socket
+
+    print(f'Serving on {options.socket}.')
+    serve_socket(options.socket)
+    return 0
+
+
 def run_command_line():
     args = sys.argv[1:]
 
+    if args[:1] == ['bench']:
+        sys.exit(bench(args[1:]))
+    if args[:1] == ['dimension']:
+        sys.exit(dimension(args[1:]))
+    if args[:1] == ['serve']:
+        sys.exit(serve(args[1:]))
+
     if len(args) != 1:
         return NotImplemented
 
     if args[0] == 'settings':
         destination_directory = ''
         create_default_start_files(destination_directory)
+    elif args[0] == 'compile-tables':
+        compile_tables()
     else:
         return NotImplemented
 
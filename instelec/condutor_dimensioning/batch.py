@@ -0,0 +1,376 @@
+"""
+Dimensions whole arrays of circuits at once.
+
+The arrays are plain magnitudes in fixed units (A, m, kA and s),
+although quantities are accepted and converted once. The sections
+are searched with np.searchsorted over the tables of a calculator
+and the circuits that fall out of the tables are masked instead of
+raising NotInTableError.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ..settings import ureg, VOLTAGE_FF_RAW, VOLTAGE_FN_RAW
+from .selection import CRITERIA
+
+
+class BatchSections(NamedTuple):
+    """
+    Sections, in mm², chosen for each circuit of a batch. The
+    criteria that were not requested are None.
+    """
+    amperage: np.ma.MaskedArray
+    voltage_drop: Optional[np.ma.MaskedArray]
+    short_circuit: Optional[np.ma.MaskedArray]
+    phase: np.ma.MaskedArray
+    protection: np.ma.MaskedArray
+
+
+def magnitudes(values, unit) -> np.ndarray:
+    """
+    Returns the values as a float array in the given unit. Plain
+    numbers are assumed to be in that unit already.
+    """
+    if isinstance(values, ureg.Quantity):
+        values = values.to(unit).magnitude
+    return np.asarray(values, dtype=float)
+
+
+def round_up(
+    sections: np.ndarray,
+    values: np.ndarray,
+    limits: np.ndarray = None
+) -> np.ma.MaskedArray:
+    """
+    Returns, for each value, the first section whose limit is
+    bigger or equal to it. The limits default to the sections
+    themselves and must be sorted. The values above the last limit
+    are masked.
+    """
+    if limits is None:
+        limits = sections
+
+    idx = np.searchsorted(limits, values)
+    missing = idx == len(limits)
+    idx[missing] = 0
+    return np.ma.masked_array(sections[idx], mask=missing)
+
+
+def by_amperage(
+    section,
+    currents: np.ndarray,
+    instalation_methods: np.ndarray,
+    phase_nums: np.ndarray
+) -> np.ma.MaskedArray:
+    """
+    Vectorized CondutorSection.by_amperage, without the minimum
+    section. Circuits whose method and number of phases have no
+    column in the table are masked.
+    """
+    assert np.all(np.isin(phase_nums, (1, 3))),\
+        'O motor deve ser monofásico ou trifásico.'
+
+    amperage = section.amperage
+    sections = amperage.sections
+    currents = currents/amperage.correction
+
+    result = np.ma.masked_all(currents.shape)
+    for method in np.unique(instalation_methods):
+        for phase_num in np.unique(phase_nums):
+            selected = (instalation_methods == method)\
+                & (phase_nums == phase_num)
+            col = amperage.column_name(method, phase_num)
+            if not np.any(selected) or col not in amperage.table:
+                continue
+
+            result[selected] = round_up(
+                sections,
+                currents[selected],
+                amperage.column(method, phase_num)
+            )
+
+    return result
+
+
+def by_voltage_drop_simple(
+    section,
+    currents: np.ndarray,
+    distances: np.ndarray,
+    max_falls: np.ndarray,
+    phase_nums: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized CondutorSection.by_voltage_drop_simple. Returns NaN
+    where the number of phases is not 1 or 3.
+    """
+    resistivity = section.electrical_resistivity.to(
+        ureg.ohm*ureg.meter).magnitude
+    factors = np.select(
+        [phase_nums == 1, phase_nums == 3],
+        [2/VOLTAGE_FN_RAW,
+         np.sqrt(3)/VOLTAGE_FF_RAW],
+        np.nan
+    )
+
+    # From m² to mm².
+    return 1e6*factors*resistivity*distances*currents/max_falls
+
+
+def by_voltage_drop_table(
+    section,
+    currents: np.ndarray,
+    distances: np.ndarray,
+    max_falls: np.ndarray,
+    power_factors: np.ndarray
+) -> np.ma.MaskedArray:
+    """
+    Vectorized search of the voltage drop table, the first section
+    whose drop does not exceed the maximum one.
+    """
+    voltage_drop = section.voltage_drop
+    limits = voltage_drop.impedance_limits(currents, distances, max_falls)
+
+    factors, inverse = np.unique(power_factors, return_inverse=True)
+    keys = voltage_drop.impedance_keys_of(factors)
+
+    # Counts the keys of each circuit below its limit, as
+    # np.searchsorted does, one row of the table at a time.
+    idx = np.zeros(limits.shape, dtype=int)
+    for row in keys:
+        idx += row[inverse.reshape(limits.shape)] < -limits
+
+    missing = idx == len(voltage_drop.sections)
+    idx[missing] = 0
+    return np.ma.masked_array(voltage_drop.sections[idx], mask=missing)
+
+
+def by_voltage_drop(
+    section,
+    amperage_sections: np.ma.MaskedArray,
+    currents: np.ndarray,
+    distances: np.ndarray,
+    max_falls: np.ndarray,
+    phase_nums: np.ndarray,
+    power_factors: np.ndarray
+) -> np.ma.MaskedArray:
+    """
+    Vectorized CondutorSection.by_voltage_drop, without the minimum
+    section. Receives the sections by amperage, with the minimum
+    section, to choose between the simple and the table methods.
+    """
+    simple = round_up(
+        section.amperage.sections,
+        by_voltage_drop_simple(
+            section, currents, distances, max_falls, phase_nums)
+    )
+    small = amperage_sections.filled(np.inf) <= 25
+
+    result = by_voltage_drop_table(
+        section, currents, distances, max_falls, power_factors)
+    use_simple = small & ~np.ma.getmaskarray(simple)
+    result[use_simple] = simple[use_simple]
+
+    result[np.ma.getmaskarray(amperage_sections)] = np.ma.masked
+    return result
+
+
+def by_short_circuit(
+    section,
+    short_circuit_currents: np.ndarray,
+    fault_elimination_times: np.ndarray
+) -> np.ma.MaskedArray:
+    """
+    Vectorized CondutorSection.by_short_circuit, without the minimum
+    section.
+    """
+    min_temp = section.continuous_service_max_temperature.magnitude
+    max_temp = section.sc_limit_temperature.magnitude
+
+    result = 1/0.34*np.sqrt(fault_elimination_times)*short_circuit_currents
+    result /= np.sqrt(np.log10((234 + max_temp)/(234 + min_temp)))
+
+    return round_up(section.amperage.sections, result)
+
+
+def protection_condutor(
+    section,
+    phase_sections: np.ma.MaskedArray
+) -> np.ma.MaskedArray:
+    """
+    Vectorized CondutorSection.protection_condutor.
+    """
+    phase = phase_sections.filled(np.nan)
+    result = np.select(
+        [phase <= 16, phase <= 35], [phase, 16], 0.5*phase)
+
+    result = round_up(section.amperage.sections, result)
+    result[np.ma.getmaskarray(phase_sections)] = np.ma.masked
+    return result
+
+
+class BatchSelection(NamedTuple):
+    """
+    Vectorized selection.SectionSelection: the sections, in mm², of
+    each criterion, without the minimum section, the ones chosen and
+    the names of the criteria that chose them. The circuits out of
+    the tables are masked, and their criterion is the one out of the
+    tables.
+    """
+    amperage: np.ma.MaskedArray
+    voltage_drop: Optional[np.ma.MaskedArray]
+    short_circuit: Optional[np.ma.MaskedArray]
+    min_section: float
+    section: np.ma.MaskedArray
+    criterion: np.ndarray
+
+
+def criteria(
+    section,
+    currents,
+    distances=None,
+    max_falls=None,
+    short_circuit_currents=None,
+    fault_elimination_times=None,
+    instalation_methods=None,
+    phase_nums=None,
+    power_factors=None
+) -> BatchSelection:
+    """
+    Computes the sections of every criterion, without the minimum
+    section, of each circuit. See dimension_batch. The sections
+    chosen and their criteria are left to select_sections, as None.
+    """
+    currents = np.atleast_1d(magnitudes(currents, ureg.ampere))
+    shape = currents.shape
+
+    if instalation_methods is None:
+        instalation_methods = section.method
+    if phase_nums is None:
+        phase_nums = section.phase_num
+    if power_factors is None:
+        power_factors = section.power_factor
+
+    instalation_methods = np.broadcast_to(
+        np.asarray(instalation_methods, dtype=str), shape)
+    phase_nums = np.broadcast_to(np.asarray(phase_nums, dtype=int), shape)
+    power_factors = np.broadcast_to(
+        np.asarray(power_factors, dtype=float), shape)
+
+    min_section = section.min_section.to(ureg.millimeter**2).magnitude
+
+    amperage = by_amperage(
+        section, currents, instalation_methods, phase_nums)
+
+    voltage_drop = None
+    if distances is not None:
+        voltage_drop = by_voltage_drop(
+            section,
+            np.ma.maximum(amperage, min_section),
+            currents,
+            np.broadcast_to(magnitudes(distances, ureg.meter), shape),
+            np.broadcast_to(magnitudes(max_falls, ''), shape),
+            phase_nums,
+            power_factors
+        )
+
+    short_circuit = None
+    if short_circuit_currents is not None:
+        short_circuit = by_short_circuit(
+            section,
+            np.broadcast_to(
+                magnitudes(short_circuit_currents, ureg.kiloampere), shape),
+            np.broadcast_to(
+                magnitudes(fault_elimination_times, ureg.second), shape)
+        )
+
+    return BatchSelection(
+        amperage, voltage_drop, short_circuit, min_section, None, None)
+
+
+def select_sections(section, currents, *args, **kwargs) -> BatchSelection:
+    """
+    Vectorized selection.select_section, with the arguments of
+    dimension_batch. Each circuit takes the biggest section of the
+    criteria, the ties going to the first one of CRITERIA.
+    """
+    result = criteria(section, currents, *args, **kwargs)
+
+    criteria_sections = (
+        result.amperage,
+        result.voltage_drop,
+        result.short_circuit,
+        np.full(result.amperage.shape, result.min_section)
+    )
+    names, sections = [], []
+    for name, values in zip(CRITERIA, criteria_sections):
+        if values is not None:
+            names.append(name)
+            sections.append(np.ma.filled(values, np.inf))
+
+    sections = np.stack(sections)
+    top = np.argmax(sections, axis=0)
+    chosen = np.ma.masked_invalid(
+        np.take_along_axis(sections, top[np.newaxis], axis=0)[0])
+    return result._replace(section=chosen, criterion=np.array(names)[top])
+
+
+def dimension_batch(
+    section,
+    currents,
+    distances=None,
+    max_falls=None,
+    short_circuit_currents=None,
+    fault_elimination_times=None,
+    instalation_methods=None,
+    phase_nums=None,
+    power_factors=None
+) -> BatchSections:
+    """
+    Dimensions every circuit with the tables and material of the
+    calculator section. The instalation methods, numbers of phases
+    and power factors default to the calculator ones.
+
+    The voltage drop criterion needs the distances and max_falls,
+    and the short circuit criterion needs the short circuit
+    currents and fault elimination times. The phase section is the
+    biggest between the criteria computed.
+    """
+    result = criteria(
+        section,
+        currents,
+        distances,
+        max_falls,
+        short_circuit_currents,
+        fault_elimination_times,
+        instalation_methods,
+        phase_nums,
+        power_factors
+    )
+    min_section = result.min_section
+
+    amperage = np.ma.maximum(result.amperage, min_section)
+    criteria_sections = [amperage]
+
+    voltage_drop = None
+    if result.voltage_drop is not None:
+        voltage_drop = np.ma.maximum(result.voltage_drop, min_section)
+        criteria_sections.append(voltage_drop)
+
+    short_circuit = None
+    if result.short_circuit is not None:
+        short_circuit = np.ma.maximum(result.short_circuit, min_section)
+        criteria_sections.append(short_circuit)
+
+    phase = criteria_sections[0]
+    for criterion in criteria_sections[1:]:
+        phase = np.ma.maximum(phase, criterion)
+
+    return BatchSections(
+        amperage,
+        voltage_drop,
+        short_circuit,
+        phase,
+        protection_condutor(section, phase)
+    )
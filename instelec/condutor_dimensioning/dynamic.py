@@ -0,0 +1,111 @@
+"""
+Rates the ampacity of circuits at each step of a profile of the
+ambient temperature, usually the 8760 hours of a year, instead of
+only for its worst hour.
+
+The correction factors of every step are found at once by the
+temperature correction class of the settings, and the ampacities of
+all the circuits are their products by the nominal currents of the
+sections, so thousands of circuits are rated in a few array
+operations.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .. import settings
+from ..settings import ureg
+from ..utils import import_by_full_name
+from .batch import magnitudes
+from .exceptions import NotInTableError
+
+
+class DynamicAmpacity(NamedTuple):
+    """
+    The ampacity, in A, of each circuit at each step, masked where
+    the insulator does not support the temperature, and whether the
+    margin of the circuit was insufficient at each step.
+    """
+    ampacity: np.ma.MaskedArray
+    insufficient: np.ndarray
+
+    def hours(self, step: float = 1.0) -> np.ndarray:
+        """
+        The time, in hours, each circuit had insufficient margin,
+        each step lasting step hours.
+        """
+        return self.insufficient.sum(axis=-1)*step
+
+
+def nominal_currents(
+    section,
+    sections: np.ndarray,
+    temperature: bool = True
+) -> np.ndarray:
+    """
+    Vectorized CondutorSection.nominal_current_raw. The sections
+    must be in the table. Without temperature, the temperature
+    correction of the calculator is left out.
+    """
+    amperage = section.amperage
+    table_sections = amperage.sections
+
+    idx = np.searchsorted(table_sections, sections)
+    idx = np.minimum(idx, len(table_sections) - 1)
+    if np.any(table_sections[idx] != sections):
+        raise NotInTableError('A seção não se encontra na tabela.')
+
+    correction = amperage.correction
+    if not temperature:
+        correction /= section.temperature_factor
+
+    column = amperage.column(section.method, section.phase_num)
+    return column[idx]*correction
+
+
+def dynamic_ampacity(
+    section,
+    sections,
+    temperatures,
+    currents=None,
+    margin: float = 0.0,
+    interpolation: str = 'step'
+) -> DynamicAmpacity:
+    """
+    Rates the circuits with the instalation method and number of
+    phases of the calculator. The sections, in mm², are a number or
+    one per circuit and the ambient temperatures, in °C, a profile
+    shared by every circuit or one row of steps per circuit. The
+    other corrections of the calculator, as the grouping, are kept,
+    and its temperature correction is replaced by the one of each
+    step.
+
+    The margin is the fraction of the ampacity kept free. A step is
+    insufficient when the currents, in A, a number, one per circuit
+    or one per step of each circuit, exceed the rest of it, or when
+    the insulator does not support the temperature.
+    """
+    sections = magnitudes(sections, ureg.millimeter**2)
+    temperatures = np.atleast_1d(magnitudes(temperatures, ureg.degC))
+
+    base = nominal_currents(section, sections, temperature=False)
+    if base.ndim == 1:
+        # One row of steps per circuit.
+        base = base[:, np.newaxis]
+
+    temperature_class = import_by_full_name(
+        settings.TEMPERATURE_TABLE_AMBIENT_CLASS)
+    factors = temperature_class(section.insulator).correction_factors_raw(
+        temperatures, interpolation)
+    ampacity = factors*base
+
+    if currents is None:
+        insufficient = np.ma.getmaskarray(ampacity)
+    else:
+        currents = magnitudes(currents, ureg.ampere)
+        if currents.ndim == 1 and currents.shape != ampacity.shape:
+            currents = currents[:, np.newaxis]
+        insufficient = np.ma.filled(ampacity*(1 - margin) < currents, True)
+
+    return DynamicAmpacity(ampacity, insufficient)
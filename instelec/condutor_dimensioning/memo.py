@@ -0,0 +1,151 @@
+"""
+An opt-in memo of the sections calculated, for the projects that
+repeat the same circuit many times.
+
+The results are keyed by everything they depend on: the material,
+insulator, instalation method, number of phases, power factor,
+correction factor and minimum section of the calculator, the
+generation of the tables it loaded and the inputs, in the fixed
+units of the raw methods. When the registry is cleared, its
+generation changes and the memo forgets every result.
+
+The memo starts with the size set by DIMENSIONING_CACHE_SIZE in the
+settings, 0 meaning disabled, and is changed with memo.configure.
+"""
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+from .. import settings
+from ..table_registry import registry
+
+EVICTIONS = ('lru', 'fifo')
+
+
+class MemoInfo(NamedTuple):
+    """
+    Statistics of the memo.
+    """
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the lookups answered by the memo.
+        """
+        lookups = self.hits + self.misses
+        return self.hits/lookups if lookups else 0.0
+
+
+class DimensioningMemo:
+    """
+    A bounded memo. When full, the eviction 'lru' discards the
+    result used longest ago and 'fifo' the one stored first.
+    """
+
+    def __init__(self, maxsize: int = 0, eviction: str = 'lru') -> None:
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = registry.generation
+
+        self.hits = 0
+        self.misses = 0
+        self.configure(maxsize, eviction)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def configure(self, maxsize: int, eviction: str = None) -> None:
+        """
+        Changes the size and, optionally, the eviction. A size of 0
+        disables the memo.
+        """
+        if eviction is not None:
+            if eviction not in EVICTIONS:
+                raise ValueError(
+                    f'The eviction must be one of {", ".join(EVICTIONS)}.')
+            self.eviction = eviction
+
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._results) > max(maxsize, 0):
+                self._results.popitem(last=False)
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the result of the key, calling compute if it is not
+        stored. Exceptions are not stored.
+        """
+        with self._lock:
+            if self._generation != registry.generation:
+                self._results.clear()
+                self._generation = registry.generation
+
+            try:
+                result = self._results[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if self.eviction == 'lru':
+                    self._results.move_to_end(key)
+                return result
+
+        result = compute()
+
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def info(self) -> MemoInfo:
+        """
+        Returns the number of hits, misses, results stored and the
+        maximum size.
+        """
+        return MemoInfo(self.hits, self.misses, len(self._results),
+                        self.maxsize)
+
+    def clear(self) -> None:
+        """
+        Forgets every result and resets the statistics.
+        """
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+memo = DimensioningMemo(getattr(settings, 'DIMENSIONING_CACHE_SIZE', 0))
+
+
+def memoized(method):
+    """
+    Stores the results of a raw method of CondutorSection in the
+    memo, when it is enabled.
+    """
+    name = method.__name__
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not memo.enabled:
+            return method(self, *args, **kwargs)
+
+        # Keyed by every argument, given or default, so the calls by
+        # position and by keyword share the result.
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        args = tuple(bound.arguments.values())[1:]
+        return memo.get(
+            (name, self.memo_key(), *args), lambda: method(self, *args))
+
+    return wrapper
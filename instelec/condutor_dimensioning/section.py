@@ -3,27 +3,29 @@ Here are defined the classes that will actually calculate the
 sections of the conductors of the electrical instalation.
 """
 
+import functools
+import threading
 from typing import Self
 import numpy as np
 from ..utils import import_by_full_name
-from ..settings import (
-    ureg, VOLTAGE_FF, VOLTAGE_FN, AMPERAGE_TABLE_CLASS,
-    VOLTAGE_DROP_TABLE_CLASS, GROUPING_TABLE_CLASS,
-    TEMPERATURE_TABLE_AMBIENT_CLASS,
-    TEMPERATURE_TABLE_GROUND_CLASS
-)
-from .tables import (
-    Amperage, VoltageDrop, Grouping
-)
+from .. import settings
+from ..settings import ureg, VOLTAGE_FF_RAW, VOLTAGE_FN_RAW
+from ..table_registry import registry
 from .exceptions import NotInTableError
-from .temperature_correction import TemperatureCorrectionAmbient
+from .batch import (
+    BatchSections, BatchSelection, dimension_batch, select_sections)
+from .dynamic import DynamicAmpacity, dynamic_ampacity
+from .memo import memoized
+from .selection import SectionLadder, SectionSelection, select_section
 
 
-Amperage = import_by_full_name(AMPERAGE_TABLE_CLASS)
-VoltageDrop = import_by_full_name(VOLTAGE_DROP_TABLE_CLASS)
-Grouping = import_by_full_name(GROUPING_TABLE_CLASS)
-TemperatureCorrectionAmbient = import_by_full_name(TEMPERATURE_TABLE_AMBIENT_CLASS)
-TemperatureCorrectionGround = import_by_full_name(TEMPERATURE_TABLE_GROUND_CLASS)
+# The classes that handle the tables are named in the settings and
+# resolved when used, by import_by_full_name, so the ones of the
+# settings reloaded are used by the calculators created after.
+
+# Guards the ladders, as the calculators may be shared between
+# threads, as by the server.
+_ladder_lock = threading.Lock()
 
 
 def above_min_section(func):
@@ -32,9 +34,12 @@ def above_min_section(func):
     bigger or equal to the min_section.
     """
 
+    @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
         section = func(self, *args, **kwargs)
-        return max(section, self.min_section)
+        # The methods decorated return sections in mm², without
+        # units, and the min_section is given in mm².
+        return max(section, self.min_section.magnitude)
 
     return wrapper
 
@@ -75,8 +80,17 @@ class CondutorSection:
         self.power_factor = power_factor
         self.phase_num = phase_num
 
-        self.amperage = Amperage(self.material, self.insulator)
-        self.voltage_drop = VoltageDrop()
+        amperage_class = import_by_full_name(settings.AMPERAGE_TABLE_CLASS)
+        voltage_drop_class = import_by_full_name(
+            settings.VOLTAGE_DROP_TABLE_CLASS)
+
+        self.amperage = amperage_class(self.material, self.insulator)
+        self.voltage_drop = voltage_drop_class()
+        self.tables_generation = registry.generation
+        # The part of the correction of the amperage table due to
+        # the temperature.
+        self.temperature_factor = 1.0
+        self._ladder = None
 
     def __repr__(self) -> str:
         string = [
@@ -88,32 +102,76 @@ class CondutorSection:
         ]
         return '\n'.join(string)
 
+    def memo_key(self) -> tuple:
+        """
+        Everything, besides the inputs, the sections calculated
+        depend on. Used as part of the keys of the memo.
+        """
+        return (
+            self.material,
+            self.insulator,
+            self.method,
+            self.phase_num,
+            self.power_factor,
+            self.amperage.correction,
+            self.min_section.magnitude,
+            self.tables_generation
+        )
+
     def grouping_correction(self, num_of_circuits: int) -> Self:
         """
         Applies gruping factor to the amperage table.
         """
-        self.amperage.table *= Grouping(
-            self.method, num_of_circuits).correction_factor()
+        grouping_class = import_by_full_name(settings.GROUPING_TABLE_CLASS)
+        self.amperage.apply_correction_factors(grouping_class(
+            self.method, num_of_circuits).correction_factor())
         return self
 
-    def temperature_correction(self, temperature: ureg.Quantity) -> Self:
+    def temperature_correction(
+        self,
+        temperature: ureg.Quantity,
+        interpolation: str = 'step'
+    ) -> Self:
         """
         Applies the temperature correction factor to the amperage
-        table.
+        table. With the interpolation 'linear' the factor is
+        interpolated between the temperatures of the table, instead
+        of the one of the next temperature tabulated.
         """
-        self.amperage.table *= TemperatureCorrectionAmbient(
-            self.insulator).correction_factor(temperature)
+        temperature_class = import_by_full_name(
+            settings.TEMPERATURE_TABLE_AMBIENT_CLASS)
+        factor = temperature_class(self.insulator).correction_factor(
+            temperature, interpolation)
+        self.amperage.apply_correction_factors(factor)
+        self.temperature_factor *= float(factor)
         return self
 
+    @memoized
     @above_min_section
+    def by_amperage_raw(self, current: float) -> float:
+        """
+        Same as by_amperage, but receives the current in A and
+        returns the section in mm², without units.
+        """
+        return self.amperage.get_section_raw(
+            current, self.method, self.phase_num)
+
     def by_amperage(
             self, current: ureg.Quantity) -> ureg.Quantity:
         """
         Calculates the section of the conductor by the amperage
         method.
         """
-        return self.amperage.get_section(
-            current, self.method, self.phase_num)
+        section = self.by_amperage_raw(current.to(ureg.ampere).magnitude)
+        return section*ureg.millimeter**2
+
+    def nominal_current_raw(self, section: float) -> float:
+        """
+        Same as nominal_current, but receives the section in mm²
+        and returns the current in A, without units.
+        """
+        return self.amperage.get_nominal_current_raw(
+            section, self.method, self.phase_num)
 
     def nominal_current(
             self, section: ureg.Quantity) -> ureg.Quantity:
@@ -124,31 +182,34 @@ class CondutorSection:
         return self.amperage.get_nominal_current(
             section, self.method, self.phase_num)
 
-    def by_voltage_drop_simple(
+    def by_voltage_drop_simple_raw(
         self,
-        current: ureg.Quantity,
-        distance: ureg.Quantity,
+        current: float,
+        distance: float,
         max_fall: float
-    ) -> ureg.Quantity:
+    ) -> float:
         """
-        Calculates the section by the voltage drop method.
-        It should not be used by the user directly, it's here
-        to by called by the by_voltage_drop method.
+        Same as by_voltage_drop_simple, but receives the current in A
+        and the distance in m and returns the section in mm², without
+        units.
         """
+        resistivity = self.electrical_resistivity.to(
+            ureg.ohm*ureg.meter).magnitude
+
         if self.phase_num == 1:
-            section = (2*self.electrical_resistivity *
-                       distance*current)/(max_fall*VOLTAGE_FN)
+            section = (2*resistivity*distance*current)/(
+                max_fall*VOLTAGE_FN_RAW)
         elif self.phase_num == 3:
-            section = (np.sqrt(3)*self.electrical_resistivity *
-                       distance*current)/(max_fall*VOLTAGE_FF)
+            section = (np.sqrt(3)*resistivity*distance*current)/(
+                max_fall*VOLTAGE_FF_RAW)
         else:
             raise NotImplementedError(
                 "Was only implemented for phase_num equals 1 or 3.")
 
-        return section.to(ureg.millimeter**2)
+        # From m² to mm².
+        return 1e6*section
 
-    @above_min_section
-    def by_voltage_drop(
+    def by_voltage_drop_simple(
         self,
         current: ureg.Quantity,
         distance: ureg.Quantity,
@@ -156,33 +217,77 @@ class CondutorSection:
     ) -> ureg.Quantity:
         """
         Calculates the section by the voltage drop method.
+        It should not be used by the user directly, it's here
+        to by called by the by_voltage_drop method.
         """
+        section = self.by_voltage_drop_simple_raw(
+            current.to(ureg.ampere).magnitude,
+            distance.to(ureg.meter).magnitude,
+            max_fall
+        )
+        return section*ureg.millimeter**2
 
-        if self.by_amperage(current) <= 25*ureg.millimeter**2:
-            result = self.by_voltage_drop_simple(
+    @memoized
+    @above_min_section
+    def by_voltage_drop_raw(
+        self,
+        current: float,
+        distance: float,
+        max_fall: float
+    ) -> float:
+        """
+        Same as by_voltage_drop, but receives the current in A and
+        the distance in m and returns the section in mm², without
+        units.
+        """
+        if self.by_amperage_raw(current) <= 25:
+            result = self.by_voltage_drop_simple_raw(
                 current, distance, max_fall)
 
-            for section in self.amperage.table.index:
-                if result.magnitude <= section:
-                    return section * ureg.millimeter**2
+            sections = self.amperage.sections
+            idx = np.searchsorted(sections, result)
+            if idx < len(sections):
+                return float(sections[idx])
 
-        for idx, row in self.voltage_drop.table.iterrows():
-            cos = self.power_factor
-            sin = np.sqrt(1 - cos**2)
+        return self.voltage_drop.get_section_raw(
+            current, distance, max_fall, self.power_factor)
 
-            current = current.to(ureg.ampere)
-            distance = distance.to(ureg.meter)
+    def by_voltage_drop(
+        self,
+        current: ureg.Quantity,
+        distance: ureg.Quantity,
+        max_fall: float
+    ) -> ureg.Quantity:
+        """
+        Calculates the section by the voltage drop method.
+        """
+        section = self.by_voltage_drop_raw(
+            current.to(ureg.ampere).magnitude,
+            distance.to(ureg.meter).magnitude,
+            max_fall
+        )
+        return section*ureg.millimeter**2
 
-            fall = np.sqrt(3)*current*distance
-            fall *= row.R*cos + row.X*sin
-            fall /= 10*1*VOLTAGE_FF
+    @memoized
+    @above_min_section
+    def by_short_circuit_raw(
+        self,
+        simmetric_short_circuit_current: float,
+        fault_elimination_time: float
+    ) -> float:
+        """
+        Same as by_short_circuit, but receives the current in kA and
+        the time in s and returns the section in mm², without units.
+        """
+        min_temp = self.continuous_service_max_temperature.magnitude
+        max_temp = self.sc_limit_temperature.magnitude
 
-            if fall.magnitude <= 100*max_fall:
-                return idx*ureg.millimeter**2
+        result = 1/0.34*np.sqrt(fault_elimination_time)
+        result *= simmetric_short_circuit_current
+        result /= np.sqrt(np.log10((234 + max_temp)/(234 + min_temp)))
 
-        raise NotInTableError('Não corresponde a nenhuma seção tabelada.')
+        return self.round_up_raw(result)
 
-    @above_min_section
     def by_short_circuit(
         self,
         simmetric_short_circuit_current: ureg.Quantity,
@@ -191,23 +296,25 @@ class CondutorSection:
         """
         Calculates the section by the short_circuit method.
         """
+        section = self.by_short_circuit_raw(
+            simmetric_short_circuit_current.to(ureg.kiloampere).magnitude,
+            fault_elimination_time.to(ureg.second).magnitude
+        )
+        return section*ureg.millimeter**2
 
-        min_temp = self.continuous_service_max_temperature.magnitude
-        max_temp = self.sc_limit_temperature.magnitude
-
-        result = 1/0.34 * ureg.millimeter**2 / \
-            (ureg.kiloampere * ureg.second**(1/2))
-        result *= np.sqrt(fault_elimination_time)
-        result *= simmetric_short_circuit_current
-        result /= np.sqrt(np.log10((234 + max_temp)/(234 + min_temp)))
-
-        result = result.to(ureg.millimeter**2)
-
-        for section in self.amperage.table.index:
-            if result.magnitude <= section:
-                return section*ureg.millimeter**2
+    def protection_condutor_raw(self, phase_section: float) -> float:
+        """
+        Same as protection_condutor, but receives and returns the
+        sections in mm², without units.
+        """
+        if phase_section <= 16:
+            result = phase_section
+        elif phase_section <= 35:
+            result = 16
+        else:
+            result = 0.5 * phase_section
 
-        raise NotInTableError('Não corresponde a nenhuma seção tabelada.')
+        return self.round_up_raw(result)
 
     def protection_condutor(
             self, phase_section: ureg.Quantity) -> ureg.Quantity:
@@ -215,19 +322,168 @@ class CondutorSection:
         Receives the section choosen to the phase condutor and
         returns the section of the protection condutor.
         """
+        section = self.protection_condutor_raw(
+            phase_section.to(ureg.millimeter**2).magnitude)
+        return section*ureg.millimeter**2
 
-        if phase_section <= 16 * ureg.millimeter**2:
-            result = phase_section
-        elif phase_section <= 35 * ureg.millimeter**2:
-            result = 16 * ureg.millimeter**2
-        else:
-            result = 0.5 * phase_section
+    def round_up_raw(self, section: float) -> float:
+        """
+        Rounds the section, in mm², up to the next section of the
+        amperage table.
+        """
+        sections = self.amperage.sections
+        idx = np.searchsorted(sections, section)
+        if idx == len(sections):
+            raise NotInTableError('Não corresponde a nenhuma seção tabelada.')
+
+        return float(sections[idx])
+
+    def ladder(self) -> SectionLadder:
+        """
+        The section ladder of the calculator, computed again only
+        when what it depends on changes, as the correction factor.
+        """
+        with _ladder_lock:
+            if self._ladder is None or self._ladder.key != self.memo_key():
+                self._ladder = SectionLadder(self)
+            return self._ladder
 
-        for section in self.amperage.table.index:
-            if result.magnitude <= section:
-                return section*ureg.millimeter**2
+    @memoized
+    def select_section_raw(
+        self,
+        current: float,
+        distance: float = None,
+        max_fall: float = None,
+        short_circuit_current: float = None,
+        fault_elimination_time: float = None
+    ) -> SectionSelection:
+        """
+        Same as select_section, but receives the current in A, the
+        distance in m, the short circuit current in kA and the time in
+        s and returns the sections in mm², without units.
+        """
+        return select_section(
+            self,
+            current,
+            distance,
+            max_fall,
+            short_circuit_current,
+            fault_elimination_time
+        )
 
-        raise NotInTableError('Não corresponde a nenhuma seção tabelada.')
+    def select_section(
+        self,
+        current: ureg.Quantity,
+        distance: ureg.Quantity = None,
+        max_fall: float = None,
+        short_circuit_current: ureg.Quantity = None,
+        fault_elimination_time: ureg.Quantity = None
+    ) -> SectionSelection:
+        """
+        Selects the section by every criterion at once: amperage,
+        voltage drop if the distance is given, short circuit if the
+        short circuit current is given, and the minimum section. The
+        section is the same as the biggest of by_amperage,
+        by_voltage_drop and by_short_circuit, which is returned with
+        the sections of each criterion, without the minimum section,
+        in mm², and the name of the criterion that chose it.
+        """
+        if distance is not None:
+            distance = distance.to(ureg.meter).magnitude
+        if short_circuit_current is not None:
+            short_circuit_current = short_circuit_current.to(
+                ureg.kiloampere).magnitude
+            fault_elimination_time = fault_elimination_time.to(
+                ureg.second).magnitude
+
+        return self.select_section_raw(
+            current.to(ureg.ampere).magnitude,
+            distance,
+            max_fall,
+            short_circuit_current,
+            fault_elimination_time
+        )
+
+    def select_sections(
+        self,
+        currents,
+        distances=None,
+        max_falls=None,
+        short_circuit_currents=None,
+        fault_elimination_times=None,
+        instalation_methods=None,
+        phase_nums=None,
+        power_factors=None
+    ) -> BatchSelection:
+        """
+        Vectorized select_section, with the arguments of
+        dimension_batch. The circuits out of the tables are masked.
+        """
+        return select_sections(
+            self,
+            currents,
+            distances,
+            max_falls,
+            short_circuit_currents,
+            fault_elimination_times,
+            instalation_methods,
+            phase_nums,
+            power_factors
+        )
+
+    def dimension_batch(
+        self,
+        currents,
+        distances=None,
+        max_falls=None,
+        short_circuit_currents=None,
+        fault_elimination_times=None,
+        instalation_methods=None,
+        phase_nums=None,
+        power_factors=None
+    ) -> BatchSections:
+        """
+        Dimensions whole arrays of circuits with the tables of this
+        calculator, corrections included. Takes magnitudes in A, m,
+        kA and s and returns masked arrays of sections in mm², where
+        the masked values are the ones out of the tables.
+
+        The instalation methods, numbers of phases and power factors
+        may vary per circuit and default to the ones of the
+        calculator.
+        """
+        return dimension_batch(
+            self,
+            currents,
+            distances,
+            max_falls,
+            short_circuit_currents,
+            fault_elimination_times,
+            instalation_methods,
+            phase_nums,
+            power_factors
+        )
+
+    def dynamic_ampacity(
+        self,
+        sections,
+        temperatures,
+        currents=None,
+        margin: float = 0.0,
+        interpolation: str = 'step'
+    ) -> DynamicAmpacity:
+        """
+        Rates the ampacity of the sections, in mm², at each step of
+        the ambient temperatures, in °C, a profile as the 8760 hours
+        of a year, or one profile per section. Returns the ampacities,
+        in A, and the steps where the currents, in A, leave less than
+        the margin, a fraction of the ampacity, free.
+
+        The profile replaces the temperature correction of the
+        calculator. See dynamic.dynamic_ampacity.
+        """
+        return dynamic_ampacity(
+            self, sections, temperatures, currents, margin, interpolation)
 
 
 class Cupper:
@@ -238,6 +494,9 @@ class Cupper:
     material = 'cupper'
     electrical_resistivity = 1/56*10**(-6)*(ureg.ohm*ureg.meter)
 
+    lights_min_section = 1.5 * ureg.millimeter**2
+    general_min_section = 2.5 * ureg.millimeter**2
+
     # Just add the lights kwarg to the __init__ method for it
     # be used by the min_section property.
     def __init__(
@@ -262,9 +521,9 @@ class Cupper:
         a cupper wire could have.
         """
         if self.lights:
-            return 1.5 * ureg.millimeter**2
+            return self.lights_min_section
 
-        return 2.5 * ureg.millimeter**2
+        return self.general_min_section
 
 
 class Aluminium:
@@ -0,0 +1,182 @@
+"""
+Selects the section of a circuit by every criterion at once.
+
+The criteria are placed on a ladder, the sections of the amperage
+table: each one gives the index of the first section it accepts and
+the section chosen is the one of the highest index, so the rounding
+up is one search per criterion and the section is looked up once.
+The ladder is computed once per calculator, and again only when its
+correction factor, power factor, method or number of phases change.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ..settings import ureg, VOLTAGE_FF_RAW, VOLTAGE_FN_RAW
+from .exceptions import NotInTableError
+
+# The criteria, in the order that decides the ties.
+CRITERIA = ('amperage', 'voltage_drop', 'short_circuit', 'min_section')
+
+# The biggest section, in mm², by amperage for which the voltage drop
+# is calculated by the simple method.
+SIMPLE_VOLTAGE_DROP_LIMIT = 25
+
+
+class SectionSelection(NamedTuple):
+    """
+    The sections, in mm², required by each criterion, without the
+    minimum section, the one chosen, the biggest of them, and the
+    criterion that chose it. The criteria not requested are None.
+    """
+    amperage: float
+    voltage_drop: Optional[float]
+    short_circuit: Optional[float]
+    min_section: float
+    section: float
+    criterion: str
+
+
+class SectionLadder:
+    """
+    The sections of the amperage table of the calculator and what
+    places the criteria on them.
+    """
+
+    def __init__(self, section) -> None:
+        self.key = section.memo_key()
+
+        amperage = section.amperage
+        self.sections = amperage.sections
+        self.correction = amperage.correction
+        self.ampacities = amperage.column(section.method, section.phase_num)
+
+        min_section = section.min_section.to(ureg.millimeter**2).magnitude
+        self.min_index = int(np.searchsorted(self.sections, min_section))
+        self.simple_limit = int(np.searchsorted(
+            self.sections, SIMPLE_VOLTAGE_DROP_LIMIT, side='right'))
+
+        voltage_drop = section.voltage_drop
+        self.impedance_keys = voltage_drop.impedance_keys(section.power_factor)
+        self.impedance_limits = voltage_drop.impedance_limits
+        # The index on the ladder of each section of the voltage drop
+        # table.
+        self.voltage_drop_indexes = np.searchsorted(
+            self.sections, voltage_drop.sections)
+
+        min_temp = section.continuous_service_max_temperature.magnitude
+        max_temp = section.sc_limit_temperature.magnitude
+        self.short_circuit_divisor = np.sqrt(
+            np.log10((234 + max_temp)/(234 + min_temp)))
+
+        # The terms of CondutorSection.by_voltage_drop_simple_raw, in
+        # the same order, so the sections are the same.
+        resistivity = section.electrical_resistivity.to(
+            ureg.ohm*ureg.meter).magnitude
+        if section.phase_num == 1:
+            self.simple_factor = 2*resistivity
+            self.simple_voltage = VOLTAGE_FN_RAW
+        else:
+            self.simple_factor = np.sqrt(3)*resistivity
+            self.simple_voltage = VOLTAGE_FF_RAW
+
+    def index(self, section: float) -> int:
+        """
+        The index of the first section not smaller than the given
+        one, in mm².
+        """
+        idx = int(np.searchsorted(self.sections, section))
+        if idx == len(self.sections):
+            raise NotInTableError(
+                'Não corresponde a nenhuma seção tabelada.')
+        return idx
+
+    def amperage_index(self, current: float) -> int:
+        """
+        Same as CondutorSection.by_amperage_raw, without the minimum
+        section, as an index of the ladder.
+        """
+        idx = int(np.searchsorted(self.ampacities, current/self.correction))
+        if idx == len(self.ampacities):
+            raise NotInTableError(
+                'A corrente é alta demais, não se encontra na tabela.')
+        return idx
+
+    def voltage_drop_index(
+        self,
+        current: float,
+        distance: float,
+        max_fall: float,
+        amperage_index: int
+    ) -> int:
+        """
+        Same as CondutorSection.by_voltage_drop_raw, without the
+        minimum section, as an index of the ladder. The amperage index
+        must include the minimum section.
+        """
+        if amperage_index < self.simple_limit:
+            result = (self.simple_factor*distance*current)/(
+                max_fall*self.simple_voltage)
+            # From m² to mm².
+            idx = int(np.searchsorted(self.sections, 1e6*result))
+            if idx < len(self.sections):
+                return idx
+
+        limit = self.impedance_limits(current, distance, max_fall)
+        idx = int(np.searchsorted(self.impedance_keys, -limit))
+        if idx == len(self.impedance_keys):
+            raise NotInTableError(
+                'Não corresponde a nenhuma seção tabelada.')
+        return int(self.voltage_drop_indexes[idx])
+
+    def short_circuit_index(
+        self,
+        simmetric_short_circuit_current: float,
+        fault_elimination_time: float
+    ) -> int:
+        """
+        Same as CondutorSection.by_short_circuit_raw, without the
+        minimum section, as an index of the ladder.
+        """
+        result = 1/0.34*np.sqrt(fault_elimination_time)
+        result *= simmetric_short_circuit_current
+        result /= self.short_circuit_divisor
+        return self.index(result)
+
+
+def select_section(
+    section,
+    current: float,
+    distance: float = None,
+    max_fall: float = None,
+    short_circuit_current: float = None,
+    fault_elimination_time: float = None
+) -> SectionSelection:
+    """
+    Selects the section of the circuit by amperage, by voltage drop
+    if the distance is given, by short circuit if the short circuit
+    current is given, and by the minimum section. Receives the
+    magnitudes in A, m, kA and s. Raises NotInTableError if any
+    criterion requires a section above the table.
+    """
+    ladder = section.ladder()
+
+    indexes = [ladder.amperage_index(current), None, None, ladder.min_index]
+    if distance is not None:
+        indexes[1] = ladder.voltage_drop_index(
+            current, distance, max_fall, max(indexes[0], ladder.min_index))
+    if short_circuit_current is not None:
+        indexes[2] = ladder.short_circuit_index(
+            short_circuit_current, fault_elimination_time)
+
+    top = max(idx for idx in indexes if idx is not None)
+    sections = [
+        None if idx is None else float(ladder.sections[idx])
+        for idx in indexes
+    ]
+    return SectionSelection(
+        *sections,
+        sections[indexes.index(top)],
+        CRITERIA[indexes.index(top)]
+    )
@@ -3,30 +3,26 @@ Defines the classes that will search the tables.
 The user is not meant to interact directly with them.
 """
 
-import os
-import pandas as pd
-from ..settings import (
-    ureg, AMPERAGE_TABLE, VOLTAGE_DROP_TABLE, GROUPING_TABLE)
-from .exceptions import NotInTableError
-
+import threading
+from collections import OrderedDict
 
-class Table:
-    filepath: str
-    index_col: str = None
+import numpy as np
+from ..settings import ureg, VOLTAGE_FF_RAW
+from ..table_registry import registry
+from .exceptions import NotInTableError
 
-    def __init__(self) -> None:
-        _, ext = os.path.splitext(filepath)
-        if ext == 'csv':
-            self.df = pd.read_csv(self.filepath, index_col=self.index_col)
-        elif ext == 'xslx':
-            self.df = pd.read_excel(self.filepath, index_col=self.index_col)
-        else:
-            raise NotImplementedError("The only tablefiles implemented are csv and xlsx.")
+# Guards the caches of the tables, as the calculators may be shared
+# between threads, as by the server.
+_cache_lock = threading.Lock()
 
 
 class Amperage:
     """
     Searches the amperage table.
+
+    The table is shared by every calculator and never changed. The
+    correction factors are composed into the correction attribute,
+    and the currents are divided by it before being searched.
     """
 
     # Traduz o número de fase para o número de condutores
@@ -34,23 +30,67 @@ class Amperage:
     CONDUCTORS_NUM = {1: 2, 3: 3}
 
     def __init__(self, material: str, insulator: str) -> None:
-        filepath = AMPERAGE_TABLE[material][insulator]
-        self.table = (
-            pd.read_csv(filepath, index_col='nominal_sections')
-            .astype('float16')
-        )
+        self.table = registry.get('amperage', material, insulator)
+        self.correction = 1.0
+        self._columns = {}
+
+    @classmethod
+    def column_name(cls, instalation_method: str, phase_num: int) -> str:
+        """
+        Returns the name of the column used by the instalation
+        method and number of phases.
+        """
+        condutors_num = cls.CONDUCTORS_NUM.get(phase_num, phase_num)
+        return f'{instalation_method}_{condutors_num}'
+
+    @property
+    def sections(self) -> np.ndarray:
+        """
+        The nominal sections of the table, in mm².
+        """
+        return self.table.index.to_numpy(dtype=float)
+
+    def column(self, instalation_method: str, phase_num: int) -> np.ndarray:
+        """
+        Returns the ampacities, in A, of the instalation method and
+        number of phases as an array aligned with the sections. The
+        correction factors are not applied.
+        """
+        col = self.column_name(instalation_method, phase_num)
+        with _cache_lock:
+            column = self._columns.get(col)
+            if column is None:
+                column = self.table[col].to_numpy(dtype=float)
+                column.flags.writeable = False
+                self._columns[col] = column
+        return column
 
     def apply_correction_factors(self, *factors):
         """
         Aplica os fatores de correção à tabela de ampacidade.
         """
-        correction = 1
         for factor in factors:
-            correction *= factor
-
-        self.table *= correction
+            self.correction *= float(factor)
         return self
 
+    def get_section_raw(
+        self,
+        current: float,
+        instalation_method: str,
+        phase_num: int
+    ) -> float:
+        """
+        Same as get_section, but receives the current in A and
+        returns the section in mm², without units.
+        """
+        column = self.column(instalation_method, phase_num)
+        idx = np.searchsorted(column, current/self.correction)
+        if idx == len(column):
+            raise NotInTableError(
+                'A corrente é alta demais, não se encontra na tabela.')
+
+        return float(self.table.index[idx])
+
     def get_section(
         self,
         current: ureg.Quantity,
@@ -62,19 +102,22 @@ class Amperage:
         instalação e corrente elétrica que passa pelo cabo,
         escolhe a secção do condutor.
         """
-        condutors_num = phase_num
-        if condutors_num == 1:
-            condutors_num = 2
-        col = f'{instalation_method}_{condutors_num}'
-
-        current = current.to(ureg.ampere).magnitude
-        series = self.table[col]
-        for idx, value in series.items():
-            if current <= value:
-                return idx*ureg.millimeter**2
+        section = self.get_section_raw(
+            current.to(ureg.ampere).magnitude, instalation_method, phase_num)
+        return section*ureg.millimeter**2
 
-        raise NotInTableError(
-            'A corrente é alta demais, não se encontra na tabela.')
+    def get_nominal_current_raw(
+        self,
+        section: float,
+        instalation_method: str,
+        phase_num: int
+    ) -> float:
+        """
+        Same as get_nominal_current, but receives the section in mm²
+        and returns the current in A, without units.
+        """
+        col = self.column_name(instalation_method, phase_num)
+        return float(self.table.loc[section, col])*self.correction
 
     def get_nominal_current(
         self,
@@ -86,12 +129,8 @@ class Amperage:
         Retorna a corrente nominal, a máxima corrente que o
         condutor escolhido suporta.
         """
-        condutors_num = phase_num
-        if condutors_num == 1:
-            condutors_num = 2
-        col = f'{instalation_method}_{condutors_num}'
-
-        nominal_current = self.table.loc[section.magnitude, col]
+        nominal_current = self.get_nominal_current_raw(
+            section.magnitude, instalation_method, phase_num)
         return nominal_current * ureg.ampere
 
 
@@ -100,12 +139,103 @@ class VoltageDrop:
     Searches the voltage drop table.
     """
 
+    # Power factors whose impedance keys are kept, the ones used
+    # longest ago discarded first.
+    IMPEDANCE_KEYS_CACHE_SIZE = 64
+
     def __init__(self) -> None:
-        filepath = VOLTAGE_DROP_TABLE
-        self.table = (
-            pd.read_csv(filepath, index_col='section')
-            .astype('float16')
-        )
+        self.table = registry.get('voltage_drop')
+        self._impedance_keys = OrderedDict()
+
+    @property
+    def sections(self) -> np.ndarray:
+        """
+        The sections of the table, in mm².
+        """
+        return self.table.index.to_numpy(dtype=float)
+
+    @property
+    def resistance(self) -> np.ndarray:
+        """
+        The resistances of the table aligned with the sections.
+        """
+        return self.table['R'].to_numpy(dtype=float)
+
+    @property
+    def reactance(self) -> np.ndarray:
+        """
+        The reactances of the table aligned with the sections.
+        """
+        return self.table['X'].to_numpy(dtype=float)
+
+    def impedance_keys(self, power_factor: float) -> np.ndarray:
+        """
+        Returns the smallest effective impedance, R*cos + X*sin, of
+        the sections up to each one, negated so it is increasing and
+        can be searched with np.searchsorted. Computed once for each
+        power factor.
+        """
+        cache = self._impedance_keys
+        with _cache_lock:
+            keys = cache.get(power_factor)
+            if keys is None:
+                keys = self.impedance_keys_of([power_factor])[:, 0].copy()
+                keys.flags.writeable = False
+                cache[power_factor] = keys
+                if len(cache) > self.IMPEDANCE_KEYS_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(power_factor)
+
+        return keys
+
+    def impedance_keys_of(self, power_factors) -> np.ndarray:
+        """
+        Same as impedance_keys for many power factors at once, one
+        column per power factor, without storing them.
+        """
+        power_factors = np.asarray(power_factors, dtype=float)
+        sin = np.sqrt(1 - power_factors**2)
+        impedances = self.resistance[:, np.newaxis]*power_factors\
+            + self.reactance[:, np.newaxis]*sin
+
+        # The first section whose impedance is below a limit is also
+        # the first whose running minimum is, even where the reactance
+        # makes the impedances not decreasing.
+        return -np.minimum.accumulate(impedances, axis=0)
+
+    @staticmethod
+    def impedance_limits(currents, distances, max_falls):
+        """
+        Returns the biggest impedances, per unit of length, that keep
+        the voltage drop, in %, below max_falls. The currents are in
+        A and the distances in m.
+        """
+        falls_per_impedance = np.sqrt(3)*np.multiply(currents, distances)
+        falls_per_impedance /= 10*VOLTAGE_FF_RAW
+        with np.errstate(divide='ignore'):
+            return np.divide(100*np.asarray(max_falls), falls_per_impedance)
+
+    def get_section_raw(
+        self,
+        current: float,
+        distance: float,
+        max_fall: float,
+        power_factor: float
+    ) -> float:
+        """
+        Returns the first section, in mm², whose voltage drop does
+        not exceed max_fall. The current is in A and the distance
+        in m.
+        """
+        keys = self.impedance_keys(power_factor)
+        limit = self.impedance_limits(current, distance, max_fall)
+
+        idx = np.searchsorted(keys, -limit)
+        if idx == len(keys):
+            raise NotInTableError('Não corresponde a nenhuma seção tabelada.')
+
+        return float(self.table.index[idx])
 
 
 class Grouping:
@@ -114,9 +244,7 @@ class Grouping:
     """
 
     def __init__(self, method: str, num_circuits: int) -> None:
-        filepath = GROUPING_TABLE
-        self.table = pd.read_csv(filepath)
-        self.table.index += 1
+        self.table = registry.get('grouping')
 
         self.method = method
         self.num_circuits = num_circuits
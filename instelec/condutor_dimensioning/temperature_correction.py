@@ -3,42 +3,104 @@ Creates the TemperatureCorrection class to access the
 respective table.
 """
 
-import pandas as pd
+from typing import Dict, Tuple
+
 import numpy as np
-from ..settings import TEMPERATURE_TABLE, ureg
+from ..settings import ureg
+from ..table_registry import registry
 from .exceptions import NotInTableError
 
+INTERPOLATIONS = ('step', 'linear')
+
 
 class TemperatureCorrection:
     """
     Accesses the temperature correction table.
+
+    The factors are looked up in the temperatures the insulator
+    supports, the rows without a factor left out. The interpolation
+    'step' uses the factor of the first temperature tabulated not
+    below the one given, 'linear' interpolates between the
+    neighbouring ones. Temperatures below the table use its first
+    factor, temperatures above the last one supported are not in the
+    table.
     """
 
     place = None
 
+    # The temperatures and factors of each place and insulator,
+    # compiled once per generation of the registry.
+    _curves: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+    _generation = None
+
     def __init__(self, insulator) -> None:
-        filepath = TEMPERATURE_TABLE[self.place]
-        self.table = (
-            pd.read_csv(filepath, index_col='temperatura')
-            .astype('float16')
-        )
+        self.table = registry.get('temperature', self.place)
         self.insulator = insulator
 
+    def curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the temperatures, in °C, the insulator supports and
+        their correction factors, as read-only arrays.
+        """
+        cls = TemperatureCorrection
+        if cls._generation != registry.generation:
+            cls._curves = {}
+            cls._generation = registry.generation
+
+        key = (self.place, self.insulator)
+        curve = cls._curves.get(key)
+        if curve is None:
+            factors = self.table[self.insulator].to_numpy(dtype=float)
+            supported = ~np.isnan(factors)
+            temperatures = self.table.index.to_numpy(dtype=float)[supported]
+            factors = factors[supported]
+
+            temperatures.flags.writeable = False
+            factors.flags.writeable = False
+            curve = cls._curves[key] = (temperatures, factors)
+        return curve
+
+    def correction_factors_raw(self, temperatures, interpolation='step'):
+        """
+        Returns the correction factors of the temperatures, in °C, a
+        number or an array. For an array the factors are a masked
+        array, the temperatures not in the table masked. For a number
+        NotInTableError is raised if it is not in the table.
+        """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                f'The interpolation must be one of '
+                f'{", ".join(INTERPOLATIONS)}.')
+
+        table_temperatures, table_factors = self.curve()
+        values = np.asarray(temperatures, dtype=float)
+
+        # NaN is also out of the table.
+        inside = values <= table_temperatures[-1]
+        clipped = np.where(inside, values, table_temperatures[-1])
+
+        if interpolation == 'step':
+            factors = table_factors[
+                np.searchsorted(table_temperatures, clipped)]
+        else:
+            factors = np.interp(clipped, table_temperatures, table_factors)
+
+        if values.ndim == 0:
+            if not inside:
+                raise NotInTableError(
+                    'O isolante utilizado não suporta essa temperatura.')
+            return float(factors)
+
+        return np.ma.masked_array(factors, mask=~inside)
+
     def correction_factor(
-            self, temperature: ureg.Quantity) -> float:
+            self, temperature: ureg.Quantity, interpolation='step'):
         """
-        Returns the temperature correcion factor.
+        Returns the temperature correction factor, or the masked
+        array of factors if the temperature is an array.
         """
-        temperature = temperature.to('celsius').magnitude
-        series = self.table[self.insulator]
-        for value, factor in series.items():
-            if value >= temperature:
-                if factor == np.nan:
-                    break
-                return factor
-
-        raise NotInTableError(
-            'O isolante utilizado não suporta essa temperatura.')
+        return self.correction_factors_raw(
+            temperature.to('celsius').magnitude, interpolation)
 
 
 class TemperatureCorrectionAmbient(TemperatureCorrection):
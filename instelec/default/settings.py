@@ -9,8 +9,13 @@ from pint import UnitRegistry
 
 BASE_DIR = Path(__file__).parent.resolve()
 
+# Folder where pint caches the parsed unit definitions, which makes
+# building the registry several times faster. Use ':auto:' for the
+# user cache folder. None disables the cache.
+UNIT_REGISTRY_CACHE = os.environ.get('INSTELEC_UNIT_REGISTRY_CACHE')
+
 # Units manager
-ureg = UnitRegistry()
+ureg = UnitRegistry(cache_folder=UNIT_REGISTRY_CACHE)
 ureg.define('volt_ampere_reactive = watt = var')
 
 # Fase-fase and neuter-fase voltages.
@@ -33,7 +38,7 @@ AMPERAGE_TABLE = {
         'EPR': CONDUTOR_DIM_DIR / 'cobre_epr_ou_xlpe.csv',
         'XLPE': CONDUTOR_DIM_DIR / 'cobre_epr_ou_xlpe.csv'
     },
-    'aluminum': {
+    'aluminium': {
         'PVC': CONDUTOR_DIM_DIR / 'aluminio_pvc.csv',
         'EPR': CONDUTOR_DIM_DIR / 'aluminio_epr_ou_xlpe.csv',
         'XLPE': CONDUTOR_DIM_DIR / 'aluminio_epr_ou_xlpe.csv'
@@ -49,6 +54,19 @@ TEMPERATURE_TABLE = {
 
 GROUPING_TABLE = CONDUTOR_DIM_DIR / 'agrupamento.csv'
 
+# Binary bundle written by `python -m instelec compile-tables`. When
+# it exists the tables are memory-mapped from it instead of parsed.
+TABLE_BUNDLE = BASE_DIR / 'tables.npy'
+
+# Dtype the values of the tables are stored in, 'float64' or
+# 'float32', which halves their memory. The searches are done in
+# float64 either way, float32 values converted exactly.
+TABLE_DTYPE = 'float64'
+
+# Number of sections calculated kept in memory, for projects that
+# repeat the same circuits. 0 disables the memo.
+DIMENSIONING_CACHE_SIZE = 0
+
 # Classes used to handle each table.
 
 AMPERAGE_TABLE_CLASS = 'instelec.condutor_dimensioning.tables.Amperage'
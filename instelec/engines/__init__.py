@@ -2,5 +2,8 @@
 Imports all the content of this submodule.
 """
 
-from .engines import Engine, EngineGroup
-from .simultaneity_factor import simultaneity_factor
+from .engines import Engine, EngineGroup, engine_currents_raw
+from .simultaneity_factor import (
+    simultaneity_factor, simultaneity_factors, OutOfRangeError)
+from .phase_balancing import PhaseBalance, balance_phases
+from .load_profile import LoadProfile, DemandProfile
@@ -4,13 +4,16 @@ methods to calculate the current, demand, power and basically
 everything engines can do.
 """
 
+import math
 from typing import Dict, Self
 
 import numpy as np
 
-from .simultaneity_factor import simultaneity_factor
-from ..settings import ureg, VOLTAGE_FF, VOLTAGE_FN
-from ..power_triangle import PowerTriangle
+from .simultaneity_factor import simultaneity_factors
+from .phase_balancing import PhaseBalance, balance_phases
+from .load_profile import DemandProfile, LoadProfile, simulate_demand
+from ..settings import ureg, VOLTAGE_FF_RAW, VOLTAGE_FN_RAW
+from ..power_triangle import PowerTriangle, PowerTriangleArray
 
 
 class Engine:
@@ -22,6 +25,9 @@ class Engine:
     constructor __init__ and the classmethods.
 
     Can calculate the demand of the engine and the current going through it.
+
+    A load profile may be attached with with_profile, to simulate the
+    demand along the time.
     """
 
     def __init__(
@@ -37,6 +43,7 @@ class Engine:
         self.power = power_triangle
         self.phase_num = phase_num
         self.efficiency = efficiency
+        self.profile = None
 
     def __repr__(self) -> str:
         string = [
@@ -101,23 +108,48 @@ class Engine:
         """
         return self.power.active
 
-    def current(self) -> ureg.Quantity:
+    def current_raw(self) -> float:
         """
-        Calcula a corrente que passa pelo motor.
+        Calcula a corrente que passa pelo motor, em A, sem usar
+        unidades.
         """
-        active = self.power.active
+        # From kW to W.
+        active = 1000*self.power.real
         power_factor = self.power.power_factor
 
         if self.phase_num == 1:
-            current = active/(VOLTAGE_FN*power_factor)
+            current = active/(VOLTAGE_FN_RAW*power_factor)
         elif self.phase_num == 2:
-            current = active/(VOLTAGE_FF*power_factor)
+            current = active/(VOLTAGE_FF_RAW*power_factor)
         elif self.phase_num == 3:
-            current = active/(np.sqrt(3)*VOLTAGE_FF*power_factor)
+            current = active/(np.sqrt(3)*VOLTAGE_FF_RAW*power_factor)
         else:
-            current = active/(self.phase_num*VOLTAGE_FN*power_factor)
+            current = active/(self.phase_num*VOLTAGE_FN_RAW*power_factor)
 
-        return current.to_base_units()
+        return current
+
+    def current(self) -> ureg.Quantity:
+        """
+        Calcula a corrente que passa pelo motor.
+        """
+        return self.current_raw()*ureg.ampere
+
+    def with_profile(self, profile: LoadProfile) -> Self:
+        """
+        Attaches the load profile of the engine, or removes it if
+        None.
+        """
+        assert profile is None or isinstance(profile, LoadProfile),\
+            'The profile must be an instance of LoadProfile.'
+        self.profile = profile
+        return self
+
+    def demand_profile(self) -> DemandProfile:
+        """
+        Simulates the demand and current of the engine at each sample
+        of its load profile.
+        """
+        return EngineGroup({self: 1}).demand_profile()
 
 
 class EngineGroup:
@@ -138,7 +170,6 @@ class EngineGroup:
         assert isinstance(engines_count, dict),\
             'The engines count has to be a dict.'
 
-        self.power = 0
         self.phase_num = 1
         for eng, count in engines_count.items():
             assert isinstance(eng, Engine),\
@@ -146,12 +177,20 @@ class EngineGroup:
             assert isinstance(count, int) and count >= 1,\
                 'The number of engines has to be a positive integer.'
 
-            self.power += count * eng.power * \
-                simultaneity_factor(count, eng.power.active)
-
             self.phase_num = max(self.phase_num, eng.phase_num)
 
+        # The loads are summed at once, instead of one at a time.
+        powers = PowerTriangleArray.from_triangles(
+            eng.power for eng in engines_count)
+        counts = np.fromiter(engines_count.values(), dtype=int)
+        factors = simultaneity_factors(counts, powers.active)
+        self.power = (powers * (counts*factors)).sum()
+
         self.engines_count = engines_count
+        self._demands = counts*powers.values.real
+        self._factors = factors
+        self._phase_currents = None
+        self._connections = None
 
     def __iter__(self) -> Engine:
         """
@@ -174,25 +213,168 @@ class EngineGroup:
         """
         return self.power.active
 
+    def phase_currents_raw(self) -> list:
+        """
+        Calculates the current, in A, that goes in each phase,
+        without units. The result is computed once per group.
+
+        Each engine is connected to the phases with the smallest
+        currents, one engine at a time. The repetitions of an
+        engine are handled at once by distribute_engines.
+        """
+        if self._phase_currents is None:
+            phases = [0.0]*self.phase_num
+            connections = []
+            for eng, count in self.engines_count.items():
+                current = eng.current_raw()
+                engines = distribute_counts(
+                    phases, eng.phase_num, current, count)
+                phases = [
+                    phase + num*current for phase, num in zip(phases, engines)]
+                connections.append(engines)
+            self._phase_currents = phases
+            self._connections = connections
+
+        return self._phase_currents
+
+    def phase_connections(self) -> list:
+        """
+        The number of repetitions of each engine connected to each
+        phase, as distributed by phase_currents_raw.
+        """
+        self.phase_currents_raw()
+        return self._connections
+
     def current_per_phase(self) -> list:
         """
         Calculates the current that goes in each phase.
         Returns a list with the current in each fase in
-        decreasing order.
+        increasing order.
         """
-        phases = [0]*self.phase_num
-        for eng in self:
-            for i in range(eng.phase_num):
-                phases[i] += eng.current()
-            phases.sort()
-
-        return phases
+        return [
+            current*ureg.ampere
+            for current in sorted(self.phase_currents_raw())
+        ]
 
     def charge_current(self) -> ureg.Quantity:
         """
         Calculates the charge current. The highest current
         between the phases.
         """
-        # The phases are sorted in increasing order. The
-        # last term is the bigger.
-        return self.current_per_phase()[-1]
+        return max(self.phase_currents_raw())*ureg.ampere
+
+    def demand_profile(self) -> DemandProfile:
+        """
+        Simulates the demand and the phase currents of the group at
+        each sample of the load profiles of its engines, connected to
+        the phases as in current_per_phase. The engines without a
+        profile are at full power all the time, times the
+        simultaneity factor in the demand, as in demand.
+        """
+        profiles = [eng.profile for eng in self.engines_count]
+        has_profile = np.array([profile is not None for profile in profiles])
+        demands = self._demands*np.where(has_profile, 1.0, self._factors)
+
+        currents = np.array([eng.current_raw() for eng in self.engines_count])
+        connections = np.array(self.phase_connections())
+
+        return simulate_demand(
+            profiles, demands, connections*currents[:, np.newaxis])
+
+    def balance_phases(self, time_budget: float = None) -> PhaseBalance:
+        """
+        Searches the connection of the engines to the phases that
+        minimizes the highest phase current. See balance_phases.
+        """
+        return balance_phases(self, self.phase_num, time_budget)
+
+
+def engine_currents_raw(active, power_factors, phase_nums) -> np.ndarray:
+    """
+    Same as Engine.current_raw for whole arrays of engines. Receives
+    the active powers in kW and returns the currents in A.
+    """
+    active = 1000*np.asarray(active, dtype=float)
+    power_factors = np.asarray(power_factors, dtype=float)
+    phase_nums = np.asarray(phase_nums)
+
+    voltages = np.select(
+        [phase_nums == 1, phase_nums == 2, phase_nums == 3],
+        [VOLTAGE_FN_RAW, VOLTAGE_FF_RAW, np.sqrt(3)*VOLTAGE_FF_RAW],
+        phase_nums*VOLTAGE_FN_RAW
+    )
+    return active/(voltages*power_factors)
+
+
+def distribute_engines(
+    phases: list,
+    phase_num: int,
+    current: float,
+    count: int
+) -> list:
+    """
+    Connects count engines of phase_num phases and the given current,
+    one at a time, to the phases with the smallest currents. Returns
+    the new currents of the phases.
+    """
+    engines = distribute_counts(phases, phase_num, current, count)
+    return [phase + num*current for phase, num in zip(phases, engines)]
+
+
+def distribute_counts(
+    phases: list,
+    phase_num: int,
+    current: float,
+    count: int
+) -> list:
+    """
+    Same as distribute_engines, but returns the number of engines
+    connected to each phase.
+
+    Instead of simulating each engine, the number of engines each
+    phase receives is found in closed form. Every phase may receive
+    at most count engines and, if the n-th engine connected to a phase
+    finds it with the current phases[i] + (n - 1)*current, the engines
+    go to the count*phase_num smallest of those levels. The highest
+    level used is searched by bisection.
+    """
+    if phase_num >= len(phases):
+        return [count]*len(phases)
+    if current <= 0 or count == 0:
+        return [0]*len(phases)
+
+    needed = phase_num*count
+
+    def received(level: float) -> list:
+        # Number of engines each phase receives below the level.
+        return [
+            min(count, max(0, math.floor((level - phase)/current) + 1))
+            for phase in phases
+        ]
+
+    level = math.inf
+    for phase in phases:
+        if sum(received(phase + (count - 1)*current)) < needed:
+            continue
+
+        low, high = 0, count - 1
+        while low < high:
+            middle = (low + high)//2
+            if sum(received(phase + middle*current)) >= needed:
+                high = middle
+            else:
+                low = middle + 1
+        level = min(level, phase + low*current)
+
+    engines = received(level)
+
+    # Phases tied at the level may have received more engines than
+    # needed. Any of them may give it back, the currents are the same.
+    for _ in range(sum(engines) - needed):
+        idx = max(
+            (i for i in range(len(phases)) if engines[i] > 0),
+            key=lambda i: phases[i] + (engines[i] - 1)*current
+        )
+        engines[idx] -= 1
+
+    return engines
@@ -0,0 +1,175 @@
+"""
+Simulates the demand of engines along the time, from profiles of
+their load, instead of the single value of the simultaneity table.
+
+A profile is the load of an engine at each sample, as a fraction of
+its power, sampled every step minutes, as a duty cycle or measured.
+The demand of a group is the sum of the powers of its engines
+weighted by their profiles. The engines that share a profile are
+summed before, and the profiles are summed in blocks by matrix
+products, so a year of samples of thousands of engines takes no
+loop over the samples.
+"""
+
+from typing import List, NamedTuple, Optional, Self
+
+import numpy as np
+
+from ..settings import ureg
+
+# Minutes in a year of 365 days.
+YEAR = 365*24*60
+
+# Bytes of the blocks of profiles summed at once.
+BLOCK_BYTES = 32*1024**2
+
+
+class LoadProfile:
+    """
+    Receives the load of the engine at each sample, as fractions of
+    its power, and the time between the samples, in minutes.
+    """
+
+    def __init__(self, factors, step: float = 15) -> None:
+        factors = np.array(factors, dtype=float)
+        assert factors.ndim == 1 and len(factors) > 0,\
+            'The profile must be a sequence of factors.'
+        assert step > 0, 'The step must be positive.'
+
+        factors.flags.writeable = False
+        self.factors = factors
+        self.step = step
+
+    def __len__(self) -> int:
+        return len(self.factors)
+
+    def __repr__(self) -> str:
+        return f'<LoadProfile of {len(self)} samples every {self.step} min>'
+
+    @classmethod
+    def duty_cycle(
+        cls,
+        on: float,
+        off: float,
+        duration: float = YEAR,
+        step: float = 15,
+        offset: float = 0,
+        load: float = 1.0
+    ) -> Self:
+        """
+        An engine that works on minutes with the given load and stops
+        for off minutes, repeatedly along the duration, in minutes.
+        The offset, in minutes, delays the start of the cycle.
+        """
+        assert on >= 0 and off >= 0 and on + off > 0,\
+            'The duty cycle must have a positive period.'
+
+        minutes = np.arange(int(duration//step))*step - offset
+        return cls(load*(np.mod(minutes, on + off) < on), step)
+
+    @classmethod
+    def from_measurements(cls, powers, rated, step: float = 15) -> Self:
+        """
+        The profile of the active powers measured, as quantities or in
+        kW, for an engine of the rated active power.
+        """
+        if isinstance(powers, ureg.Quantity):
+            powers = powers.to(ureg.kilowatt).magnitude
+        if isinstance(rated, ureg.Quantity):
+            rated = rated.to(ureg.kilowatt).magnitude
+        return cls(np.asarray(powers, dtype=float)/rated, step)
+
+
+class DemandProfile(NamedTuple):
+    """
+    The active power demanded, in kW, and the current in each phase,
+    in A, one row per phase, at each sample of the profiles, step
+    minutes apart.
+    """
+    demand: np.ndarray
+    phase_currents: np.ndarray
+    step: float
+
+    @property
+    def max_demand(self) -> ureg.Quantity:
+        """
+        The highest demand of the samples.
+        """
+        return self.demand.max()*ureg.kilowatt
+
+    @property
+    def load_factor(self) -> float:
+        """
+        The average demand divided by the highest one.
+        """
+        peak = self.demand.max()
+        return float(self.demand.mean()/peak) if peak else 0.0
+
+    @property
+    def energy(self) -> ureg.Quantity:
+        """
+        The energy consumed along the profile.
+        """
+        return self.demand.sum()*self.step/60*ureg.kilowatt_hour
+
+    def charge_currents_raw(self) -> np.ndarray:
+        """
+        The highest current between the phases at each sample, in A.
+        """
+        return self.phase_currents.max(axis=0)
+
+
+def simulate_demand(
+    profiles: List[Optional[LoadProfile]],
+    demands: np.ndarray,
+    phase_currents: np.ndarray
+) -> DemandProfile:
+    """
+    Sums the demands, in kW, and the currents in each phase, in A, of
+    the loads at full power, one row per load, weighted by their
+    profiles. The loads without a profile are constant.
+    """
+    demands = np.asarray(demands, dtype=float)
+    phase_currents = np.asarray(phase_currents, dtype=float)
+
+    # The row of the profile of each load, -1 for the constant ones.
+    unique, index = [], {}
+    for profile in profiles:
+        if profile is not None and id(profile) not in index:
+            index[id(profile)] = len(unique)
+            unique.append(profile)
+    rows = np.array([
+        -1 if profile is None else index[id(profile)]
+        for profile in profiles
+    ])
+
+    if not unique:
+        raise ValueError('None of the engines has a load profile.')
+
+    samples, step = len(unique[0]), unique[0].step
+    if any((len(profile), profile.step) != (samples, step)
+           for profile in unique):
+        raise ValueError(
+            'The load profiles must have the same samples and step.')
+
+    # The weights of each profile, the loads sharing it summed.
+    constant = rows == -1
+    demand_weights = np.bincount(
+        rows[~constant], demands[~constant], len(unique))
+    phase_weights = np.column_stack([
+        np.bincount(rows[~constant], column[~constant], len(unique))
+        for column in phase_currents.T
+    ])
+
+    demand = np.full(samples, demands[constant].sum())
+    currents = np.repeat(
+        phase_currents[constant].sum(axis=0)[:, np.newaxis], samples, axis=1)
+
+    block = max(1, BLOCK_BYTES//(8*samples))
+    for start in range(0, len(unique), block):
+        factors = np.stack([
+            profile.factors for profile in unique[start:start + block]])
+        demand += demand_weights[start:start + block] @ factors
+        currents += phase_weights[start:start + block].T @ factors
+
+    return DemandProfile(demand, currents, step)
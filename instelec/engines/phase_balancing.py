@@ -0,0 +1,191 @@
+"""
+Chooses the phases of the single-phase and two-phase engines of a
+board to minimize the highest phase current, the one used to size
+the feeder.
+"""
+
+import bisect
+import time
+from typing import Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from ..settings import ureg
+
+
+class PhaseBalance(NamedTuple):
+    """
+    Result of the phase balancing. The assignment has, for each
+    engine, the indices of the phases it is connected to.
+    """
+    assignment: List[Tuple[int, ...]]
+    currents: ureg.Quantity
+    unbalance: float
+
+
+def unbalance(currents) -> float:
+    """
+    Returns the unbalance of the phase currents, the biggest
+    deviation from the mean divided by the mean.
+    """
+    currents = np.asarray(currents, dtype=float)
+    mean = currents.mean()
+    if mean == 0:
+        return 0.0
+    return float(np.max(np.abs(currents - mean))/mean)
+
+
+def balance_phases(
+    engines: Iterable,
+    phase_num: int = 3,
+    time_budget: float = None
+) -> PhaseBalance:
+    """
+    Connects each engine to the phases of the board.
+
+    The engines are taken in decreasing order of current and each
+    one goes to the phases with the smallest currents (LPT). If a
+    time_budget, in seconds, is given, the assignment is refined by
+    moving and swapping the engines of the most loaded phase until
+    no improvement is found or the time is over.
+
+    The engines may be an EngineGroup, whose repetitions are handled
+    as separate engines.
+    """
+    engines = list(engines)
+
+    currents = {}
+    for eng in engines:
+        if eng not in currents:
+            currents[eng] = eng.current_raw()
+    loads = [currents[eng] for eng in engines]
+
+    phases = [0.0]*phase_num
+    assignment = [None]*len(engines)
+
+    order = sorted(
+        range(len(engines)), key=lambda idx: loads[idx], reverse=True)
+    for idx in order:
+        num = min(engines[idx].phase_num, phase_num)
+        chosen = tuple(sorted(
+            sorted(range(phase_num), key=phases.__getitem__)[:num]))
+
+        for phase in chosen:
+            phases[phase] += loads[idx]
+        assignment[idx] = chosen
+
+    if time_budget is not None:
+        _refine(phases, assignment, loads, time.perf_counter() + time_budget)
+
+    return PhaseBalance(
+        assignment,
+        np.array(phases)*ureg.ampere,
+        unbalance(phases)
+    )
+
+
+def _refine(
+    phases: list,
+    assignment: list,
+    loads: list,
+    deadline: float
+) -> None:
+    """
+    Local search over the assignment, changed in place. Each step
+    lowers the current of the most loaded phase.
+    """
+    phase_num = len(phases)
+
+    while time.perf_counter() < deadline:
+        highest = max(range(phase_num), key=phases.__getitem__)
+        if not _improve(highest, phases, assignment, loads):
+            return
+
+
+def _improve(
+    highest: int,
+    phases: list,
+    assignment: list,
+    loads: list
+) -> bool:
+    """
+    Applies the best move or swap of an engine of the highest phase.
+    Returns False if none lowers its current.
+    """
+    phase_num = len(phases)
+    peak = phases[highest]
+
+    best_gain, best_change = 0.0, None
+    on_highest = [
+        idx for idx, phases_of in enumerate(assignment)
+        if highest in phases_of and len(phases_of) < phase_num
+    ]
+
+    # Moves an engine from the highest phase to another one.
+    for idx in on_highest:
+        for phase in range(phase_num):
+            if phase in assignment[idx]:
+                continue
+            new_peak = max(phases[highest] - loads[idx],
+                           phases[phase] + loads[idx])
+            if peak - new_peak > best_gain:
+                best_gain, best_change = peak - new_peak, (idx, None, phase)
+
+    # Swaps a single-phase engine of the highest phase with a smaller
+    # one of another phase. The ideal difference between them is
+    # half of the difference between the phases.
+    for phase in range(phase_num):
+        if phase == highest:
+            continue
+
+        others = sorted(
+            (loads[idx], idx) for idx, phases_of in enumerate(assignment)
+            if phases_of == (phase,)
+        )
+        if not others:
+            continue
+        target = (phases[highest] - phases[phase])/2
+
+        for idx in on_highest:
+            if len(assignment[idx]) != 1:
+                continue
+
+            pos = bisect.bisect_left(others, (loads[idx] - target, -1))
+            for other_pos in (pos - 1, pos):
+                if not 0 <= other_pos < len(others):
+                    continue
+                other_load, other = others[other_pos]
+                difference = loads[idx] - other_load
+                if difference <= 0:
+                    continue
+
+                new_peak = max(phases[highest] - difference,
+                               phases[phase] + difference)
+                if peak - new_peak > best_gain:
+                    best_gain = peak - new_peak
+                    best_change = (idx, other, phase)
+
+    if best_change is None:
+        return False
+
+    idx, other, phase = best_change
+    _move(idx, highest, phase, phases, assignment, loads)
+    if other is not None:
+        _move(other, phase, highest, phases, assignment, loads)
+    return True
+
+
+def _move(
+    idx: int,
+    source: int,
+    destination: int,
+    phases: list,
+    assignment: list,
+    loads: list
+) -> None:
+    phases[source] -= loads[idx]
+    phases[destination] += loads[idx]
+    assignment[idx] = tuple(sorted(
+        destination if phase == source else phase
+        for phase in assignment[idx]
+    ))
@@ -3,10 +3,11 @@ Here to calculate the simultaneity factor that will be
 used by the EngineGroup class.
 """
 
-import os
 import pandas as pd
 import numpy as np
-from ..settings import ureg, SIMULTANEITY_TABLE
+from .. import settings
+from ..settings import ureg
+from ..table_registry import registry
 
 
 class OutOfRangeError(Exception):
@@ -16,6 +17,76 @@ class OutOfRangeError(Exception):
     """
 
 
+class SimultaneityTable:
+    """
+    The simultaneity table compiled to sorted arrays. The rows are
+    power intervals in HP and the columns are numbers of engines,
+    both searched by bisection.
+    """
+
+    def __init__(
+        self,
+        inf_limits: np.ndarray,
+        sup_limits: np.ndarray,
+        engine_counts: np.ndarray,
+        factors: np.ndarray
+    ) -> None:
+        self.inf_limits = inf_limits
+        self.sup_limits = sup_limits
+        self.engine_counts = engine_counts
+        self.factors = factors
+
+        for array in (inf_limits, sup_limits, engine_counts, factors):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_dataframe(cls, table: pd.DataFrame) -> 'SimultaneityTable':
+        """
+        Compiles the table as read from the spreadsheet.
+        """
+        table = table.sort_values('inf_limit (HP)')
+        sup_limits = table['sup_limit (HP)'].to_numpy(dtype=float)
+
+        return cls(
+            table['inf_limit (HP)'].to_numpy(dtype=float),
+            np.where(np.isnan(sup_limits), np.inf, sup_limits),
+            np.asarray(table.columns[2:], dtype=float),
+            table.iloc[:, 2:].to_numpy(dtype=float)
+        )
+
+    def get_columns(self, num_of_engines) -> np.ndarray:
+        """
+        Seleciona as colunas com base na quantidade de motores.
+        """
+        columns = np.searchsorted(self.engine_counts, num_of_engines)
+        return np.minimum(columns, len(self.engine_counts) - 1)
+
+    def get_rows(self, axis_power) -> np.ndarray:
+        """
+        Seleciona as linhas por meio da potência de eixo em HP.
+        """
+        # The first interval whose superior limit is not below the
+        # power, as the limits of neighbour intervals may coincide.
+        rows = np.searchsorted(self.sup_limits, axis_power)
+        rows = np.minimum(rows, len(self.sup_limits) - 1)
+
+        if np.any(axis_power < self.inf_limits[rows])\
+                or np.any(axis_power > self.sup_limits[rows]):
+            raise OutOfRangeError(
+                'Este valor para a potência de eixo não é tabelado.')
+
+        return rows
+
+
+@registry.register('simultaneity')
+def load_simultaneity_table() -> SimultaneityTable:
+    """
+    Reads and compiles the simultaneity table.
+    """
+    return SimultaneityTable.from_dataframe(
+        registry.read(settings.SIMULTANEITY_TABLE))
+
+
 def simultaneity_factor(
     num_of_engines: int,
     axis_power: ureg.Quantity
@@ -26,41 +97,33 @@ def simultaneity_factor(
     if num_of_engines == 1:
         return 1.0
 
-    table = pd.read_excel(SIMULTANEITY_TABLE)
+    table = registry.get('simultaneity')
 
-    column = get_column(table, num_of_engines)
-    row = get_row(table, axis_power)
+    column = table.get_columns(num_of_engines)
+    row = table.get_rows(axis_power.to(ureg.horsepower).magnitude)
 
-    return table.loc[row, column]
+    return float(table.factors[row, column])
 
 
-def get_column(table: pd.DataFrame, num_of_engines: int):
+def simultaneity_factors(
+    counts,
+    axis_powers: ureg.Quantity
+) -> np.ndarray:
     """
-    Seleciona a coluna com base na quantidade de motores.
+    Returns the simultaneity factors of whole arrays of numbers of
+    engines and axis powers at once.
     """
-    for value in table.columns[2:]:
-        if num_of_engines <= value:
-            return value
-    return value
-
-
-def get_row(
-    table: pd.DataFrame,
-    axis_power: ureg.Quantity
-) -> int:
-    """
-    Seleciona a linha por meio da potência de eixo.
-    """
-    axis_power = axis_power.to(ureg.horsepower).magnitude
-
-    for idx, row in table.iterrows():
-        inf_limit = row['inf_limit (HP)']
-        sup_limit = row['sup_limit (HP)']
+    counts = np.asarray(counts)
+    axis_powers = np.asarray(axis_powers.to(ureg.horsepower).magnitude)
+    counts, axis_powers = np.broadcast_arrays(counts, axis_powers)
 
-        if np.isnan(sup_limit):
-            sup_limit = float('inf')
+    factors = np.ones(counts.shape)
+    grouped = counts > 1
+    if np.any(grouped):
+        table = registry.get('simultaneity')
 
-        if inf_limit <= axis_power <= sup_limit:
-            return idx
+        columns = table.get_columns(counts[grouped])
+        rows = table.get_rows(axis_powers[grouped])
+        factors[grouped] = table.factors[rows, columns]
 
-    raise OutOfRangeError('Este valor para a potência de eixo não é tabelado.')
+    return factors
@@ -0,0 +1,393 @@
+"""
+Models an electrical instalation as a tree. The leaves are loads,
+the inner nodes are the boards that feed them and any node may have
+the feeder, the circuit that comes from its parent board.
+
+The power, phase currents and feeder sections of each node are
+cached. Editing a node only marks it and its ancestors as outdated,
+and they are recalculated when asked for, from the cached values of
+the children that did not change. A board keeps its power and phase
+currents after each child, so it is calculated again only from the
+first child that changed. The sections of a feeder are only
+calculated again if its current or its calculator changed.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional
+
+from .settings import ureg
+from .power_triangle import PowerTriangle
+from .engines import Engine, simultaneity_factor
+from .engines.engines import distribute_engines
+
+
+class FeederSections(NamedTuple):
+    """
+    Sections, in mm², of a feeder by each criterion. The criteria
+    without the data they need are None.
+    """
+    amperage: float
+    voltage_drop: Optional[float]
+    short_circuit: Optional[float]
+    phase: float
+    protection: float
+
+
+def _magnitude(value, unit) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, ureg.Quantity):
+        return value.to(unit).magnitude
+    return float(value)
+
+
+class Feeder:
+    """
+    The circuit that feeds a node. Receives the calculator of the
+    condutor section and, optionally, the data of the voltage drop
+    and short circuit criteria, as quantities or as magnitudes in m,
+    kA and s.
+
+    To change a feeder, assign a new one to the node.
+    """
+
+    def __init__(
+        self,
+        section,
+        distance=None,
+        max_fall: float = None,
+        short_circuit_current=None,
+        fault_elimination_time=None
+    ) -> None:
+        assert distance is None or max_fall is not None,\
+            'The voltage drop criterion needs the max_fall.'
+        assert short_circuit_current is None\
+            or fault_elimination_time is not None,\
+            'The short circuit criterion needs the fault_elimination_time.'
+
+        self.section = section
+        self.distance = _magnitude(distance, ureg.meter)
+        self.max_fall = max_fall
+        self.short_circuit_current = _magnitude(
+            short_circuit_current, ureg.kiloampere)
+        self.fault_elimination_time = _magnitude(
+            fault_elimination_time, ureg.second)
+
+    def dimension_raw(self, current: float) -> FeederSections:
+        """
+        Calculates the sections of the feeder for the current, in A.
+        """
+        section = self.section
+        selection = section.select_section_raw(
+            current,
+            self.distance,
+            self.max_fall,
+            self.short_circuit_current,
+            self.fault_elimination_time
+        )
+
+        # Each criterion with the minimum section, as by_amperage and
+        # the other methods return them.
+        amperage, voltage_drop, short_circuit = (
+            None if criterion is None
+            else max(criterion, selection.min_section)
+            for criterion in selection[:3]
+        )
+        return FeederSections(
+            amperage,
+            voltage_drop,
+            short_circuit,
+            selection.section,
+            section.protection_condutor_raw(selection.section)
+        )
+
+
+class Node:
+    """
+    Base of the nodes of the instalation tree.
+    """
+
+    children: tuple = ()
+
+    def __init__(self, name: str = None, feeder: Feeder = None) -> None:
+        self.name = name
+        self.parent: Optional['Board'] = None
+        self._feeder = feeder
+
+        # None means outdated.
+        self._power = None
+        self._phase_currents = None
+
+        self._sections = None
+        self._sections_key = None
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} {self.name!r}>'
+
+    @property
+    def feeder(self) -> Optional[Feeder]:
+        return self._feeder
+
+    @feeder.setter
+    def feeder(self, feeder: Optional[Feeder]) -> None:
+        self._feeder = feeder
+        self._sections = None
+
+    @property
+    def outdated(self) -> bool:
+        """
+        Whether the node must be calculated again.
+        """
+        return self._power is None
+
+    def invalidate(self) -> None:
+        """
+        Marks the node and its ancestors as outdated. Stops at the
+        first ancestor already outdated, as its own ancestors are.
+        """
+        self._power = None
+        self._phase_currents = None
+
+        child, node = self, self.parent
+        while node is not None:
+            outdated = node.outdated
+            node._changed_child(child)
+            if outdated:
+                break
+            child, node = node, node.parent
+
+    def _update(self) -> None:
+        raise NotImplementedError
+
+    def _refresh(self) -> None:
+        """
+        Calculates the node and its outdated descendants again, each
+        child before its board. The tree is walked without recursion,
+        so the depth of the instalation is not limited.
+        """
+        stack, order = [self], []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(child for child in node.children if child.outdated)
+
+        for node in reversed(order):
+            node._update()
+
+    @property
+    def phase_num(self) -> int:
+        raise NotImplementedError
+
+    def _contribution(self) -> tuple:
+        """
+        The number of phases, the current in A and the number of
+        times the node is connected to its parent board.
+        """
+        return self.phase_num, self.charge_current_raw(), 1
+
+    @property
+    def power(self) -> PowerTriangle:
+        """
+        The power triangle of the node, simultaneity included.
+        """
+        if self.outdated:
+            self._refresh()
+        return self._power
+
+    def demand(self) -> ureg.Quantity:
+        """
+        The active power of the node.
+        """
+        return self.power.active
+
+    def phase_currents_raw(self) -> List[float]:
+        """
+        The current, in A, in each phase of the node.
+        """
+        if self.outdated:
+            self._refresh()
+        return self._phase_currents
+
+    def current_per_phase(self) -> list:
+        """
+        The current in each phase, in increasing order.
+        """
+        return [
+            current*ureg.ampere
+            for current in sorted(self.phase_currents_raw())
+        ]
+
+    def charge_current_raw(self) -> float:
+        """
+        The highest current between the phases, in A.
+        """
+        return max(self.phase_currents_raw())
+
+    def charge_current(self) -> ureg.Quantity:
+        """
+        The highest current between the phases.
+        """
+        return self.charge_current_raw()*ureg.ampere
+
+    def sections(self) -> Optional[FeederSections]:
+        """
+        The sections of the feeder of the node, or None if it has no
+        feeder. They are only calculated again if the charge current
+        or the calculator of the feeder changed.
+        """
+        if self._feeder is None:
+            return None
+
+        current = self.charge_current_raw()
+        key = (current, self._feeder.section.memo_key())
+        if self._sections is None or self._sections_key != key:
+            self._sections = self._feeder.dimension_raw(current)
+            self._sections_key = key
+        return self._sections
+
+    def walk(self) -> Iterator['Node']:
+        """
+        Yields the node and every node below it, each board before
+        its children.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+class Load(Node):
+    """
+    A leaf of the instalation, count identical engines. Each engine
+    has its own circuit, so the feeder is dimensioned for the current
+    of one engine, while the parent board receives all of them.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        count: int = 1,
+        name: str = None,
+        feeder: Feeder = None
+    ) -> None:
+        super().__init__(name, feeder)
+        self._check(engine, count)
+        self.engine = engine
+        self.count = count
+
+    @staticmethod
+    def _check(engine: Engine, count: int) -> None:
+        assert isinstance(engine, Engine),\
+            'The load must be an instance of Engine.'
+        assert isinstance(count, int) and count >= 1,\
+            'The number of engines has to be a positive integer.'
+
+    @property
+    def phase_num(self) -> int:
+        return self.engine.phase_num
+
+    def update(self, engine: Engine = None, count: int = None) -> None:
+        """
+        Changes the engine or the number of engines of the load.
+        """
+        engine = self.engine if engine is None else engine
+        count = self.count if count is None else count
+        self._check(engine, count)
+
+        self.engine = engine
+        self.count = count
+        self.invalidate()
+
+    def _update(self) -> None:
+        factor = simultaneity_factor(self.count, self.engine.power.active)
+        self._power = self.engine.power*(self.count*factor)
+        self._phase_currents = [self.engine.current_raw()]*self.phase_num
+
+    def _contribution(self) -> tuple:
+        return self.phase_num, self.engine.current_raw(), self.count
+
+
+class Board(Node):
+    """
+    A board, which feeds the loads and boards below it.
+
+    Its power is the sum of the powers of the children and its
+    phase currents are found as in EngineGroup, connecting each child
+    to the phases with the smallest currents. A board of loads has
+    the same power and currents as the EngineGroup of its engines.
+    """
+
+    def __init__(
+        self,
+        children=(),
+        name: str = None,
+        feeder: Feeder = None
+    ) -> None:
+        super().__init__(name, feeder)
+        self.children: List[Node] = []
+        self._phase_num = None
+
+        # The power and the phase currents before each child and after
+        # the last one, and the index of the first child that changed.
+        self._states = [(0j, [])]
+        self._changed = 0
+
+        self.add(*children)
+
+    @property
+    def phase_num(self) -> int:
+        if self.outdated:
+            self._refresh()
+        return self._phase_num
+
+    def add(self, *children: Node) -> None:
+        """
+        Connects the nodes to the board.
+        """
+        for child in children:
+            assert child.parent is None,\
+                'The node is already connected to a board.'
+            child.parent = self
+            self._changed = min(self._changed, len(self.children))
+            self.children.append(child)
+        self.invalidate()
+
+    def remove(self, child: Node) -> None:
+        """
+        Disconnects the node from the board.
+        """
+        idx = self.children.index(child)
+        del self.children[idx]
+        child.parent = None
+        self._changed = min(self._changed, idx)
+        self.invalidate()
+
+    def _changed_child(self, child: Node) -> None:
+        self._changed = min(self._changed, self.children.index(child))
+        self._power = None
+        self._phase_currents = None
+
+    def _update(self) -> None:
+        # The children are up to date, see Node._refresh.
+        phase_num = max(
+            (child.phase_num for child in self.children), default=1)
+
+        # The phases are distributed in the order of the children, so
+        # only the children from the first one that changed on are
+        # connected again, unless the number of phases changed.
+        start = self._changed if phase_num == self._phase_num else 0
+        if start == 0:
+            self._states = [(0j, [0.0]*phase_num)]
+        else:
+            del self._states[start + 1:]
+        power, phases = self._states[start]
+
+        for child in self.children[start:]:
+            power += complex(child.power)
+            phases = distribute_engines(phases, *child._contribution())
+            self._states.append((power, phases))
+
+        self._phase_num = phase_num
+        self._changed = len(self.children)
+        self._power = PowerTriangle.from_components(power.real, power.imag)
+        self._phase_currents = phases
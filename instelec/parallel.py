@@ -0,0 +1,313 @@
+"""
+Dimensions the circuits of whole projects in a pool of processes.
+
+The circuits are split in chunks, each one dimensioned by a worker
+with the batch methods of the calculators. The ampacity, voltage
+drop, grouping and temperature tables are copied once to a block of
+shared memory, and the workers build their tables as views over it
+instead of parsing the files again.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from . import condutor_dimensioning, settings
+from .settings import ureg
+from .table_registry import registry
+from .condutor_dimensioning.batch import BatchSections
+
+# Columns of the circuits. The first four are required, the others
+# enable the voltage drop and short circuit criteria, choose the
+# calculator of each circuit and its grouping and ambient temperature
+# corrections.
+REQUIRED_COLUMNS = ('current', 'method', 'phase_num', 'power_factor')
+OPTIONAL_COLUMNS = (
+    'distance', 'max_fall',
+    'short_circuit_current', 'fault_elimination_time',
+    'calculator', 'grouping', 'temperature'
+)
+# The columns that choose the calculator of the circuit.
+KEY_COLUMNS = ('calculator', 'grouping', 'temperature')
+
+
+class WorkerTiming(NamedTuple):
+    """
+    Work done by one of the processes.
+    """
+    pid: int
+    chunks: int
+    circuits: int
+    seconds: float
+
+
+class ProjectSections(NamedTuple):
+    """
+    The sections of every circuit, in the order they were given, and
+    the time each worker spent.
+    """
+    sections: BatchSections
+    timings: List[WorkerTiming]
+
+
+def shared_table_keys() -> list:
+    """
+    The keys in the registry of the tables shared with the workers.
+    """
+    keys = [
+        ('amperage', material, insulator)
+        for material, tables in settings.AMPERAGE_TABLE.items()
+        for insulator in tables
+    ]
+    keys.append(('voltage_drop',))
+    keys.append(('grouping',))
+    keys.extend(
+        ('temperature', place) for place in settings.TEMPERATURE_TABLE)
+    return keys
+
+
+def share_tables() -> (SharedMemory, list):
+    """
+    Copies the tables to a new block of shared memory. Returns the
+    block and the description of where each table lies in it. The
+    index of each table is stored as its first column.
+    """
+    arrays, layout, offset = [], [], 0
+    for key in shared_table_keys():
+        table = registry.get(*key)
+        values = np.column_stack([
+            table.index.to_numpy(dtype=float),
+            table.to_numpy(dtype=float)
+        ])
+        arrays.append(values)
+        layout.append((
+            key, offset, values.shape,
+            table.index.name, table.index.dtype.str, list(table.columns)
+        ))
+        offset += values.size
+
+    shared = SharedMemory(create=True, size=max(offset, 1)*8)
+    data = np.ndarray((offset,), dtype=float, buffer=shared.buf)
+    position = 0
+    for values in arrays:
+        data[position:position + values.size] = values.ravel()
+        position += values.size
+
+    return shared, layout
+
+
+# The block of shared memory of the worker, kept referenced so the
+# views over it stay valid.
+_shared = None
+
+
+def attach_tables(name: str, layout: list) -> None:
+    """
+    Initializer of the workers. Replaces the tables of the registry
+    by views over the shared memory.
+    """
+    global _shared
+    # The workers share the resource tracker of the parent, which
+    # unlinks the block when the project is done.
+    _shared = SharedMemory(name=name)
+
+    registry.clear()
+    for key, offset, shape, index_name, index_dtype, columns in layout:
+        values = np.ndarray(
+            shape, dtype=float, buffer=_shared.buf, offset=offset*8)
+        values.flags.writeable = False
+        index = pd.Index(values[:, 0], name=index_name).astype(index_dtype)
+        registry.preload(key, pd.DataFrame(
+            values[:, 1:], index=index, columns=columns, copy=False))
+
+
+@contextmanager
+def worker_pool(workers: int = None) -> Iterator[ProcessPoolExecutor]:
+    """
+    A pool of workers attached to the tables in shared memory, which
+    is released when the pool is closed.
+    """
+    shared, layout = share_tables()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=attach_tables,
+            initargs=(shared.name, layout)
+        ) as executor:
+            yield executor
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def bounded_map(
+    executor: Executor,
+    func: Callable,
+    iterable: Iterable,
+    limit: int
+) -> Iterator:
+    """
+    Same as executor.map, keeping the order, but with at most limit
+    tasks submitted at once, so the iterable is consumed as the
+    results are used.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def calculator(name: str, grouping: int, temperature: float):
+    """
+    Creates the calculator of the class name, with the corrections.
+    The instalation method, power factor and number of phases are
+    given per circuit, so the ones of the calculator are not used.
+    """
+    section = getattr(condutor_dimensioning, name)('B1', 1.0, 3)
+    if grouping > 1:
+        section.grouping_correction(int(grouping))
+    if not np.isnan(temperature):
+        section.temperature_correction(ureg.Quantity(temperature, 'degC'))
+    return section
+
+
+def dimension_circuits(columns: Dict[str, np.ndarray]) -> BatchSections:
+    """
+    Dimensions the circuits given as columns, see dimension_project.
+    The circuits that share the calculator and corrections are
+    dimensioned at once.
+    """
+    size = len(columns['current'])
+
+    names = columns.get('calculator', np.full(size, 'CupperPVC'))
+    groupings = columns.get('grouping', np.ones(size))
+    temperatures = columns.get('temperature', np.full(size, np.nan))
+
+    groups = pd.DataFrame({
+        'calculator': names, 'grouping': groupings, 'temperature': temperatures
+    }).groupby(list(KEY_COLUMNS), dropna=False, sort=False).indices
+
+    fields = {field: np.ma.masked_all(size) for field in BatchSections._fields}
+    for (name, grouping, temperature), selected in groups.items():
+        chosen = {col: values[selected] for col, values in columns.items()}
+
+        result = calculator(name, grouping, temperature).dimension_batch(
+            chosen['current'],
+            chosen.get('distance'),
+            chosen.get('max_fall'),
+            chosen.get('short_circuit_current'),
+            chosen.get('fault_elimination_time'),
+            chosen['method'],
+            chosen['phase_num'],
+            chosen['power_factor']
+        )
+        for field, values in zip(BatchSections._fields, result):
+            if values is not None:
+                fields[field][selected] = values
+
+    if 'distance' not in columns:
+        fields['voltage_drop'] = None
+    if 'short_circuit_current' not in columns:
+        fields['short_circuit'] = None
+
+    return BatchSections(**fields)
+
+
+def dimension_chunk(columns: Dict[str, np.ndarray]) -> tuple:
+    """
+    Task of the workers. Returns the sections of the chunk, the
+    process that dimensioned it, its size and the time spent.
+    """
+    start = time.perf_counter()
+    return (
+        dimension_circuits(columns),
+        os.getpid(),
+        len(columns['current']),
+        time.perf_counter() - start
+    )
+
+
+def dimension_project(
+    circuits: Mapping,
+    workers: int = None,
+    chunk_size: int = 10_000
+) -> ProjectSections:
+    """
+    Dimensions the circuits, a mapping, as a DataFrame, of the
+    columns to arrays. Needs the columns current (A), method,
+    phase_num and power_factor and may have the columns distance (m)
+    and max_fall, short_circuit_current (kA) and
+    fault_elimination_time (s), calculator (a class name as
+    'CupperEPR', 'CupperPVC' by default), grouping (the number of
+    circuits grouped) and temperature (ambient, in °C).
+
+    The circuits are split in chunks of chunk_size, dimensioned by
+    workers processes, os.cpu_count() by default. With workers=0 they
+    are dimensioned in this process.
+    """
+    columns = {
+        col: np.asarray(circuits[col])
+        for col in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        if col in circuits
+    }
+    missing = set(REQUIRED_COLUMNS) - set(columns)
+    if missing:
+        raise KeyError(f'Missing columns: {", ".join(sorted(missing))}.')
+
+    size = len(columns['current'])
+    chunks = [
+        {col: values[start:start + chunk_size]
+         for col, values in columns.items()}
+        for start in range(0, size, chunk_size)
+    ]
+
+    if workers == 0:
+        results = [dimension_chunk(chunk) for chunk in chunks]
+    else:
+        with worker_pool(workers) as executor:
+            # Map keeps the order of the chunks.
+            results = list(executor.map(dimension_chunk, chunks))
+
+    return ProjectSections(
+        merge([result[0] for result in results], size),
+        timings(results)
+    )
+
+
+def merge(parts: List[BatchSections], size: int) -> BatchSections:
+    """
+    Concatenates the sections of the chunks.
+    """
+    if not parts:
+        return BatchSections(*(
+            np.ma.masked_all(size) for _ in BatchSections._fields))
+
+    return BatchSections(*(
+        None if values[0] is None else np.ma.concatenate(values)
+        for values in zip(*parts)
+    ))
+
+
+def timings(results: list) -> List[WorkerTiming]:
+    """
+    Adds up the chunks each worker dimensioned.
+    """
+    totals = {}
+    for _, pid, size, seconds in results:
+        chunks, circuits, total = totals.get(pid, (0, 0, 0.0))
+        totals[pid] = (chunks + 1, circuits + size, total + seconds)
+
+    return [
+        WorkerTiming(pid, *totals[pid]) for pid in sorted(totals)
+    ]
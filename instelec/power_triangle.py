@@ -8,11 +8,19 @@ from typing import Self
 import numpy as np
 from .settings import ureg
 
+# Parsed once, as parsing units is expensive.
+KVA = ureg.Unit('kVA')
+KW = ureg.Unit('kW')
+KVAR = ureg.Unit('kvar')
+
 
 class PowerTriangle(complex):
     """
     Receives two powers of the power triangle or one power
     and the power factor.
+
+    The real part is the active power in kW and the imaginary part
+    is the reactive power in kvar.
     """
     def __new__(cls, power: ureg.Quantity, power_factor: float):
         assert isinstance(power_factor, (int, float)) and 0 <= power_factor <= 1,\
@@ -21,11 +29,11 @@ class PowerTriangle(complex):
         cos = power_factor
         sin = np.sqrt(1 - power_factor**2)
 
-        if power.units == ureg.Unit('kVA'):
+        if power.units == KVA:
             real, imag = power.magnitude*cos, power.magnitude*sin
-        elif power.units == ureg.Unit('kW'):
+        elif power.units == KW:
             real, imag = power.magnitude, power.magnitude*(sin/cos)
-        elif power.units == ureg.Unit('kvar'):
+        elif power.units == KVAR:
             real, imag = power.magnitude*(cos/sin), power.magnitude
         else:
             raise ValueError(
@@ -33,6 +41,15 @@ class PowerTriangle(complex):
 
         return super(PowerTriangle, cls).__new__(cls, real, imag)
 
+    @classmethod
+    def from_components(cls, active: float, reactive: float) -> Self:
+        """
+        Creates the triangle from the active power in kW and the
+        reactive power in kvar, given as plain numbers. No unit is
+        checked, it is meant for the hot paths.
+        """
+        return super(PowerTriangle, cls).__new__(cls, active, reactive)
+
     def __str__(self) -> str:
         parts = (
             f'Apparent power = {self.apparent}',
@@ -85,21 +102,21 @@ class PowerTriangle(complex):
         """
         Returns the apparent power.
         """
-        return abs(self)*ureg.Unit('kVA')
+        return abs(self)*KVA
 
     @property
     def active(self) -> float:
         """
         Returns the active power.
         """
-        return self.real*ureg.Unit('kW')
+        return self.real*KW
 
     @property
     def reactive(self) -> float:
         """
         Returns the reactive power.
         """
-        return self.imag*ureg.Unit('kvar')
+        return self.imag*KVAR
 
     @property
     def power_factor(self) -> float:
@@ -120,7 +137,7 @@ class PowerTriangle(complex):
         assert 0 <= power_factor <= 1, 'The power_factor has to be a number from 0 to 1.'
 
         tan = np.sqrt(1/power_factor**2 - 1)
-        return (self.active*tan).to(ureg.Unit('kvar')) - self.reactive
+        return (self.real*tan - self.imag)*KVAR
 
     def capacitive_power_factor_to(self, power_factor: float) -> ureg.Quantity:
         """
@@ -133,7 +150,7 @@ class PowerTriangle(complex):
         assert 0 <= power_factor <= 1, 'The power_factor has to be a number from 0 to 1.'
 
         tan = - np.sqrt(1/power_factor**2 - 1)
-        return (self.active*tan).to(ureg.Unit('kvar')) - self.reactive
+        return (self.real*tan - self.imag)*KVAR
 
     def power_factor_to(self, power_factor: float) -> (ureg.Quantity, ureg.Quantity):
         """
@@ -145,3 +162,200 @@ class PowerTriangle(complex):
             self.capacitive_power_factor_to(power_factor),
             self.inductive_power_factor_to(power_factor)
         )
+
+
+class PowerTriangleArray:
+    """
+    A collection of power triangles backed by a complex128 array,
+    meant for load schedules with many entries.
+
+    Receives an array of powers, all in kVA, kW or kvar, and the
+    power factors, a number or an array of them. The real parts of
+    the array are the active powers in kW and the imaginary parts
+    are the reactive powers in kvar.
+    """
+
+    def __init__(self, powers: ureg.Quantity, power_factors) -> None:
+        power_factors = np.asarray(power_factors, dtype=float)
+        assert np.all((0 <= power_factors) & (power_factors <= 1)),\
+            'The power factor has to be a number from 0 to 1.'
+
+        cos = power_factors
+        sin = np.sqrt(1 - power_factors**2)
+        magnitude = np.asarray(powers.magnitude, dtype=float)
+
+        if powers.units == KVA:
+            real, imag = magnitude*cos, magnitude*sin
+        elif powers.units == KW:
+            real, imag = magnitude, magnitude*(sin/cos)
+        elif powers.units == KVAR:
+            real, imag = magnitude*(cos/sin), magnitude
+        else:
+            raise ValueError(
+                'A potência só pode apresentar as unidades kVA, kW ou kvar.')
+
+        self.values = np.empty(np.broadcast(real, imag).shape, np.complex128)
+        self.values.real = real
+        self.values.imag = imag
+
+    @classmethod
+    def from_complex(cls, values) -> Self:
+        """
+        Wraps an array of complex numbers, whose real parts are in
+        kW and imaginary parts in kvar.
+        """
+        array = cls.__new__(cls)
+        array.values = np.asarray(values, dtype=np.complex128)
+        return array
+
+    @classmethod
+    def from_components(cls, active, reactive) -> Self:
+        """
+        Creates the array from the active powers in kW and the
+        reactive powers in kvar, given as plain numbers.
+        """
+        active = np.asarray(active, dtype=float)
+        return cls.from_complex(active + 1j*np.asarray(reactive, dtype=float))
+
+    @classmethod
+    def from_triangles(cls, triangles) -> Self:
+        """
+        Creates the array from an iterable of PowerTriangle.
+        """
+        return cls.from_complex(
+            np.fromiter(triangles, dtype=np.complex128))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.values!r})'
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        for value in self.values:
+            yield PowerTriangle.from_components(value.real, value.imag)
+
+    def __getitem__(self, key):
+        value = self.values[key]
+        if np.ndim(value) == 0:
+            return PowerTriangle.from_components(value.real, value.imag)
+        return self.from_complex(value)
+
+    @staticmethod
+    def _values(other):
+        if isinstance(other, PowerTriangleArray):
+            return other.values
+        return other
+
+    def __neg__(self) -> Self:
+        return self.from_complex(-self.values)
+
+    def __add__(self, other) -> Self:
+        return self.from_complex(self.values + self._values(other))
+
+    def __radd__(self, other) -> Self:
+        return self.from_complex(self._values(other) + self.values)
+
+    def __sub__(self, other) -> Self:
+        return self.from_complex(self.values - self._values(other))
+
+    def __rsub__(self, other) -> Self:
+        return self.from_complex(self._values(other) - self.values)
+
+    def __mul__(self, other) -> Self:
+        return self.from_complex(self.values * self._values(other))
+
+    def __rmul__(self, other) -> Self:
+        return self.from_complex(self._values(other) * self.values)
+
+    @property
+    def apparent(self) -> ureg.Quantity:
+        """
+        Returns the apparent powers.
+        """
+        return np.abs(self.values)*KVA
+
+    @property
+    def active(self) -> ureg.Quantity:
+        """
+        Returns the active powers.
+        """
+        return self.values.real*KW
+
+    @property
+    def reactive(self) -> ureg.Quantity:
+        """
+        Returns the reactive powers.
+        """
+        return self.values.imag*KVAR
+
+    @property
+    def power_factor(self) -> np.ndarray:
+        """
+        Returns the power factors.
+        """
+        return self.values.real/np.abs(self.values)
+
+    def inductive_power_factor_to(self, power_factor: float) -> ureg.Quantity:
+        """
+        Calculates, for each triangle, the power the capacitive bank
+        requires to correct the power factor to the given
+        power_factor.
+        """
+        assert isinstance(power_factor, (int, float)
+                          ), 'The power_factor has to be a number from 0 to 1.'
+        assert 0 <= power_factor <= 1, 'The power_factor has to be a number from 0 to 1.'
+
+        tan = np.sqrt(1/power_factor**2 - 1)
+        return (self.values.real*tan - self.values.imag)*KVAR
+
+    def capacitive_power_factor_to(self, power_factor: float) -> ureg.Quantity:
+        """
+        Calculates, for each triangle, the power the capacitive bank
+        requires to correct the power factor to the given
+        power_factor.
+        """
+        assert isinstance(power_factor, (int, float)
+                          ), 'The power_factor has to be a number from 0 to 1.'
+        assert 0 <= power_factor <= 1, 'The power_factor has to be a number from 0 to 1.'
+
+        tan = - np.sqrt(1/power_factor**2 - 1)
+        return (self.values.real*tan - self.values.imag)*KVAR
+
+    def power_factor_to(self, power_factor: float) -> (ureg.Quantity, ureg.Quantity):
+        """
+        Returns, for each triangle, the range of values for the
+        reactive power that could be added to make the power factor
+        bigger or equal to the given value.
+        """
+        return (
+            self.capacitive_power_factor_to(power_factor),
+            self.inductive_power_factor_to(power_factor)
+        )
+
+    def sum(self) -> PowerTriangle:
+        """
+        Returns the sum of every triangle.
+        """
+        total = self.values.sum()
+        return PowerTriangle.from_components(total.real, total.imag)
+
+    def cumsum(self) -> Self:
+        """
+        Returns the cumulative sums of the triangles.
+        """
+        return self.from_complex(np.cumsum(self.values))
+
+    def group_sum(self, labels) -> (np.ndarray, Self):
+        """
+        Sums the triangles that share the same label. Returns the
+        sorted unique labels and the sum of each group.
+        """
+        labels, inverse = np.unique(labels, return_inverse=True)
+        inverse = inverse.ravel()
+
+        active = np.bincount(
+            inverse, weights=self.values.real, minlength=len(labels))
+        reactive = np.bincount(
+            inverse, weights=self.values.imag, minlength=len(labels))
+        return labels, self.from_components(active, reactive)
@@ -0,0 +1,200 @@
+"""
+Dimensions a load schedule read from a CSV or Parquet file.
+
+The schedule is read in chunks of a bounded number of rows, each
+chunk is dimensioned and written to the destination before the next
+one is read, so the memory used does not grow with the schedule.
+
+Each row is an engine, with the columns:
+    power (kVA), power_factor, phase_num, method,
+and, optionally,
+    distance (m) and max_fall,
+    short_circuit_current (kA) and fault_elimination_time (s),
+    calculator (as 'CupperEPR', 'CupperPVC' by default),
+    grouping (number of grouped circuits) and temperature (°C).
+The other columns are copied to the results. The optional columns
+may be given defaults for the whole schedule.
+
+Parquet files need pyarrow.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .engines import engine_currents_raw
+from .parallel import (
+    OPTIONAL_COLUMNS, bounded_map, dimension_circuits, worker_pool)
+from .condutor_dimensioning.batch import BatchSections
+
+SCHEDULE_COLUMNS = ('power', 'power_factor', 'phase_num', 'method')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            'Reading and writing Parquet files needs pyarrow.') from None
+    return pyarrow
+
+
+def _is_parquet(path, file_format: str = None) -> bool:
+    if file_format is not None:
+        if file_format not in ('csv', 'parquet'):
+            raise NotImplementedError(
+                "The only schedule files implemented are csv and parquet.")
+        return file_format == 'parquet'
+
+    _, ext = os.path.splitext(path)
+    if ext in ('.parquet', '.pq'):
+        return True
+    if ext == '.csv':
+        return False
+    raise NotImplementedError(
+        "The only schedule files implemented are csv and parquet.")
+
+
+def read_schedule(
+    source: Path,
+    chunk_size: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the rows of the schedule in chunks of up to chunk_size.
+    """
+    if _is_parquet(source):
+        pyarrow = _pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size)
+
+
+def dimension_chunk(
+    chunk: pd.DataFrame,
+    defaults: Mapping = None
+) -> pd.DataFrame:
+    """
+    Returns the chunk with the current, in A, and the sections, in
+    mm², of each criterion. The sections not calculated, as the ones
+    out of the tables, are NaN. The defaults are used for the optional
+    columns the chunk does not have and for their blank cells.
+
+    The rows whose number of phases is not 1 or 3 are not dimensioned,
+    their current and sections are NaN, so one bad row does not stop
+    the schedule.
+    """
+    missing = set(SCHEDULE_COLUMNS) - set(chunk.columns)
+    if missing:
+        raise KeyError(f'Missing columns: {", ".join(sorted(missing))}.')
+
+    phase_nums = chunk['phase_num'].to_numpy()
+    valid = np.isin(phase_nums, (1, 3))
+
+    power_factors = chunk['power_factor'].to_numpy(dtype=float)
+    currents = np.full(len(chunk), np.nan)
+    currents[valid] = engine_currents_raw(
+        chunk['power'].to_numpy(dtype=float)[valid]*power_factors[valid],
+        power_factors[valid],
+        phase_nums[valid]
+    )
+
+    columns = {
+        col: chunk[col].to_numpy()
+        for col in ('method', 'phase_num') + OPTIONAL_COLUMNS
+        if col in chunk
+    }
+    for col, value in (defaults or {}).items():
+        if value is None:
+            continue
+        if col in columns:
+            columns[col] = np.where(
+                pd.isna(columns[col]), value, columns[col])
+        else:
+            columns[col] = np.full(len(chunk), value)
+    columns['current'] = currents
+    columns['power_factor'] = power_factors
+    sections = dimension_circuits(
+        {col: values[valid] for col, values in columns.items()})
+
+    result = chunk.copy()
+    result['current'] = currents
+    for field, values in zip(BatchSections._fields, sections):
+        column = np.full(len(chunk), np.nan)
+        if values is not None:
+            column[valid] = values.filled(np.nan)
+        result[f'{field}_section'] = column
+    return result
+
+
+def write_chunks(
+    chunks: Iterable[pd.DataFrame],
+    destination: Path,
+    file_format: str = None
+) -> int:
+    """
+    Writes the chunks, one at a time, to a CSV or Parquet file. The
+    format is given by the extension of the destination, unless the
+    file_format is 'csv' or 'parquet'. Returns the number of rows
+    written.
+    """
+    rows = 0
+    if _is_parquet(destination, file_format):
+        pyarrow = _pyarrow()
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(
+                        destination, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(destination, 'w', newline='', encoding='utf-8') as file:
+            for chunk in chunks:
+                chunk.to_csv(file, header=rows == 0, index=False)
+                rows += len(chunk)
+
+    return rows
+
+
+def dimension_schedule(
+    source: Path,
+    destination: Path,
+    chunk_size: int = 100_000,
+    defaults: Mapping = None,
+    workers: int = 0,
+    file_format: str = None
+) -> int:
+    """
+    Dimensions every engine of the schedule in the source file and
+    writes the results to the destination, chunk by chunk. Returns
+    the number of rows dimensioned.
+
+    The defaults are values of the optional columns for the rows that
+    do not have them, as {'calculator': 'CupperEPR', 'grouping': 3}.
+    With workers, the chunks are dimensioned by that many processes,
+    a few chunks at a time.
+    """
+    chunks = read_schedule(source, chunk_size)
+    task = functools.partial(dimension_chunk, defaults=defaults)
+
+    if not workers:
+        return write_chunks(map(task, chunks), destination, file_format)
+
+    with worker_pool(workers) as executor:
+        return write_chunks(
+            bounded_map(executor, task, chunks, 2*workers),
+            destination,
+            file_format
+        )
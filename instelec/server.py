@@ -0,0 +1,408 @@
+"""
+A daemon that keeps the unit registry and the tables loaded and
+answers sizing requests over a unix socket, for the tools that would
+otherwise start python for every calculation.
+
+Each line sent is a JSON request and each one receives a line with
+its JSON response. A request is an object
+
+    {"id": 1, "method": "section.by_amperage", "params": {...}}
+
+and is answered with {"id": 1, "result": {...}} or, when it fails,
+with {"id": 1, "error": {"type": "NotInTableError", "message": "..."}}.
+A line may also have a list of requests, answered by the list of
+their responses in the same order.
+
+The values are plain numbers in fixed units: powers in kVA, kW and
+kvar, currents in A, distances in m, short circuit currents in kA,
+times in s and sections in mm².
+
+The methods are:
+    engine.current         power, power_factor, phase_num
+    engine_group           engines, a list of the parameters of
+                           engine.current with a count each
+    section.by_amperage    current
+    section.by_voltage_drop
+                           current, distance, max_fall
+    section.by_short_circuit
+                           short_circuit_current, fault_elimination_time
+    section.protection_condutor
+                           phase_section
+    section.dimension      current and the parameters of the other
+                           criteria, the ones given are used
+    stats                  no parameters
+    reload                 no parameters, loads the settings and the
+                           tables changed again, as the signal SIGHUP
+
+The section methods also receive the calculator, as 'CupperEPR'
+('CupperPVC' by default), the method, power_factor and phase_num of
+the circuit and, optionally, the grouping and temperature (°C) of
+the corrections.
+"""
+
+import functools
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from . import condutor_dimensioning, settings
+from .settings import ureg
+from .engines import Engine, EngineGroup
+from .power_triangle import PowerTriangle
+from .installation import Feeder
+from .table_registry import registry
+from .parallel import shared_table_keys
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """
+    Raised when a request is not valid.
+    """
+
+
+def engine(params: dict) -> Engine:
+    power = float(params['power'])
+    power_factor = float(params['power_factor'])
+    return Engine(
+        PowerTriangle.from_components(
+            power*power_factor, power*(1 - power_factor**2)**0.5),
+        int(params['phase_num'])
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def calculator(
+    name: str,
+    method: str,
+    power_factor: float,
+    phase_num: int,
+    grouping: int,
+    temperature: float
+):
+    """
+    The calculator of the circuit, created once. The corrections are
+    only applied on creation, so it may be shared between requests.
+    """
+    try:
+        section_class = getattr(condutor_dimensioning, name)
+    except AttributeError:
+        raise RequestError(f'Unknown calculator {name!r}.') from None
+
+    section = section_class(method, power_factor, phase_num)
+    if grouping is not None:
+        section.grouping_correction(grouping)
+    if temperature is not None:
+        section.temperature_correction(ureg.Quantity(temperature, 'degC'))
+    return section
+
+
+def section_of(params: dict):
+    grouping = params.get('grouping')
+    temperature = params.get('temperature')
+    return calculator(
+        params.get('calculator', 'CupperPVC'),
+        params['method'],
+        float(params['power_factor']),
+        int(params['phase_num']),
+        None if grouping is None else int(grouping),
+        None if temperature is None else float(temperature)
+    )
+
+
+def engine_current(params: dict) -> dict:
+    return {'current': engine(params).current_raw()}
+
+
+def engine_group(params: dict) -> dict:
+    if not params['engines']:
+        raise RequestError('The group needs at least one engine.')
+
+    group = EngineGroup({
+        engine(item): int(item.get('count', 1))
+        for item in params['engines']
+    })
+    return {
+        'active': group.power.real,
+        'reactive': group.power.imag,
+        'apparent': abs(group.power),
+        'power_factor': group.power.real/abs(group.power),
+        'phase_currents': sorted(group.phase_currents_raw()),
+        'charge_current': max(group.phase_currents_raw()),
+    }
+
+
+def by_amperage(params: dict) -> dict:
+    section = section_of(params).by_amperage_raw(float(params['current']))
+    return {'section': section}
+
+
+def by_voltage_drop(params: dict) -> dict:
+    section = section_of(params).by_voltage_drop_raw(
+        float(params['current']),
+        float(params['distance']),
+        float(params['max_fall'])
+    )
+    return {'section': section}
+
+
+def by_short_circuit(params: dict) -> dict:
+    section = section_of(params).by_short_circuit_raw(
+        float(params['short_circuit_current']),
+        float(params['fault_elimination_time'])
+    )
+    return {'section': section}
+
+
+def protection_condutor(params: dict) -> dict:
+    section = section_of(params).protection_condutor_raw(
+        float(params['phase_section']))
+    return {'section': section}
+
+
+def dimension(params: dict) -> dict:
+    feeder = Feeder(
+        section_of(params),
+        params.get('distance'),
+        params.get('max_fall'),
+        params.get('short_circuit_current'),
+        params.get('fault_elimination_time')
+    )
+    return feeder.dimension_raw(float(params['current']))._asdict()
+
+
+METHODS: Dict[str, Callable[[dict], Any]] = {
+    'engine.current': engine_current,
+    'engine_group': engine_group,
+    'section.by_amperage': by_amperage,
+    'section.by_voltage_drop': by_voltage_drop,
+    'section.by_short_circuit': by_short_circuit,
+    'section.protection_condutor': protection_condutor,
+    'section.dimension': dimension,
+}
+
+
+class Counters:
+    """
+    Number of requests, errors and time spent answering them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self.seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def connected(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'connections': self.connections,
+                'uptime': uptime,
+                'throughput': self.requests/uptime if uptime else 0.0,
+                'mean_latency': (
+                    self.seconds/self.requests if self.requests else 0.0),
+                'max_latency': self.max_seconds,
+            }
+
+
+class SizingServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Serves each client in its own thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        self.counters = Counters()
+        super().__init__(socket_path, SizingHandler)
+
+    def answer(self, request: Any) -> dict:
+        """
+        Returns the response of a single request.
+        """
+        start = time.perf_counter()
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise RequestError('The request must be an object.')
+
+            method = request.get('method')
+            params = request.get('params') or {}
+            if method == 'stats':
+                result = self.counters.as_dict()
+            elif method == 'reload':
+                result = reload_tables()
+            elif method in METHODS:
+                result = METHODS[method](params)
+            else:
+                raise RequestError(f'Unknown method {method!r}.')
+            response = {'id': request_id, 'result': result}
+        except KeyError as error:
+            response = {'id': request_id, 'error': {
+                'type': 'RequestError',
+                'message': f'Missing parameter {error.args[0]!r}.'}}
+        except Exception as error:
+            response = {'id': request_id, 'error': {
+                'type': type(error).__name__, 'message': str(error)}}
+
+        self.counters.add(time.perf_counter() - start, 'error' in response)
+        return response
+
+
+class SizingHandler(socketserver.StreamRequestHandler):
+    """
+    Answers the lines of a client until it disconnects.
+    """
+
+    def handle(self) -> None:
+        self.server.counters.connected()
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {'id': None, 'error': {
+                    'type': 'RequestError', 'message': str(error)}}
+            else:
+                if isinstance(request, list):
+                    response = [self.server.answer(item) for item in request]
+                else:
+                    response = self.server.answer(request)
+
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+def warm_up() -> None:
+    """
+    Loads the unit registry and every table before the first request.
+    """
+    for key in shared_table_keys():
+        registry.get(*key)
+    ureg.Quantity(0, 'degC').to('kelvin')
+
+
+def reload_tables() -> dict:
+    """
+    Loads the settings again and forgets the calculators and the
+    tables of the files changed, which are loaded again. If the
+    settings or a table fail to load, the previous ones are kept and
+    the error is raised.
+    """
+    previous = settings.snapshot()
+    tables = registry.snapshot()
+    try:
+        changed = settings.reload()
+        calculator.cache_clear()
+        warm_up()
+    except Exception:
+        settings.restore(previous)
+        registry.restore(tables)
+        calculator.cache_clear()
+        raise
+
+    return {
+        'changed': [str(path) for path in changed],
+        'generation': registry.generation,
+    }
+
+
+def reload_on_signal(signum, frame) -> None:
+    """
+    The handler of SIGHUP. The errors are logged instead of raised,
+    which would stop the daemon.
+    """
+    try:
+        reload_tables()
+    except Exception:
+        logger.exception('The settings and tables were not reloaded.')
+
+
+def serve(socket_path: str) -> None:
+    """
+    Serves on the unix socket until interrupted or terminated.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    # Terminating stops the daemon as an interruption does, so the
+    # socket is removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    signal.signal(signal.SIGHUP, reload_on_signal)
+
+    warm_up()
+    with SizingServer(socket_path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
+class Client:
+    """
+    A client of the daemon, for scripts and tests.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.file = self.socket.makefile('rwb')
+        self._next_id = 0
+
+    def send(self, request: Any) -> Any:
+        """
+        Sends a request, or a list of them, and returns the response.
+        """
+        self.file.write(json.dumps(request).encode() + b'\n')
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def call(self, method: str, /, **params) -> Any:
+        """
+        Returns the result of the method, raising RequestError with
+        the error of the daemon if it failed.
+        """
+        self._next_id += 1
+        response = self.send(
+            {'id': self._next_id, 'method': method, 'params': params})
+        if 'error' in response:
+            error = response['error']
+            raise RequestError(f'{error["type"]}: {error["message"]}')
+        return response['result']
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,10 +1,145 @@
-import sys
+"""
+Loads the settings, from the settings.py of the working directory,
+as created by `python -m instelec settings`, or the default ones.
+
+The settings are loaded again by reload, so a running process, as
+the daemon, uses the tables changed since they were loaded without
+restarting. The unit registry and the voltages are bound by the
+modules when they are imported and are kept.
+"""
+
+import importlib
+import importlib.util
 import os
+from pathlib import Path
+
+# Settings the calculations bind on import, kept by reload.
+FIXED_SETTINGS = ('ureg', 'VOLTAGE_FF', 'VOLTAGE_FN', 'UNIT_REGISTRY_CACHE')
+
+# Names of this module, not of the settings file, also kept by reload.
+_OWN_NAMES = (
+    '_OWN_NAMES', 'FIXED_SETTINGS', 'TABLE_SETTINGS', 'SETTINGS_FILE',
+    'VOLTAGE_FF_RAW', 'VOLTAGE_FN_RAW'
+)
+
+# Settings that choose which tables are loaded and how. Changing any
+# of them forgets every table loaded.
+TABLE_SETTINGS = (
+    'SIMULTANEITY_TABLE', 'AMPERAGE_TABLE', 'VOLTAGE_DROP_TABLE',
+    'TEMPERATURE_TABLE', 'GROUPING_TABLE', 'TABLE_BUNDLE', 'TABLE_DTYPE',
+    'AMPERAGE_TABLE_CLASS', 'VOLTAGE_DROP_TABLE_CLASS',
+    'GROUPING_TABLE_CLASS', 'TEMPERATURE_TABLE_AMBIENT_CLASS',
+    'TEMPERATURE_TABLE_GROUND_CLASS'
+)
+
+
+def settings_file():
+    """
+    The settings.py of the working directory, or None if there is
+    none and the default settings are used.
+    """
+    if os.path.exists('settings.py'):
+        return Path('settings.py').resolve()
+    return None
+
+
+def _load() -> dict:
+    """
+    Executes the settings file and returns its settings.
+    """
+    filepath = settings_file()
+    if filepath is None:
+        module = importlib.import_module('.default.settings', __package__)
+        if _loaded:
+            module = importlib.reload(module)
+    else:
+        spec = importlib.util.spec_from_file_location(
+            'instelec_user_settings', filepath)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+    return {
+        name: value for name, value in vars(module).items()
+        if name.isupper() or name == 'ureg'
+    }
+
+
+_loaded = False
+globals().update(_load())
+_loaded = True
+SETTINGS_FILE = settings_file()
+
+
+def _replace(values: dict) -> None:
+    """
+    Replaces the settings by the values, removing the ones absent.
+    """
+    for name in [name for name in globals() if name.isupper()]:
+        if name not in values and name not in _OWN_NAMES\
+                and name not in FIXED_SETTINGS:
+            del globals()[name]
+    globals().update(values)
+
+
+def snapshot() -> dict:
+    """
+    The settings loaded, to be restored by restore.
+    """
+    return {name: value for name, value in globals().items()
+            if name.isupper()}
+
+
+def restore(values: dict) -> None:
+    """
+    Restores the settings of a snapshot and forgets the table
+    classes resolved with the ones replaced.
+    """
+    from .utils import import_by_full_name
+    from .condutor_dimensioning.memo import memo
+
+    _replace(values)
+    import_by_full_name.cache_clear()
+    memo.configure(globals().get('DIMENSIONING_CACHE_SIZE', 0))
+
+
+def reload() -> list:
+    """
+    Loads the settings again and forgets what was calculated with
+    the tables that changed: the tables of the registry, the memo
+    of the sections and the table classes resolved.
+
+    If a setting of the tables changed every table is forgotten,
+    otherwise only the ones whose files changed, by modification
+    time and content. The settings removed from the file are removed.
+    Returns the files of the tables that changed. If the settings
+    file fails to run, nothing changes.
+    """
+    global SETTINGS_FILE
+
+    from .utils import import_by_full_name
+    from .table_registry import registry
+    from .condutor_dimensioning.memo import memo
+
+    new = _load()
+    tables_changed = any(
+        new.get(name) != globals().get(name) for name in TABLE_SETTINGS)
+
+    for name in FIXED_SETTINGS:
+        new.pop(name, None)
+    _replace(new)
+    SETTINGS_FILE = settings_file()
+
+    import_by_full_name.cache_clear()
+    memo.configure(globals().get('DIMENSIONING_CACHE_SIZE', 0))
 
+    changed = registry.changed_sources()
+    if tables_changed:
+        registry.clear()
+    else:
+        registry.refresh(changed)
+    return changed
 
-if os.path.exists('settings.py'):
-    sys.path.insert(0, 'settings.py')
 
-    from settings import *
-else:
-    from .default.settings import *
+# Voltages in V, for the calculations without units.
+VOLTAGE_FF_RAW = VOLTAGE_FF.to(ureg.volt).magnitude
+VOLTAGE_FN_RAW = VOLTAGE_FN.to(ureg.volt).magnitude
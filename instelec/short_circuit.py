@@ -0,0 +1,209 @@
+"""
+Calculates the prospective short circuit currents at every node of
+a radial instalation, from the impedance of the source and the
+sections chosen for the feeders, and checks the feeders by the
+short circuit criterion.
+
+The impedance of a feeder is the one of its phase condutor. As the
+currents sought are the highest ones, the resistance is the one at
+20 °C, from the resistivity of the material, and the reactance is
+the smallest one of the voltage drop table among the sections not
+smaller than the feeder's. The impedances are summed from the source
+down the tree by pointer jumping: at each step every node adds the
+sum of its farthest known ancestor and jumps to the ancestor of that
+one, all nodes at once, so n nodes at depth d take about log2(d)
+vectorized steps.
+
+The currents are the symmetric three-phase ones, c·V/(√3·|Z|), in
+kA, where c is the voltage factor of IEC 60909, 1.05 for the maximum
+currents in low voltage.
+"""
+
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from .settings import ureg, VOLTAGE_FF_RAW
+from .condutor_dimensioning import batch
+
+# Voltage factor of the maximum currents in low voltage.
+VOLTAGE_FACTOR = 1.05
+
+
+def source_impedance_raw(
+    short_circuit_current: float,
+    x_over_r: float = 10,
+    voltage_factor: float = VOLTAGE_FACTOR
+) -> complex:
+    """
+    The impedance, in Ω, of a source whose short circuit current at
+    the origin of the instalation is the given one, in kA. Without
+    better data, IEC 60909 takes the reactance of the network as 10
+    times its resistance.
+    """
+    # The current is inversely proportional to the impedance.
+    magnitude = currents_raw(short_circuit_current, voltage_factor)
+    resistance = magnitude/np.sqrt(1 + x_over_r**2)
+    return complex(resistance, x_over_r*resistance)
+
+
+def feeder_impedances_raw(section, sections, distances) -> np.ndarray:
+    """
+    The impedances, in Ω, of phase condutors of the sections, in mm²,
+    and lengths, in m, of the material of the calculator section.
+    """
+    sections = np.asarray(sections, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+
+    resistivity = section.electrical_resistivity.to(
+        ureg.ohm*ureg.meter).magnitude
+    # From mm² to m².
+    resistances = resistivity*distances/(1e-6*sections)
+
+    voltage_drop = section.voltage_drop
+    table_sections = voltage_drop.sections
+    # In Ω/km, the smallest of each section and the bigger ones.
+    reactances = np.minimum.accumulate(voltage_drop.reactance[::-1])[::-1]
+    idx = np.minimum(
+        np.searchsorted(table_sections, sections), len(table_sections) - 1)
+
+    return resistances + 1j*reactances[idx]*distances/1000
+
+
+def cumulative_impedances(parents, impedances) -> np.ndarray:
+    """
+    Sums the impedance of each node with the ones of its ancestors.
+    The parents are the indexes of the parent of each node, -1 for
+    the nodes fed by the source.
+    """
+    parents = np.asarray(parents, dtype=int)
+    total = np.array(impedances, dtype=complex)
+    if np.any((parents < -1) | (parents >= len(parents))):
+        raise ValueError('The parents must be indexes of the nodes or -1.')
+
+    # The sum of each node runs up to, not including, its ancestor.
+    ancestors = parents.copy()
+    for _ in range(len(parents).bit_length() + 1):
+        fed = np.flatnonzero(ancestors >= 0)
+        if not len(fed):
+            return total
+
+        up = ancestors[fed]
+        total[fed] += total[up]
+        ancestors[fed] = ancestors[up]
+
+    raise ValueError('The instalation is not radial, it has a cycle.')
+
+
+def currents_raw(impedances, voltage_factor: float = VOLTAGE_FACTOR):
+    """
+    The three-phase short circuit currents, in kA, through the
+    impedances, in Ω, from the source to the fault.
+    """
+    with np.errstate(divide='ignore'):
+        return voltage_factor*VOLTAGE_FF_RAW/(
+            np.sqrt(3)*1000*np.abs(impedances))
+
+
+def fault_currents_raw(
+    parents,
+    impedances,
+    source_impedance: complex,
+    voltage_factor: float = VOLTAGE_FACTOR
+) -> np.ndarray:
+    """
+    The prospective short circuit currents, in kA, at each node, from
+    the impedances, in Ω, of the feeders of the nodes and of the
+    source. See cumulative_impedances.
+    """
+    return currents_raw(
+        source_impedance + cumulative_impedances(parents, impedances),
+        voltage_factor
+    )
+
+
+class ShortCircuitStudy(NamedTuple):
+    """
+    The nodes of the instalation, the prospective short circuit
+    current, in kA, at each one and at the origin of its feeder, the
+    section, in mm², the short circuit criterion requires of the
+    feeder and whether the one chosen is enough. The last two are
+    masked for the nodes without feeder or fault elimination time.
+    """
+    nodes: List
+    currents: np.ndarray
+    origin_currents: np.ndarray
+    required: np.ma.MaskedArray
+    sufficient: np.ma.MaskedArray
+
+    def current_of(self, node) -> ureg.Quantity:
+        """
+        The prospective short circuit current at the node.
+        """
+        return self.currents[self.nodes.index(node)]*ureg.kiloampere
+
+
+def short_circuit_study(
+    root,
+    source_impedance: complex,
+    voltage_factor: float = VOLTAGE_FACTOR
+) -> ShortCircuitStudy:
+    """
+    Calculates the short circuit currents at every node below the
+    root, a Board of the instalation, fed by a source of the given
+    impedance, in Ω. The feeders have the phase sections chosen by
+    Node.sections. Each feeder is then checked, by the batched short
+    circuit criterion of its calculator, against the current at its
+    origin, the one of its parent or of the source.
+    """
+    nodes = list(root.walk())
+    index = {id(node): idx for idx, node in enumerate(nodes)}
+    parents = np.array([
+        -1 if node is root else index[id(node.parent)] for node in nodes])
+
+    # The nodes of each calculator, whose impedances are found at once.
+    groups: Dict[int, list] = {}
+    for idx, node in enumerate(nodes):
+        if node.feeder is not None:
+            groups.setdefault(id(node.feeder.section), []).append(idx)
+
+    size = len(nodes)
+    impedances = np.zeros(size, dtype=complex)
+    chosen = np.full(size, np.nan)
+    times = np.full(size, np.nan)
+    for selected in groups.values():
+        feeders = [nodes[idx].feeder for idx in selected]
+        chosen[selected] = [nodes[idx].sections().phase for idx in selected]
+        times[selected] = [
+            np.nan if feeder.fault_elimination_time is None
+            else feeder.fault_elimination_time for feeder in feeders]
+        distances = [feeder.distance or 0.0 for feeder in feeders]
+        impedances[selected] = feeder_impedances_raw(
+            feeders[0].section, chosen[selected], distances)
+
+    currents = fault_currents_raw(
+        parents, impedances, source_impedance, voltage_factor)
+    origin_currents = np.where(
+        parents >= 0,
+        currents[np.maximum(parents, 0)],
+        currents_raw(source_impedance, voltage_factor)
+    )
+
+    # Required sections above the table are masked, but not checked
+    # ones are the only feeders left out of sufficient.
+    required = np.ma.masked_all(size)
+    checked = ~np.isnan(times)
+    for selected in groups.values():
+        selected = np.array(selected)
+        selected = selected[checked[selected]]
+        if len(selected):
+            required[selected] = batch.by_short_circuit(
+                nodes[selected[0]].feeder.section,
+                origin_currents[selected],
+                times[selected]
+            )
+
+    sufficient = np.ma.masked_array(
+        required.filled(np.inf) <= chosen, mask=~checked)
+    return ShortCircuitStudy(
+        nodes, currents, origin_currents, required, sufficient)
@@ -0,0 +1,296 @@
+"""
+Compiles every table of the settings into a single binary bundle.
+
+The bundle is made of a .npy file, with the values of all the
+tables concatenated as float64, and a .json manifest with the
+version, the content hash and where each table lies in the data.
+The data is loaded with np.load(mmap_mode='r'), so the processes
+that use the bundle share the same pages and parse nothing. The
+hash of the data is only checked when asked for, by verify, as it
+reads every page.
+
+The tables are identified by the path of their source file relative
+to the bundle, so a bundle keeps working when the settings folder is
+copied elsewhere.
+"""
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+BUNDLE_VERSION = 1
+
+
+class InvalidTableError(Exception):
+    """
+    Raised when a table does not have the order its search needs.
+    """
+
+
+def manifest_path(bundle_path: Path) -> Path:
+    """
+    Returns the path of the manifest of the bundle.
+    """
+    return Path(bundle_path).with_suffix('.json')
+
+
+def read_source(
+    filepath: Path,
+    index_col: str = None,
+    content: bytes = None
+) -> pd.DataFrame:
+    """
+    Parses the csv or xlsx file of a table. Its content may be given,
+    when it was already read.
+    """
+    source = filepath if content is None else io.BytesIO(content)
+    _, ext = os.path.splitext(filepath)
+    if ext == '.csv':
+        return pd.read_csv(source, index_col=index_col)
+    if ext == '.xlsx':
+        return pd.read_excel(source, index_col=index_col)
+
+    raise NotImplementedError(
+        "The only tablefiles implemented are csv and xlsx.")
+
+
+def fingerprint(filepath: Path) -> Optional[tuple]:
+    """
+    Returns the modification time, in ns, and the size of the file,
+    or None if it does not exist.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def digest(filepath: Path) -> Optional[str]:
+    """
+    Returns the sha256 of the content of the file, or None if it
+    does not exist.
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def check_monotonic(
+    values,
+    name: str,
+    increasing: bool = True,
+    strict: bool = False
+) -> None:
+    """
+    Raises InvalidTableError if the values, NaN ignored, are not
+    sorted in the given direction.
+    """
+    values = np.asarray(values, dtype=float)
+    diff = np.diff(values[~np.isnan(values)])
+    if not increasing:
+        diff = -diff
+
+    if np.any(diff < 0) or (strict and np.any(diff == 0)):
+        order = 'increasing' if increasing else 'decreasing'
+        raise InvalidTableError(f'{name} is not {order}.')
+
+
+def validate(kind: str, table: pd.DataFrame, name: str) -> None:
+    """
+    Checks the order the searches of each kind of table rely on.
+    """
+    if kind == 'amperage':
+        check_monotonic(table.index, f'{name} sections', strict=True)
+        for col in table:
+            check_monotonic(table[col], f'{name} column {col}')
+    elif kind == 'voltage_drop':
+        check_monotonic(table.index, f'{name} sections', strict=True)
+        check_monotonic(table['R'], f'{name} resistance', increasing=False)
+    elif kind == 'grouping':
+        for col in table:
+            check_monotonic(table[col], f'{name} column {col}', False)
+    elif kind == 'temperature':
+        check_monotonic(table.index, f'{name} temperatures', strict=True)
+        for col in table:
+            check_monotonic(table[col], f'{name} column {col}', False)
+    elif kind == 'simultaneity':
+        inf_limits = table['inf_limit (HP)']
+        sup_limits = table['sup_limit (HP)'].fillna(np.inf)
+        check_monotonic(inf_limits, f'{name} inferior limits', strict=True)
+        check_monotonic(sup_limits, f'{name} superior limits', strict=True)
+        if np.any(sup_limits < inf_limits):
+            raise InvalidTableError(f'{name} has an empty interval.')
+        check_monotonic(table.columns[2:], f'{name} columns', strict=True)
+
+
+def sources(settings) -> Dict[Path, tuple]:
+    """
+    Returns the source files of the settings, with the kind of each
+    table and the column used as index.
+    """
+    files = {}
+    for tables in settings.AMPERAGE_TABLE.values():
+        for filepath in tables.values():
+            files[Path(filepath)] = ('amperage', 'nominal_sections')
+    files[Path(settings.VOLTAGE_DROP_TABLE)] = ('voltage_drop', 'section')
+    files[Path(settings.GROUPING_TABLE)] = ('grouping', None)
+    for filepath in settings.TEMPERATURE_TABLE.values():
+        files[Path(filepath)] = ('temperature', 'temperatura')
+    files[Path(settings.SIMULTANEITY_TABLE)] = ('simultaneity', None)
+    return files
+
+
+def label(value):
+    """
+    Converts numpy scalars to python ones, that json can store.
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def compile_tables(settings, bundle_path: Path = None) -> Path:
+    """
+    Validates every table of the settings and writes them to the
+    bundle. Returns the path of the data file written.
+    """
+    bundle_path = Path(bundle_path or settings.TABLE_BUNDLE)
+    root = bundle_path.parent
+
+    arrays, tables, offset = [], {}, 0
+    for filepath, (kind, index_col) in sources(settings).items():
+        table = read_source(filepath, index_col)
+        validate(kind, table, filepath.name)
+
+        # The index, when there is one, is stored as the first column.
+        raw = table.reset_index() if index_col else table
+        values = raw.to_numpy(dtype=float)
+        arrays.append(values.ravel())
+
+        stat = filepath.stat()
+        tables[os.path.relpath(filepath, root)] = {
+            'offset': offset,
+            'shape': list(values.shape),
+            'index': index_col,
+            'columns': [label(col) for col in raw.columns],
+            'source_mtime': stat.st_mtime,
+            'source_size': stat.st_size,
+            'source_sha256': digest(filepath),
+        }
+        offset += values.size
+
+    data = np.concatenate(arrays) if arrays else np.empty(0)
+    np.save(bundle_path, data)
+
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'sha256': hashlib.sha256(data.tobytes()).hexdigest(),
+        'tables': tables,
+    }
+    with open(manifest_path(bundle_path), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+
+    return bundle_path
+
+
+class TableBundle:
+    """
+    A compiled bundle, memory-mapped. The table method returns the
+    table of a source file without parsing it. With verify, the hash
+    of the data is checked on load.
+    """
+
+    def __init__(self, bundle_path: Path, verify: bool = False) -> None:
+        bundle_path = Path(bundle_path)
+        with open(manifest_path(bundle_path), encoding='utf-8') as file:
+            manifest = json.load(file)
+
+        if manifest['version'] != BUNDLE_VERSION:
+            raise ValueError(
+                f'The table bundle version {manifest["version"]} is not '
+                f'supported, compile the tables again.')
+
+        self.root = bundle_path.parent
+        self.data = np.load(bundle_path, mmap_mode='r')
+        self.tables = manifest['tables']
+        self.sha256 = manifest['sha256']
+
+        if verify:
+            self.verify()
+
+    def verify(self) -> None:
+        """
+        Raises ValueError if the data does not match the hash of the
+        manifest. Reads the whole data.
+        """
+        if hashlib.sha256(self.data.tobytes()).hexdigest() != self.sha256:
+            raise ValueError('The table bundle is corrupted.')
+
+    @classmethod
+    def load(cls, bundle_path: Optional[Path]) -> Optional['TableBundle']:
+        """
+        Loads the bundle, or returns None if it was not compiled.
+        """
+        if bundle_path is None or not os.path.exists(bundle_path):
+            return None
+        return cls(bundle_path)
+
+    def entry(self, filepath: Path) -> Optional[dict]:
+        """
+        Returns the manifest entry of the source file, or None if it
+        is not in the bundle or changed after the compilation.
+        """
+        entry = self.tables.get(os.path.relpath(filepath, self.root))
+        if entry is None:
+            return None
+
+        # The sources may be left out where only the bundle is
+        # deployed, but if they are present they must be the same.
+        try:
+            stat = Path(filepath).stat()
+        except FileNotFoundError:
+            return entry
+
+        if (stat.st_mtime, stat.st_size)\
+                != (entry['source_mtime'], entry['source_size']):
+            return None
+        return entry
+
+    def source_sha256(self, filepath: Path) -> Optional[str]:
+        """
+        Returns the sha256 of the source file when it was compiled,
+        or None if it is not in the bundle or changed after.
+        """
+        entry = self.entry(filepath)
+        return None if entry is None else entry.get('source_sha256')
+
+    def table(self, filepath: Path) -> Optional[pd.DataFrame]:
+        """
+        Returns the table of the source file as a DataFrame over the
+        memory-mapped data, or None if it is not in the bundle.
+        """
+        entry = self.entry(filepath)
+        if entry is None:
+            return None
+
+        rows, cols = entry['shape']
+        start = entry['offset']
+        values = self.data[start:start + rows*cols].reshape(rows, cols)
+        columns = entry['columns']
+
+        if entry['index'] is None:
+            return pd.DataFrame(values, columns=columns, copy=False)
+
+        return pd.DataFrame(
+            values[:, 1:],
+            index=pd.Index(values[:, 0], name=entry['index']),
+            columns=columns[1:],
+            copy=False
+        )
@@ -0,0 +1,335 @@
+"""
+Keeps the tables used by the module loaded only once per process.
+
+Each table is parsed on its first request, frozen and stored by
+its kind and key. Every following request receives a read-only
+view of the same data, so creating calculators never touches the
+disk again.
+
+If the tables were compiled with `python -m instelec compile-tables`
+they are taken from the memory-mapped bundle instead of parsed.
+
+The values of the tables are stored in the dtype set by TABLE_DTYPE
+in the settings, float64 by default or float32 to halve their memory.
+
+The modification time, size and content hash of each file read are
+kept, so the tables of the files changed since can be found and
+loaded again by refresh.
+"""
+
+import hashlib
+import threading
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import settings
+from .table_bundle import TableBundle, digest, fingerprint, read_source
+
+
+class RegistryInfo(NamedTuple):
+    """
+    Statistics of the table registry.
+    """
+    hits: int
+    misses: int
+    size: int
+
+
+# The dtypes TABLE_DTYPE may choose.
+TABLE_DTYPES = ('float32', 'float64')
+
+
+def table_dtype() -> np.dtype:
+    """
+    The dtype of the values of the tables, set by TABLE_DTYPE.
+    """
+    dtype = getattr(settings, 'TABLE_DTYPE', 'float64')
+    if dtype not in TABLE_DTYPES:
+        raise ValueError(
+            f'TABLE_DTYPE must be one of {", ".join(TABLE_DTYPES)}.')
+    return np.dtype(dtype)
+
+
+def freeze(table: pd.DataFrame, dtype: np.dtype = None) -> pd.DataFrame:
+    """
+    Returns a copy of the table, with the values converted to the
+    dtype if given, that can not be written. Tables already read-only
+    and of the dtype, as the ones of the bundle in float64, are not
+    copied.
+    """
+    values = table.to_numpy(dtype=dtype)
+    if values.flags.writeable:
+        values = values.copy()
+        values.flags.writeable = False
+    return pd.DataFrame(
+        values, index=table.index, columns=table.columns, copy=False)
+
+
+class TableRegistry:
+    """
+    Stores the tables by kind and key. The loader of each kind is
+    registered with the register method and receives the key as
+    arguments.
+
+    The get method returns read-only views, so the tables can be
+    shared by every calculator of the process.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: Dict[str, Callable[..., Any]] = {}
+        self._tables: Dict[Tuple, Any] = {}
+        self._lock = threading.RLock()
+        self._bundle = None
+        self._bundle_loaded = False
+
+        # The fingerprint and the sha256 of each file read, the keys
+        # of the tables loaded from it and the keys being loaded.
+        self._sources: Dict[Path, tuple] = {}
+        self._dependents: Dict[Path, Set[Tuple]] = {}
+        self._loading: List[Tuple] = []
+
+        self.hits = 0
+        self.misses = 0
+        # Changes whenever the tables loaded are discarded, so the
+        # results calculated with them can be discarded too.
+        self.generation = 0
+
+    def register(self, kind: str, loader: Callable[..., Any] = None):
+        """
+        Registers the loader of a kind of table. May be used as a
+        decorator.
+        """
+        if loader is None:
+            return lambda func: self.register(kind, func)
+
+        self._loaders[kind] = loader
+        return loader
+
+    def get(self, kind: str, *key) -> Any:
+        """
+        Returns the table of the given kind and key, loading it if
+        it was not requested before.
+        """
+        full_key = (kind, *key)
+
+        with self._lock:
+            try:
+                table = self._tables[full_key]
+            except KeyError:
+                self.misses += 1
+                self._loading.append(full_key)
+                try:
+                    table = self._loaders[kind](*key)
+                finally:
+                    self._loading.pop()
+                if isinstance(table, pd.DataFrame):
+                    table = freeze(table, table_dtype())
+                self._tables[full_key] = table
+            else:
+                self.hits += 1
+
+        if isinstance(table, pd.DataFrame):
+            # A shallow copy keeps in-place operators of the caller
+            # from replacing the data every other caller sees.
+            return table.copy(deep=False)
+        return table
+
+    def preload(self, key: Tuple, table: Any) -> None:
+        """
+        Stores a table already loaded, as the ones shared by another
+        process, under its full key (kind, *key). Its dtype is kept.
+        """
+        if isinstance(table, pd.DataFrame):
+            table = freeze(table)
+        with self._lock:
+            self._tables[tuple(key)] = table
+
+    @property
+    def bundle(self) -> TableBundle:
+        """
+        The compiled bundle of the settings, loaded on first use. It
+        is None if the tables were not compiled.
+        """
+        with self._lock:
+            if not self._bundle_loaded:
+                self._bundle = TableBundle.load(
+                    getattr(settings, 'TABLE_BUNDLE', None))
+                self._bundle_loaded = True
+        return self._bundle
+
+    def read(self, filepath: Path, index_col: str = None) -> pd.DataFrame:
+        """
+        Returns the table of a source file, from the bundle when it
+        has an up to date copy of it and parsing the file otherwise.
+
+        Only the modification time and size of the file are read when
+        it comes from the bundle, its hash is the one of the manifest.
+        """
+        filepath = Path(filepath)
+        stat = fingerprint(filepath)
+        with self._lock:
+            self._dependents.setdefault(filepath, set()).update(
+                self._loading)
+
+        bundle = self.bundle
+        if bundle is not None:
+            table = bundle.table(filepath)
+            if table is not None:
+                with self._lock:
+                    self._sources[filepath] = (
+                        stat, bundle.source_sha256(filepath))
+                return table
+
+            warnings.warn(
+                f'{filepath} is not in the table bundle or changed after '
+                f'it was compiled. Run `python -m instelec compile-tables`.')
+
+        # Hashed from the same bytes that are parsed.
+        content = filepath.read_bytes()
+        with self._lock:
+            self._sources[filepath] = (
+                stat, hashlib.sha256(content).hexdigest())
+        return read_source(filepath, index_col, content)
+
+    def changed_sources(self) -> List[Path]:
+        """
+        Returns the files read whose content changed since. The
+        content is only hashed if the modification time or the size
+        changed. A file whose hash is unknown, as one from a bundle
+        compiled without it, changed if either did.
+        """
+        changed = []
+        with self._lock:
+            for filepath, (stat, old) in self._sources.items():
+                new_stat = fingerprint(filepath)
+                if new_stat == stat:
+                    continue
+
+                if digest(filepath) == old:
+                    # Only touched.
+                    self._sources[filepath] = (new_stat, old)
+                else:
+                    changed.append(filepath)
+        return changed
+
+    def refresh(self, changed: List[Path] = None) -> List[Path]:
+        """
+        Forgets the tables loaded from the files changed, the ones
+        given or else the ones found by changed_sources, so they are
+        loaded again on their next request. If any was forgotten, the
+        bundle is loaded again and a new generation starts. Returns
+        the files changed.
+        """
+        with self._lock:
+            if changed is None:
+                changed = self.changed_sources()
+            if not changed:
+                return changed
+
+            for filepath in changed:
+                self._sources.pop(filepath, None)
+                for key in self._dependents.pop(filepath, ()):
+                    self._tables.pop(key, None)
+
+            self._bundle = None
+            self._bundle_loaded = False
+            self.generation += 1
+        return changed
+
+    def snapshot(self) -> tuple:
+        """
+        The tables loaded and the fingerprints of their files, to be
+        restored by restore.
+        """
+        with self._lock:
+            return (
+                dict(self._tables),
+                dict(self._sources),
+                {path: set(keys) for path, keys in self._dependents.items()},
+                self._bundle,
+                self._bundle_loaded
+            )
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        Forgets the tables loaded after the snapshot and loads back
+        the ones of the snapshot, starting a new generation.
+        """
+        tables, sources, dependents, bundle, bundle_loaded = snapshot
+        with self._lock:
+            self._tables = dict(tables)
+            self._sources = dict(sources)
+            self._dependents = {
+                path: set(keys) for path, keys in dependents.items()}
+            self._bundle = bundle
+            self._bundle_loaded = bundle_loaded
+            self.generation += 1
+
+    def info(self) -> RegistryInfo:
+        """
+        Returns the number of hits, misses and tables loaded.
+        """
+        return RegistryInfo(self.hits, self.misses, len(self._tables))
+
+    def clear(self) -> None:
+        """
+        Forgets every table and the bundle loaded, resets the
+        statistics and starts a new generation.
+        """
+        with self._lock:
+            self._tables.clear()
+            self._bundle = None
+            self._bundle_loaded = False
+            self._sources.clear()
+            self._dependents.clear()
+            self.hits = 0
+            self.misses = 0
+            self.generation += 1
+
+
+registry = TableRegistry()
+
+
+@registry.register('amperage')
+def load_amperage(material: str, insulator: str) -> pd.DataFrame:
+    """
+    Loads the amperage table of the material and insulator.
+    """
+    tables = settings.AMPERAGE_TABLE
+    if material not in tables and material == 'aluminium':
+        # The key of the settings created before it matched
+        # Aluminium.material.
+        material = 'aluminum'
+    filepath = tables[material][insulator]
+    return registry.read(filepath, index_col='nominal_sections')
+
+
+@registry.register('voltage_drop')
+def load_voltage_drop() -> pd.DataFrame:
+    """
+    Loads the voltage drop table.
+    """
+    return registry.read(settings.VOLTAGE_DROP_TABLE, index_col='section')
+
+
+@registry.register('grouping')
+def load_grouping() -> pd.DataFrame:
+    """
+    Loads the grouping table, indexed by the number of circuits.
+    """
+    table = registry.read(settings.GROUPING_TABLE)
+    table.index += 1
+    return table
+
+
+@registry.register('temperature')
+def load_temperature(place: str) -> pd.DataFrame:
+    """
+    Loads the temperature correction table of the place.
+    """
+    return registry.read(
+        settings.TEMPERATURE_TABLE[place], index_col='temperatura')
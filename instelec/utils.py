@@ -1,7 +1,13 @@
+import functools
 import importlib
 
 
+@functools.cache
 def import_by_full_name(class_path):
+    """
+    Imports and returns the object of the full dotted name. The
+    result is cached, so it may be called on every use.
+    """
     module_path, class_name = class_path.rsplit('.', 1)
     module = importlib.import_module(module_path)
     
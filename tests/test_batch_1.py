@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import instelec as ie
+u = ie.ureg
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.eng1 = ie.Engine(ie.PowerTriangle(8*u.kilovolt_ampere, 0.8), 1)
+        self.eng2 = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+        self.eng3 = ie.Engine(ie.PowerTriangle(11*u.kilovolt_ampere, 0.8), 1)
+        self.engines = [self.eng1, self.eng2, self.eng3]
+
+        self.section = ie.CupperPVC('B1', 0.8, 3)
+
+    def dimension(self, section):
+        return section.dimension_batch(
+            [eng.current().magnitude for eng in self.engines],
+            distances=[29, 29, 29],
+            max_falls=0.03,
+            short_circuit_currents=4,
+            fault_elimination_times=0.01,
+            phase_nums=[eng.phase_num for eng in self.engines],
+            power_factors=[eng.power.power_factor for eng in self.engines]
+        )
+
+    def test_sections(self):
+        result = self.dimension(self.section)
+
+        np.testing.assert_array_equal(result.amperage, [6, 16, 10])
+        np.testing.assert_array_equal(result.voltage_drop, [6, 6, 10])
+        np.testing.assert_array_equal(result.short_circuit, [4, 4, 4])
+        np.testing.assert_array_equal(result.phase, [6, 16, 10])
+        np.testing.assert_array_equal(result.protection, [6, 16, 10])
+
+    def test_matches_scalar_methods(self):
+        currents = np.array([103.18, 117.68, 98.0, 250.0])
+        result = self.section.dimension_batch(currents, 160, 0.03)
+
+        for idx, current in enumerate(currents*u.ampere):
+            self.assertEqual(
+                result.amperage[idx]*u.millimeter**2,
+                self.section.by_amperage(current))
+            self.assertEqual(
+                result.voltage_drop[idx]*u.millimeter**2,
+                self.section.by_voltage_drop(current, 160*u.meter, 0.03))
+
+    def test_corrections_are_used(self):
+        self.section.grouping_correction(3)
+        result = self.section.dimension_batch([103.18], phase_nums=1)
+        self.assertEqual(result.amperage[0], 50)
+
+    def test_misses_are_masked(self):
+        result = self.section.dimension_batch(
+            [10, 5000, 10],
+            instalation_methods=['B1', 'B1', 'Z'],
+            short_circuit_currents=[4, 4, 4],
+            fault_elimination_times=0.01
+        )
+
+        np.testing.assert_array_equal(
+            np.ma.getmaskarray(result.amperage), [False, True, True])
+        np.testing.assert_array_equal(
+            np.ma.getmaskarray(result.phase), [False, True, True])
+        self.assertEqual(result.phase[0], 4)
+        self.assertIsNone(result.voltage_drop)
+
+    def test_invalid_phase_num(self):
+        with self.assertRaises(AssertionError):
+            self.section.dimension_batch([10, 10], phase_nums=[3, 2])
+        with self.assertRaises(AssertionError):
+            self.section.select_sections([10], phase_nums=2)
+
+    def test_min_section(self):
+        result = self.section.dimension_batch([1, 1])
+        np.testing.assert_array_equal(result.amperage, [2.5, 2.5])
+
+        lights = ie.CupperPVC('B1', 0.8, 3, lights=True)
+        result = lights.dimension_batch([1, 1])
+        np.testing.assert_array_equal(result.amperage, [1.5, 1.5])
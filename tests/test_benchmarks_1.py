@@ -0,0 +1,49 @@
+import unittest
+
+from benchmarks.cases import CASES
+from benchmarks.generator import synthetic_installation
+from benchmarks.runner import regressions, run_benchmarks
+
+
+class TestGenerator(unittest.TestCase):
+    def test_sizes(self):
+        for size in (10, 1000):
+            installation = synthetic_installation(size)
+            for column in installation.values():
+                self.assertEqual(len(column), size)
+
+    def test_reproducible(self):
+        first = synthetic_installation(50, seed=3)
+        second = synthetic_installation(50, seed=3)
+        for key in first:
+            self.assertEqual(list(first[key]), list(second[key]))
+
+
+class TestRunner(unittest.TestCase):
+    def test_run_every_case(self):
+        results = run_benchmarks([10], repeat=1)
+        self.assertEqual(set(results), set(CASES))
+        for sizes in results.values():
+            self.assertGreater(sizes['10']['seconds'], 0)
+            self.assertGreaterEqual(sizes['10']['peak_bytes'], 0)
+
+    def test_regressions(self):
+        baseline = {'case': {'10': {'seconds': 1.0, 'peak_bytes': 1e6}}}
+
+        same = {'case': {'10': {'seconds': 1.1, 'peak_bytes': 1e6}}}
+        self.assertEqual(regressions(same, baseline, 0.25), [])
+
+        slower = {'case': {'10': {'seconds': 2.0, 'peak_bytes': 1e6}}}
+        self.assertEqual(len(regressions(slower, baseline, 0.25)), 1)
+
+        other = {'other': {'10': {'seconds': 9.0, 'peak_bytes': 1e9}}}
+        self.assertEqual(regressions(other, baseline, 0.25), [])
+
+    def test_noise_is_ignored(self):
+        baseline = {'case': {'10': {'seconds': 1e-5, 'peak_bytes': 100}}}
+        results = {'case': {'10': {'seconds': 3e-5, 'peak_bytes': 300}}}
+        self.assertEqual(regressions(results, baseline, 0.25), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
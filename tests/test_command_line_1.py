@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+import instelec as ie
+from instelec.condutor_dimensioning.section import AluminiumPVC
+u = ie.ureg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestDimensionCommand(unittest.TestCase):
+    def test_dimension(self):
+        with tempfile.TemporaryDirectory() as folder:
+            source = os.path.join(folder, 'loads.csv')
+            destination = os.path.join(folder, 'sections.csv')
+            pd.DataFrame({
+                'power': [8, 35, 11],
+                'power_factor': [0.8, 0.7, 0.8],
+                'phase_num': [1, 3, 1],
+                'method': ['B1', 'B1', 'B1'],
+            }).to_csv(source, index=False)
+
+            process = subprocess.run(
+                [sys.executable, '-m', 'instelec', 'dimension', source,
+                 '-o', destination, '--insulator', 'EPR', '--grouping', '3'],
+                cwd=ROOT, capture_output=True, text=True)
+            self.assertEqual(process.returncode, 0, process.stderr)
+            self.assertIn('3 circuits', process.stdout)
+
+            result = pd.read_csv(destination)
+
+        section = ie.CupperEPR('B1', 0.7, 3).grouping_correction(3)
+        self.assertEqual(
+            result['phase_section'][1],
+            section.by_amperage_raw(result['current'][1]))
+
+    def test_dimension_blank_temperatures(self):
+        with tempfile.TemporaryDirectory() as folder:
+            source = os.path.join(folder, 'loads.csv')
+            destination = os.path.join(folder, 'sections.csv')
+            pd.DataFrame({
+                'power': [40, 40, 40],
+                'power_factor': [0.8, 0.8, 0.8],
+                'phase_num': [3, 3, 3],
+                'method': ['B1', 'B1', 'B1'],
+                'temperature': [30, None, None],
+            }).to_csv(source, index=False)
+
+            process = subprocess.run(
+                [sys.executable, '-m', 'instelec', 'dimension', source,
+                 '-o', destination, '--temperature', '50'],
+                cwd=ROOT, capture_output=True, text=True)
+            self.assertEqual(process.returncode, 0, process.stderr)
+
+            result = pd.read_csv(destination)
+
+        for row in result.itertuples():
+            temperature = 30 if row.Index == 0 else 50
+            section = ie.CupperPVC('B1', 0.8, 3)
+            section.temperature_correction(u.Quantity(temperature, u.degC))
+            self.assertEqual(
+                row.amperage_section, section.by_amperage_raw(row.current))
+        self.assertGreater(
+            result['amperage_section'][1], result['amperage_section'][0])
+
+    def test_dimension_aluminium(self):
+        with tempfile.TemporaryDirectory() as folder:
+            source = os.path.join(folder, 'loads.csv')
+            destination = os.path.join(folder, 'sections.csv')
+            pd.DataFrame({
+                'power': [40, 60],
+                'power_factor': [0.8, 0.9],
+                'phase_num': [3, 3],
+                'method': ['B1', 'D'],
+            }).to_csv(source, index=False)
+
+            process = subprocess.run(
+                [sys.executable, '-m', 'instelec', 'dimension', source,
+                 '-o', destination, '--material', 'aluminium'],
+                cwd=ROOT, capture_output=True, text=True)
+            self.assertEqual(process.returncode, 0, process.stderr)
+
+            result = pd.read_csv(destination)
+
+        section = AluminiumPVC('D', 0.9, 3)
+        self.assertEqual(
+            result['phase_section'][1],
+            section.by_amperage_raw(result['current'][1]))
+        self.assertTrue((result['phase_section'] >= 16).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.table_registry import registry
+u = ie.ureg
+
+
+class TestCorrection(unittest.TestCase):
+    def setUp(self):
+        self.base = ie.CupperPVC('B1', 0.8, 3)
+        self.corrected = ie.CupperPVC('B1', 0.8, 3)
+        self.corrected.grouping_correction(3)
+        self.corrected.temperature_correction(u.Quantity(40, u.degC))
+
+    def test_tables_untouched(self):
+        table = registry.get('amperage', 'cupper', 'PVC')
+        self.assertTrue(table.equals(self.base.amperage.table))
+        self.assertTrue(table.equals(self.corrected.amperage.table))
+        self.assertEqual(self.base.amperage.correction, 1.0)
+
+    def test_composed_factor(self):
+        self.assertAlmostEqual(
+            self.corrected.amperage.correction, 0.7*0.87, places=3)
+
+    def test_same_as_corrected_table(self):
+        amperage = self.corrected.amperage
+        column = amperage.column('B1', 3)*amperage.correction
+
+        for current in np.linspace(1, 300, 200):
+            idx = np.searchsorted(column, current)
+            self.assertEqual(
+                self.corrected.by_amperage_raw(current),
+                max(amperage.sections[idx], 2.5))
+
+    def test_nominal_current(self):
+        self.assertAlmostEqual(
+            self.corrected.nominal_current(10*u.millimeter**2).magnitude,
+            self.base.nominal_current(10*u.millimeter**2).magnitude
+            * self.corrected.amperage.correction)
+
+    def test_batch(self):
+        currents = np.linspace(1, 300, 50)
+        result = self.corrected.dimension_batch(currents)
+        for current, section in zip(currents, result.amperage):
+            self.assertEqual(
+                section, self.corrected.by_amperage_raw(current))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.condutor_dimensioning.exceptions import NotInTableError
+u = ie.ureg
+
+
+class TestDynamicAmpacity(unittest.TestCase):
+    def setUp(self):
+        self.section = ie.CupperPVC('B1', 0.8, 3).grouping_correction(2)
+        hours = np.arange(8760)
+        self.profile = 30 + 12*np.sin(2*np.pi*hours/24)
+
+    def test_same_as_temperature_correction(self):
+        result = self.section.dynamic_ampacity(16, [10, 23, 30, 44.5, 60])
+        for temperature, ampacity in zip(
+                [10, 23, 30, 44.5, 60], result.ampacity):
+            corrected = ie.CupperPVC('B1', 0.8, 3).grouping_correction(2)
+            corrected.temperature_correction(u.Quantity(temperature, u.degC))
+            self.assertAlmostEqual(
+                ampacity, corrected.nominal_current_raw(16))
+
+    def test_temperature_correction_replaced(self):
+        corrected = ie.CupperPVC('B1', 0.8, 3).temperature_correction(
+            u.Quantity(40, u.degC))
+        result = corrected.dynamic_ampacity(16, [30, 40])
+        plain = ie.CupperPVC('B1', 0.8, 3).dynamic_ampacity(16, [30, 40])
+        np.testing.assert_allclose(result.ampacity, plain.ampacity)
+        self.assertAlmostEqual(result.ampacity[0], 68)
+
+    def test_shapes(self):
+        sections = np.array([4, 10, 16, 25])
+        shared = self.section.dynamic_ampacity(sections, self.profile)
+        self.assertEqual(shared.ampacity.shape, (4, 8760))
+
+        profiles = np.tile(self.profile, (4, 1))
+        own = self.section.dynamic_ampacity(sections, profiles)
+        np.testing.assert_array_equal(own.ampacity, shared.ampacity)
+
+        for row, section in zip(shared.ampacity, sections):
+            np.testing.assert_array_equal(
+                row, self.section.dynamic_ampacity(section, self.profile)
+                .ampacity)
+
+    def test_insufficient_hours(self):
+        sections = np.array([10, 16, 25])
+        currents = np.array([30, 30, 30])
+        result = self.section.dynamic_ampacity(
+            sections, self.profile, currents, margin=0.1)
+
+        expected = result.ampacity*0.9 < currents[:, np.newaxis]
+        np.testing.assert_array_equal(result.insufficient, expected)
+        np.testing.assert_array_equal(
+            result.hours(), expected.sum(axis=1))
+        np.testing.assert_array_equal(
+            result.hours(0.25), expected.sum(axis=1)/4)
+        # The bigger the section, the fewer the hours.
+        self.assertTrue(np.all(np.diff(result.hours()) <= 0))
+
+    def test_unsupported_temperatures(self):
+        # PVC has no factors above 60 °C.
+        result = self.section.dynamic_ampacity(
+            16, u.Quantity(np.array([30, 65, np.nan]), u.degC), 1)
+        np.testing.assert_array_equal(
+            np.ma.getmaskarray(result.ampacity), [False, True, True])
+        np.testing.assert_array_equal(result.insufficient, [False, True, True])
+
+    def test_section_not_in_table(self):
+        with self.assertRaises(NotInTableError):
+            self.section.dynamic_ampacity([16, 17], self.profile)
+
+
+if __name__ == '__main__':
+    unittest.main()
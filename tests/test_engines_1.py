@@ -0,0 +1,53 @@
+import unittest
+import instelec as ie
+from instelec.engines.engines import distribute_engines
+u = ie.ureg
+
+
+def one_at_a_time(phases, phase_num, current, count):
+    phases = sorted(phases)
+    for _ in range(count):
+        for i in range(phase_num):
+            phases[i] += current
+        phases.sort()
+    return phases
+
+
+class TestEngineGroup(unittest.TestCase):
+    def setUp(self):
+        self.eng1 = ie.Engine(ie.PowerTriangle(8*u.kilovolt_ampere, 0.8), 1)
+        self.eng2 = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+        self.eng3 = ie.Engine(ie.PowerTriangle(11*u.kilovolt_ampere, 0.8), 2)
+
+    def test_distribute_engines(self):
+        cases = [
+            ([0.0, 0.0, 0.0], 1, 7.0, 5),
+            ([0.0, 0.0, 0.0], 2, 7.0, 7),
+            ([3.0, 50.0, 10.0], 1, 4.5, 30),
+            ([3.0, 50.0, 10.0], 2, 4.5, 13),
+            ([21.0, 14.0, 7.0, 0.0], 3, 7.0, 9),
+            ([1.0, 2.0, 3.0], 3, 2.0, 4),
+        ]
+        for phases, phase_num, current, count in cases:
+            result = distribute_engines(phases, phase_num, current, count)
+            expected = one_at_a_time(phases, phase_num, current, count)
+            for value, expected_value in zip(sorted(result), expected):
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_repeated_engines(self):
+        group = ie.EngineGroup({self.eng1: 7, self.eng2: 2, self.eng3: 5})
+
+        phases = [0.0]*3
+        for eng in group:
+            phases[:eng.phase_num] = [
+                phase + eng.current_raw() for phase in phases[:eng.phase_num]]
+            phases.sort()
+
+        for current, expected in zip(group.current_per_phase(), phases):
+            self.assertAlmostEqual(current, expected*u.ampere)
+        self.assertAlmostEqual(group.charge_current(), phases[-1]*u.ampere)
+
+    def test_many_copies(self):
+        group = ie.EngineGroup({self.eng1: 200})
+        self.assertAlmostEqual(
+            group.charge_current(), 200*self.eng1.current())
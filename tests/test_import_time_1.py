@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.resolve()
+
+# Maximum time importing the module may take, as a fraction of the
+# time importing numpy takes in the same process, so the limit holds
+# on slow and loaded machines.
+IMPORT_TIME_RATIO = 0.25
+
+HEAVY_MODULES = ('pandas', 'numpy', 'pint')
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_modules_are_lazy(self):
+        output = run(
+            'import sys, instelec\n'
+            f'print(*(m for m in {HEAVY_MODULES} if m in sys.modules))'
+        )
+        self.assertEqual(output.strip(), '')
+
+    def test_import_time_budget(self):
+        output = run(
+            'import time\n'
+            'start = time.perf_counter()\n'
+            'import instelec\n'
+            'middle = time.perf_counter()\n'
+            'import numpy\n'
+            'print(middle - start, time.perf_counter() - middle)'
+        )
+        instelec_time, numpy_time = map(float, output.split())
+        self.assertLess(instelec_time, IMPORT_TIME_RATIO*numpy_time)
+
+    def test_names_load_on_access(self):
+        output = run(
+            'import instelec as ie\n'
+            'print(ie.PowerTriangle.__name__, "CupperPVC" in dir(ie))'
+        )
+        self.assertEqual(output.split(), ['PowerTriangle', 'True'])
@@ -0,0 +1,125 @@
+import unittest
+
+import instelec as ie
+u = ie.ureg
+
+
+class TestInstallation(unittest.TestCase):
+    def setUp(self):
+        self.eng1 = ie.Engine(ie.PowerTriangle(8*u.kilovolt_ampere, 0.8), 1)
+        self.eng2 = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+        self.eng3 = ie.Engine(ie.PowerTriangle(11*u.kilovolt_ampere, 0.8), 1)
+
+        self.load1 = ie.Load(self.eng1, feeder=ie.Feeder(
+            ie.CupperPVC('B1', 0.8, 1), 29*u.meter, 0.03,
+            4*u.kiloampere, 0.01*u.second))
+        self.load2 = ie.Load(self.eng2)
+        self.load3 = ie.Load(self.eng3, 2)
+
+        self.ccm1 = ie.Board(
+            [self.load1, self.load2, self.load3], name='CCM1',
+            feeder=ie.Feeder(ie.CupperPVC('B1', 0.74, 3), 160, 0.03))
+        self.main = ie.Board([self.ccm1], name='QGBT')
+
+    def test_same_as_engine_group(self):
+        group = ie.EngineGroup({self.eng1: 1, self.eng2: 1, self.eng3: 2})
+
+        self.assertAlmostEqual(self.ccm1.power, group.power)
+        self.assertAlmostEqual(
+            self.ccm1.charge_current(), group.charge_current())
+        self.assertEqual(self.ccm1.phase_num, 3)
+
+    def test_sections(self):
+        sections = self.load1.sections()
+        self.assertEqual(sections.amperage, 6)
+        self.assertEqual(sections.voltage_drop, 6)
+        self.assertEqual(sections.short_circuit, 4)
+        self.assertEqual(sections.phase, 6)
+        self.assertEqual(sections.protection, 6)
+        self.assertIsNone(self.load2.sections())
+
+    def test_edit_recomputes_ancestors_only(self):
+        other = ie.Board([ie.Load(self.eng1)])
+        self.main.add(other)
+        self.main.power
+        self.assertFalse(other.outdated)
+
+        self.load2.update(count=2)
+        self.assertTrue(self.load2.outdated)
+        self.assertTrue(self.ccm1.outdated)
+        self.assertTrue(self.main.outdated)
+        self.assertFalse(self.load1.outdated)
+        self.assertFalse(other.outdated)
+
+        group = ie.EngineGroup({self.eng1: 1, self.eng2: 2, self.eng3: 2})
+        self.assertAlmostEqual(self.ccm1.power, group.power)
+        self.assertAlmostEqual(self.main.power, group.power + other.power)
+
+    def test_sections_kept_when_current_does_not_change(self):
+        sections = self.ccm1.sections()
+
+        # An equal engine, so the currents do not change.
+        self.load3.update(engine=ie.Engine(
+            ie.PowerTriangle(11*u.kilovolt_ampere, 0.8), 1))
+        self.assertIs(self.ccm1.sections(), sections)
+
+        self.load2.update(count=3)
+        self.assertIsNot(self.ccm1.sections(), sections)
+
+    def test_sections_follow_the_calculator(self):
+        sections = self.ccm1.sections()
+        self.ccm1.feeder.section.grouping_correction(4)
+        self.assertLess(sections.amperage, self.ccm1.sections().amperage)
+
+    def test_edit_in_the_middle_of_a_wide_board(self):
+        loads = [ie.Load(eng) for eng in [self.eng1, self.eng2, self.eng3]*20]
+        board = ie.Board(loads)
+        board.power
+
+        loads[30].update(count=3)
+        board.remove(loads[10])
+        board.add(ie.Load(self.eng2))
+        loads[50].update(engine=self.eng3)
+
+        fresh = ie.Board([
+            ie.Load(load.engine, load.count) for load in board.children])
+        self.assertEqual(board.phase_currents_raw(), fresh.phase_currents_raw())
+        self.assertAlmostEqual(board.power, fresh.power)
+
+    def test_remove(self):
+        self.ccm1.remove(self.load2)
+        group = ie.EngineGroup({self.eng1: 1, self.eng3: 2})
+        self.assertAlmostEqual(self.ccm1.power, group.power)
+        self.assertIsNone(self.load2.parent)
+        self.assertEqual(len(list(self.main.walk())), 4)
+
+    def test_deep_instalation(self):
+        board = self.ccm1
+        self.main.remove(board)
+        for _ in range(2000):
+            board = ie.Board([board])
+
+        self.assertAlmostEqual(
+            board.charge_current_raw(), self.ccm1.charge_current_raw())
+        self.assertEqual(board.phase_num, 3)
+        self.assertEqual(len(list(board.walk())), 2004)
+
+        # Only the ancestors of the load are calculated again.
+        other = ie.Board([ie.Load(self.eng2)])
+        ie.Board([board, other]).power
+        self.load1.update(count=2)
+        self.assertFalse(other.outdated)
+        group = ie.EngineGroup({self.eng1: 2, self.eng2: 1, self.eng3: 2})
+        self.assertAlmostEqual(board.power, group.power)
+
+    def test_feeder_needs_the_data_of_its_criteria(self):
+        section = ie.CupperPVC('B1', 0.8, 3)
+        with self.assertRaises(AssertionError):
+            ie.Feeder(section, 50*u.meter)
+        with self.assertRaises(AssertionError):
+            ie.Feeder(section, short_circuit_current=4*u.kiloampere)
+        ie.Feeder(section, 50*u.meter, 0.03, 4, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.engines import LoadProfile
+u = ie.ureg
+
+
+class TestLoadProfile(unittest.TestCase):
+    def setUp(self):
+        self.eng1 = ie.Engine(ie.PowerTriangle(8*u.kilovolt_ampere, 0.8), 1)
+        self.eng2 = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+        self.eng3 = ie.Engine(ie.PowerTriangle(11*u.kilovolt_ampere, 0.8), 2)
+
+    def test_duty_cycle(self):
+        profile = LoadProfile.duty_cycle(30, 15, duration=180, step=15)
+        np.testing.assert_array_equal(
+            profile.factors, [1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 0])
+
+        delayed = LoadProfile.duty_cycle(
+            30, 15, duration=90, step=15, offset=15, load=0.5)
+        np.testing.assert_array_equal(
+            delayed.factors, [0, 0.5, 0.5, 0, 0.5, 0.5])
+
+        self.assertEqual(len(LoadProfile.duty_cycle(60, 60)), 365*24*4)
+
+    def test_from_measurements(self):
+        profile = LoadProfile.from_measurements(
+            [3.2, 6.4, 0]*u.kilowatt, self.eng1.demand(), step=1)
+        np.testing.assert_allclose(profile.factors, [0.5, 1, 0])
+        self.assertEqual(profile.step, 1)
+
+    def test_full_load(self):
+        # At full load the currents are the ones of current_per_phase.
+        full = LoadProfile(np.ones(8))
+        for eng in (self.eng1, self.eng2, self.eng3):
+            eng.with_profile(full)
+        group = ie.EngineGroup({self.eng1: 7, self.eng2: 2, self.eng3: 5})
+
+        result = group.demand_profile()
+        self.assertEqual(result.phase_currents.shape, (3, 8))
+        np.testing.assert_allclose(
+            np.sort(result.phase_currents, axis=0)[:, 0],
+            sorted(group.phase_currents_raw()))
+        self.assertAlmostEqual(
+            result.max_demand.magnitude,
+            (7*self.eng1.power.real + 2*self.eng2.power.real
+             + 5*self.eng3.power.real))
+        self.assertAlmostEqual(result.load_factor, 1.0)
+
+    def test_without_profile(self):
+        # The engines without a profile demand as in demand().
+        self.eng1.with_profile(LoadProfile([0, 1, 0.5, 1], step=60))
+        group = ie.EngineGroup({self.eng1: 1, self.eng2: 2})
+
+        alone = ie.EngineGroup({self.eng2: 2}).demand().magnitude
+        result = group.demand_profile()
+        expected = alone + self.eng1.power.real*np.array([0, 1, 0.5, 1])
+        np.testing.assert_allclose(result.demand, expected)
+        self.assertAlmostEqual(
+            result.energy.magnitude, result.demand.sum())
+        self.assertAlmostEqual(
+            result.load_factor, result.demand.mean()/result.demand.max())
+
+    def test_same_as_loop(self):
+        rng = np.random.default_rng(0)
+        shared = LoadProfile(rng.random(50))
+        engines = {}
+        for idx in range(40):
+            eng = ie.Engine(ie.PowerTriangle(
+                rng.uniform(5, 20)*u.kilovolt_ampere, 0.8),
+                int(rng.choice([1, 2, 3])))
+            eng.with_profile(
+                shared if idx % 4 == 0 else LoadProfile(rng.random(50)))
+            engines[eng] = 1
+        # Repeated engines, of powers in the simultaneity table.
+        engines[self.eng1.with_profile(shared)] = 7
+        engines[self.eng3.with_profile(LoadProfile(rng.random(50)))] = 5
+        group = ie.EngineGroup(engines)
+
+        demand = np.zeros(50)
+        phases = np.zeros((3, 50))
+        for (eng, count), connected in zip(
+                engines.items(), group.phase_connections()):
+            demand += count*eng.power.real*eng.profile.factors
+            for phase, num in enumerate(connected):
+                phases[phase] += num*eng.current_raw()*eng.profile.factors
+
+        result = group.demand_profile()
+        np.testing.assert_allclose(result.demand, demand)
+        np.testing.assert_allclose(result.phase_currents, phases)
+        np.testing.assert_allclose(
+            result.charge_currents_raw(), phases.max(axis=0))
+
+    def test_single_engine(self):
+        self.eng2.with_profile(LoadProfile([1, 0.5]))
+        result = self.eng2.demand_profile()
+        np.testing.assert_allclose(
+            result.phase_currents,
+            [[self.eng2.current_raw(), self.eng2.current_raw()/2]]*3)
+
+    def test_invalid_profiles(self):
+        with self.assertRaises(ValueError):
+            ie.EngineGroup({self.eng1: 1}).demand_profile()
+
+        self.eng1.with_profile(LoadProfile([1, 1]))
+        self.eng2.with_profile(LoadProfile([1, 1, 1]))
+        with self.assertRaises(ValueError):
+            ie.EngineGroup({self.eng1: 1, self.eng2: 1}).demand_profile()
+
+
+if __name__ == '__main__':
+    unittest.main()
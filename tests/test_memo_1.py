@@ -0,0 +1,103 @@
+import unittest
+
+import instelec as ie
+from instelec.condutor_dimensioning.memo import DimensioningMemo
+u = ie.ureg
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        ie.memo.configure(128, 'lru')
+        ie.memo.clear()
+
+    def tearDown(self):
+        ie.memo.configure(0)
+        ie.memo.clear()
+
+    def test_repeated_circuits(self):
+        for _ in range(10):
+            section = ie.CupperPVC('B1', 0.8, 3)
+            self.assertEqual(
+                section.by_amperage(80*u.ampere), 25*u.millimeter**2)
+
+        info = ie.memo.info()
+        self.assertEqual((info.hits, info.misses, info.size), (9, 1, 1))
+        self.assertAlmostEqual(info.hit_rate, 0.9)
+
+    def test_key_includes_corrections(self):
+        fresh = ie.CupperPVC('B1', 0.8, 3)
+        corrected = ie.CupperPVC('B1', 0.8, 3).grouping_correction(3)
+
+        self.assertEqual(fresh.by_amperage(80*u.ampere), 25*u.millimeter**2)
+        self.assertEqual(
+            corrected.by_amperage(80*u.ampere), 50*u.millimeter**2)
+
+    def test_methods_do_not_collide(self):
+        section = ie.CupperPVC('B1', 0.8, 3)
+        expected = section.by_short_circuit_raw(5, 0.1)
+        section.by_amperage_raw(5)
+        self.assertEqual(section.by_short_circuit_raw(5, 0.1), expected)
+
+    def test_registry_clear_invalidates(self):
+        ie.CupperPVC('B1', 0.8, 3).by_amperage_raw(80)
+        ie.registry.clear()
+        ie.CupperPVC('B1', 0.8, 3).by_amperage_raw(80)
+
+        info = ie.memo.info()
+        self.assertEqual((info.hits, info.size), (0, 1))
+
+    def test_keyword_arguments(self):
+        section = ie.CupperPVC('B1', 0.8, 3)
+        calls = [
+            ('by_amperage_raw', (100,), {'current': 100}),
+            ('by_voltage_drop_raw', (100, 50, 0.03),
+             {'current': 100, 'distance': 50, 'max_fall': 0.03}),
+            ('by_short_circuit_raw', (5, 0.1),
+             {'simmetric_short_circuit_current': 5,
+              'fault_elimination_time': 0.1}),
+            ('select_section_raw', (100, 50, 0.03),
+             {'distance': 50, 'max_fall': 0.03}),
+        ]
+        for maxsize in (0, 128):
+            ie.memo.configure(maxsize)
+            ie.memo.clear()
+            for name, args, kwargs in calls:
+                method = getattr(section, name)
+                positional = method(*args)
+                by_keyword = method(*args[:len(args) - len(kwargs)], **kwargs)
+                self.assertEqual(positional, by_keyword, name)
+
+        # The calls by position and by keyword share each result.
+        self.assertEqual(ie.memo.info().size, len(calls))
+
+    def test_disabled(self):
+        ie.memo.configure(0)
+        ie.CupperPVC('B1', 0.8, 3).by_amperage_raw(80)
+        self.assertEqual(ie.memo.info().size, 0)
+
+
+class TestEviction(unittest.TestCase):
+    def test_lru(self):
+        memo = DimensioningMemo(2, 'lru')
+        memo.get('a', lambda: 1)
+        memo.get('b', lambda: 2)
+        memo.get('a', lambda: 1)
+        memo.get('c', lambda: 3)
+        self.assertEqual(memo.get('a', lambda: None), 1)
+        self.assertIsNone(memo.get('b', lambda: None))
+
+    def test_fifo(self):
+        memo = DimensioningMemo(2, 'fifo')
+        memo.get('a', lambda: 1)
+        memo.get('b', lambda: 2)
+        memo.get('a', lambda: 1)
+        memo.get('c', lambda: 3)
+        self.assertIsNone(memo.get('a', lambda: None))
+
+    def test_invalid_eviction(self):
+        with self.assertRaises(ValueError):
+            DimensioningMemo(2, 'random')
+
+
+if __name__ == '__main__':
+    unittest.main()
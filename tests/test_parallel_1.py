@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.parallel import dimension_project
+
+
+def circuits(size):
+    rng = np.random.default_rng(0)
+    return {
+        'current': rng.uniform(1, 300, size),
+        'method': rng.choice(['B1', 'C', 'D'], size),
+        'phase_num': rng.choice([1, 3], size),
+        'power_factor': rng.uniform(0.7, 0.95, size),
+        'distance': rng.uniform(5, 150, size),
+        'max_fall': np.full(size, 0.03),
+        'calculator': rng.choice(['CupperPVC', 'CupperEPR'], size),
+        'grouping': rng.integers(1, 4, size),
+        'temperature': rng.choice([np.nan, 40.0], size),
+    }
+
+
+class TestParallel(unittest.TestCase):
+    def test_same_as_single_calculators(self):
+        data = circuits(300)
+        result = dimension_project(data, workers=0, chunk_size=64)
+
+        for idx in range(0, 300, 7):
+            section = getattr(ie, data['calculator'][idx])(
+                str(data['method'][idx]),
+                float(data['power_factor'][idx]),
+                int(data['phase_num'][idx])
+            )
+            if data['grouping'][idx] > 1:
+                section.grouping_correction(int(data['grouping'][idx]))
+            if not np.isnan(data['temperature'][idx]):
+                section.temperature_correction(
+                    ie.ureg.Quantity(data['temperature'][idx], 'degC'))
+
+            expected = section.dimension_batch(
+                [data['current'][idx]],
+                [data['distance'][idx]],
+                [data['max_fall'][idx]]
+            )
+            self.assertEqual(
+                result.sections.phase[idx], expected.phase[0])
+        self.assertIsNone(result.sections.short_circuit)
+
+    def test_workers_keep_the_order(self):
+        data = circuits(2000)
+        single = dimension_project(data, workers=0, chunk_size=300)
+        pooled = dimension_project(data, workers=2, chunk_size=300)
+
+        for expected, got in zip(single.sections, pooled.sections):
+            if expected is None:
+                self.assertIsNone(got)
+                continue
+            self.assertTrue(np.array_equal(
+                np.ma.getmaskarray(expected), np.ma.getmaskarray(got)))
+            self.assertTrue(np.ma.allequal(expected, got))
+
+        self.assertEqual(
+            sum(timing.circuits for timing in pooled.timings), 2000)
+        self.assertEqual(
+            sum(timing.chunks for timing in pooled.timings), 7)
+
+    def test_missing_columns(self):
+        with self.assertRaises(KeyError):
+            dimension_project({'current': [10]}, workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
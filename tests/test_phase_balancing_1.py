@@ -0,0 +1,56 @@
+import unittest
+import instelec as ie
+from instelec.engines.phase_balancing import unbalance
+u = ie.ureg
+
+
+class TestPhaseBalancing(unittest.TestCase):
+    def setUp(self):
+        def engine(power, phase_num):
+            return ie.Engine(
+                ie.PowerTriangle(power*u.kilovolt_ampere, 0.8), phase_num)
+
+        self.engines = [
+            engine(power, 1) for power in (8, 7, 6, 5, 4, 4, 3, 3, 2, 2)
+        ] + [engine(10, 2), engine(30, 3)]
+
+    def check(self, result):
+        phases = [0.0]*3
+        for eng, phases_of in zip(self.engines, result.assignment):
+            self.assertEqual(len(phases_of), eng.phase_num)
+            self.assertEqual(len(set(phases_of)), eng.phase_num)
+            for phase in phases_of:
+                phases[phase] += eng.current_raw()
+
+        for current, expected in zip(result.currents, phases):
+            self.assertAlmostEqual(current, expected*u.ampere)
+
+    def test_lpt(self):
+        result = ie.balance_phases(self.engines)
+        self.check(result)
+
+        greedy = ie.EngineGroup({eng: 1 for eng in self.engines})
+        self.assertLessEqual(
+            result.currents.max(), greedy.charge_current() + 1e-9*u.ampere)
+
+    def test_refinement(self):
+        lpt = ie.balance_phases(self.engines)
+        refined = ie.balance_phases(self.engines, time_budget=0.5)
+        self.check(refined)
+
+        self.assertLessEqual(refined.currents.max(), lpt.currents.max())
+        self.assertLessEqual(refined.unbalance, lpt.unbalance + 1e-12)
+
+    def test_engine_group(self):
+        group = ie.EngineGroup({self.engines[0]: 4, self.engines[-1]: 1})
+        result = group.balance_phases()
+
+        self.assertEqual(len(result.assignment), 5)
+        self.assertAlmostEqual(
+            result.currents.max(),
+            self.engines[-1].current() + 2*self.engines[0].current())
+
+    def test_unbalance(self):
+        self.assertEqual(unbalance([1, 1, 1]), 0)
+        self.assertAlmostEqual(
+            unbalance([2, 1, 0]), 1)
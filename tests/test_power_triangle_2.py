@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import instelec as ie
+u = ie.ureg
+
+
+class TestPowerTriangleArray(unittest.TestCase):
+    def setUp(self):
+        self.powers = [8, 35, 11, 26, 17.2]
+        self.factors = [0.8, 0.7, 0.8, 0.7, 0.7]
+        self.triangles = [
+            ie.PowerTriangle(power*u.kilovolt_ampere, factor)
+            for power, factor in zip(self.powers, self.factors)
+        ]
+        self.array = ie.PowerTriangleArray(
+            self.powers*u.kilovolt_ampere, self.factors)
+
+    def test_construction(self):
+        np.testing.assert_allclose(self.array.values, self.triangles)
+
+        array = ie.PowerTriangleArray([6.4, 24.5]*u.kilowatt, [0.8, 0.7])
+        np.testing.assert_allclose(array.apparent.magnitude, [8, 35])
+
+        array = ie.PowerTriangleArray.from_triangles(self.triangles)
+        np.testing.assert_allclose(array.values, self.array.values)
+
+        with self.assertRaises(ValueError):
+            ie.PowerTriangleArray([1, 2]*u.watt, 0.8)
+
+    def test_powers(self):
+        np.testing.assert_allclose(
+            self.array.apparent.magnitude, self.powers)
+        np.testing.assert_allclose(
+            self.array.active.magnitude, [t.real for t in self.triangles])
+        np.testing.assert_allclose(
+            self.array.reactive.magnitude, [t.imag for t in self.triangles])
+        np.testing.assert_allclose(self.array.power_factor, self.factors)
+
+    def test_power_factor_to(self):
+        inf, sup = self.array.power_factor_to(0.92)
+        for idx, triangle in enumerate(self.triangles):
+            expected_inf, expected_sup = triangle.power_factor_to(0.92)
+            self.assertAlmostEqual(inf[idx], expected_inf)
+            self.assertAlmostEqual(sup[idx], expected_sup)
+
+    def test_reductions(self):
+        total = self.array.sum()
+        self.assertIsInstance(total, ie.PowerTriangle)
+        self.assertAlmostEqual(total, sum(self.triangles))
+
+        np.testing.assert_allclose(
+            self.array.cumsum().values, np.cumsum(self.triangles))
+
+        labels, sums = self.array.group_sum(['b', 'a', 'b', 'a', 'a'])
+        np.testing.assert_array_equal(labels, ['a', 'b'])
+        self.assertAlmostEqual(
+            sums[0], self.triangles[1] + self.triangles[3] + self.triangles[4])
+        self.assertAlmostEqual(sums[1], self.triangles[0] + self.triangles[2])
+
+    def test_arithmetic(self):
+        self.assertIsInstance(self.array[0], ie.PowerTriangle)
+        self.assertEqual(len(self.array[1:3]), 2)
+        np.testing.assert_allclose(
+            (2*self.array + self.array).values, 3*self.array.values)
@@ -0,0 +1,35 @@
+import unittest
+import instelec as ie
+u = ie.ureg
+
+
+class TestRaw(unittest.TestCase):
+    def setUp(self):
+        self.eng = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+        self.section = ie.CupperPVC('B1', 0.74, 3)
+
+    def test_power_triangle(self):
+        triangle = ie.PowerTriangle.from_components(24.5, 24.99)
+        self.assertAlmostEqual(triangle.active, 24.5*u.kilowatt)
+        self.assertAlmostEqual(
+            triangle.reactive, 24.99*u.kilovolt_ampere_reactive)
+
+    def test_current(self):
+        self.assertAlmostEqual(self.eng.current_raw(), 53.177, places=3)
+        self.assertAlmostEqual(
+            self.eng.current(), self.eng.current_raw()*u.ampere)
+
+    def test_sections(self):
+        current = 117.68
+        self.assertEqual(self.section.by_amperage_raw(current), 50)
+        self.assertEqual(
+            self.section.by_voltage_drop_raw(current, 29, 0.03), 25)
+        self.assertEqual(
+            self.section.by_voltage_drop_raw(current, 160, 0.03), 70)
+        self.assertEqual(self.section.by_short_circuit_raw(5, 0.01), 6)
+        self.assertEqual(self.section.protection_condutor_raw(50), 25)
+        self.assertEqual(self.section.nominal_current_raw(50), 134)
+
+    def test_min_section(self):
+        self.assertEqual(self.section.by_amperage_raw(1), 2.5)
+        self.assertEqual(self.section.by_short_circuit_raw(0.1, 0.01), 2.5)
@@ -0,0 +1,56 @@
+import unittest
+import instelec as ie
+u = ie.ureg
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        ie.registry.clear()
+
+    def test_tables_loaded_once(self):
+        for _ in range(5):
+            section = ie.CupperPVC('B1', 0.8, 3)
+            section.grouping_correction(3)
+            section.temperature_correction(u.Quantity(35, 'celsius'))
+
+        # Amperage, voltage drop, grouping and temperature.
+        info = ie.registry.info()
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.size, 4)
+        self.assertEqual(info.hits, 16)
+
+    def test_corrections_do_not_leak(self):
+        corrected = ie.CupperPVC('B1', 0.8, 3).grouping_correction(3)
+        fresh = ie.CupperPVC('B1', 0.8, 3)
+
+        current = 80*u.ampere
+        self.assertEqual(fresh.by_amperage(current), 25*u.millimeter**2)
+        self.assertEqual(corrected.by_amperage(current), 50*u.millimeter**2)
+
+    def test_aluminium_settings_key(self):
+        from instelec import settings
+        from instelec.condutor_dimensioning.section import AluminiumPVC
+
+        self.assertEqual(AluminiumPVC('B1', 0.8, 3).by_amperage_raw(100), 50)
+
+        # The key of the settings files created before.
+        tables = settings.AMPERAGE_TABLE
+        settings.AMPERAGE_TABLE = {
+            'cupper': tables['cupper'], 'aluminum': tables['aluminium']}
+        try:
+            ie.registry.clear()
+            self.assertEqual(
+                AluminiumPVC('B1', 0.8, 3).by_amperage_raw(100), 50)
+        finally:
+            settings.AMPERAGE_TABLE = tables
+            ie.registry.clear()
+
+    def test_views_do_not_change_the_table(self):
+        table = ie.registry.get('amperage', 'cupper', 'PVC')
+        try:
+            table.iloc[0, 0] = 0
+        except ValueError:
+            pass
+
+        table = ie.registry.get('amperage', 'cupper', 'PVC')
+        self.assertEqual(table.iloc[0, 0], 7)
@@ -0,0 +1,136 @@
+import os
+import shutil
+import signal
+import tempfile
+import unittest
+from pathlib import Path
+
+import instelec as ie
+from instelec import server, settings
+from instelec.table_bundle import compile_tables
+
+DEFAULT_DIR = Path(settings.__file__).parent / 'default'
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self):
+        # A project folder, as created by `python -m instelec settings`.
+        self.folder = tempfile.TemporaryDirectory()
+        self.root = Path(self.folder.name).resolve()
+        shutil.copytree(DEFAULT_DIR / 'tables', self.root / 'tables')
+        with open(DEFAULT_DIR / 'settings.py', encoding='utf-8') as file:
+            source = file.read()
+        with open(self.root / 'settings.py', 'w', encoding='utf-8') as file:
+            file.write(source + '\nDIMENSIONING_CACHE_SIZE = 64\n')
+
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        settings.reload()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        settings.reload()
+        self.folder.cleanup()
+
+    def amperage_file(self) -> Path:
+        return self.root / 'tables' / 'condutor_dimensioning' / 'cobre_pvc.csv'
+
+    def test_settings_file(self):
+        self.assertEqual(settings.SETTINGS_FILE, self.root / 'settings.py')
+        self.assertEqual(
+            settings.AMPERAGE_TABLE['cupper']['PVC'], self.amperage_file())
+        self.assertEqual(ie.memo.maxsize, 64)
+
+    def test_changed_table(self):
+        self.assertEqual(ie.CupperPVC('B1', 0.8, 1).by_amperage_raw(80), 25)
+        generation = ie.registry.generation
+        misses = ie.registry.info().misses
+
+        # The 16 mm² condutor now carries 85 A.
+        filepath = self.amperage_file()
+        with open(filepath, encoding='utf-8') as file:
+            table = file.read()
+        with open(filepath, 'w', encoding='utf-8') as file:
+            file.write(table.replace(
+                '16.0,61.0,56.0,57.0,52.0,76.0',
+                '16.0,61.0,56.0,57.0,52.0,85.0'
+            ))
+        os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10**9))
+
+        self.assertEqual(settings.reload(), [filepath])
+        self.assertEqual(ie.CupperPVC('B1', 0.8, 1).by_amperage_raw(80), 16)
+        self.assertGreater(ie.registry.generation, generation)
+        # Only the amperage table was loaded again.
+        self.assertEqual(ie.registry.info().misses, misses + 1)
+
+    def test_touched_table(self):
+        ie.CupperPVC('B1', 0.8, 1)
+        generation = ie.registry.generation
+
+        filepath = self.amperage_file()
+        os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10**9))
+
+        self.assertEqual(settings.reload(), [])
+        self.assertEqual(ie.registry.generation, generation)
+
+    def test_touched_table_from_bundle(self):
+        compile_tables(settings)
+        ie.registry.clear()
+        ie.CupperPVC('B1', 0.8, 1)
+        self.assertIsNotNone(ie.registry.bundle)
+        generation = ie.registry.generation
+
+        # The hash of the manifest tells it was only touched.
+        filepath = self.amperage_file()
+        os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10**9))
+
+        self.assertEqual(settings.reload(), [])
+        self.assertEqual(ie.registry.generation, generation)
+
+    def test_removed_setting(self):
+        settings_path = self.root / 'settings.py'
+        with open(settings_path, encoding='utf-8') as file:
+            source = file.read()
+        with open(settings_path, 'a', encoding='utf-8') as file:
+            file.write('\nPROJECT_NAME = "Fábrica"\n')
+        settings.reload()
+        self.assertEqual(settings.PROJECT_NAME, 'Fábrica')
+
+        with open(settings_path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        settings.reload()
+        self.assertFalse(hasattr(settings, 'PROJECT_NAME'))
+        self.assertEqual(ie.memo.maxsize, 64)
+
+    def test_broken_settings(self):
+        with open(self.root / 'settings.py', 'a', encoding='utf-8') as file:
+            file.write('\nTABLE_DTYPE = (\n')
+
+        with self.assertRaises(SyntaxError):
+            settings.reload()
+        self.assertEqual(ie.memo.maxsize, 64)
+
+        # The daemon logs the error and keeps serving.
+        with self.assertLogs('instelec.server', 'ERROR'):
+            server.reload_on_signal(signal.SIGHUP, None)
+        self.assertEqual(settings.SETTINGS_FILE, self.root / 'settings.py')
+        self.assertEqual(ie.CupperPVC('B1', 0.8, 1).by_amperage_raw(80), 25)
+
+    def test_broken_table(self):
+        self.assertEqual(ie.CupperPVC('B1', 0.8, 1).by_amperage_raw(80), 25)
+        server.warm_up()
+        with open(self.amperage_file(), 'w', encoding='utf-8') as file:
+            file.write('not,a\ntable\n')
+        filepath = self.amperage_file()
+        os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10**9))
+
+        with self.assertLogs('instelec.server', 'ERROR'):
+            server.reload_on_signal(signal.SIGHUP, None)
+        # The tables loaded before are kept, and the file is still
+        # reloaded once fixed.
+        self.assertEqual(ie.CupperPVC('B1', 0.8, 1).by_amperage_raw(80), 25)
+        self.assertEqual(ie.registry.changed_sources(), [filepath])
+
+
+if __name__ == '__main__':
+    unittest.main()
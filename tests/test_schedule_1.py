@@ -0,0 +1,131 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import instelec as ie
+from instelec.schedule import dimension_schedule
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+u = ie.ureg
+
+
+def schedule(size):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'name': [f'M{idx}' for idx in range(size)],
+        'power': rng.uniform(1, 40, size).round(1),
+        'power_factor': rng.choice([0.7, 0.8, 0.9], size),
+        'phase_num': rng.choice([1, 3], size),
+        'method': rng.choice(['B1', 'C'], size),
+        'distance': rng.uniform(5, 100, size).round(),
+        'max_fall': 0.03,
+        'short_circuit_current': 4.0,
+        'fault_elimination_time': 0.01,
+    })
+
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.folder.name, 'schedule.csv')
+        self.destination = os.path.join(self.folder.name, 'sections.csv')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_same_as_engine_and_section(self):
+        rows = schedule(40)
+        rows.to_csv(self.source, index=False)
+
+        self.assertEqual(
+            dimension_schedule(self.source, self.destination, 16), 40)
+        result = pd.read_csv(self.destination)
+        self.assertEqual(list(result['name']), list(rows['name']))
+
+        for row in result.itertuples():
+            engine = ie.Engine(ie.PowerTriangle(
+                row.power*u.kilovolt_ampere, row.power_factor),
+                row.phase_num)
+            section = ie.CupperPVC(
+                row.method, row.power_factor, row.phase_num)
+            current = engine.current()
+
+            self.assertAlmostEqual(row.current, current.magnitude)
+            self.assertEqual(
+                row.amperage_section, section.by_amperage(current).magnitude)
+            self.assertEqual(
+                row.voltage_drop_section,
+                section.by_voltage_drop(
+                    current, row.distance*u.meter, 0.03).magnitude)
+            self.assertEqual(
+                row.short_circuit_section,
+                section.by_short_circuit(
+                    4*u.kiloampere, 0.01*u.second).magnitude)
+
+    def test_memory_does_not_grow(self):
+        peaks = []
+        for size in (6000, 12000):
+            schedule(size).to_csv(self.source, index=False)
+
+            tracemalloc.start()
+            dimension_schedule(self.source, self.destination, 2000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        # The reader buffers a block of the file, so the peak only
+        # becomes flat above some thousands of rows.
+        self.assertLess(peaks[1], 1.25*peaks[0])
+
+    def test_defaults_fill_blank_cells(self):
+        rows = schedule(4)
+        rows['temperature'] = [45.0, np.nan, 30.0, np.nan]
+        rows.to_csv(self.source, index=False)
+
+        dimension_schedule(
+            self.source, self.destination, defaults={'temperature': 45.0})
+        result = pd.read_csv(self.destination)
+
+        for row in result.itertuples():
+            temperature = 30.0 if row.Index == 2 else 45.0
+            section = ie.CupperPVC(
+                row.method, row.power_factor, row.phase_num)
+            section.temperature_correction(u.Quantity(temperature, u.degC))
+            self.assertEqual(
+                row.amperage_section, section.by_amperage_raw(row.current))
+
+    def test_invalid_rows(self):
+        rows = schedule(30)
+        rows.loc[7, 'phase_num'] = 2
+        rows.to_csv(self.source, index=False)
+
+        self.assertEqual(
+            dimension_schedule(self.source, self.destination, 10), 30)
+        result = pd.read_csv(self.destination)
+        self.assertTrue(np.isnan(result['current'][7]))
+        self.assertTrue(np.isnan(result['phase_section'][7]))
+        self.assertFalse(result['phase_section'].drop(7).isna().any())
+
+    def test_unknown_format(self):
+        with self.assertRaises(NotImplementedError):
+            dimension_schedule('schedule.txt', self.destination)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        source = os.path.join(self.folder.name, 'schedule.parquet')
+        destination = os.path.join(self.folder.name, 'sections.parquet')
+        schedule(100).to_parquet(source, index=False)
+
+        self.assertEqual(dimension_schedule(source, destination, 30), 100)
+        self.assertEqual(len(pd.read_parquet(destination)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.condutor_dimensioning.exceptions import NotInTableError
+u = ie.ureg
+
+
+class TestSelectSection(unittest.TestCase):
+    def setUp(self):
+        self.section = ie.CupperPVC('B1', 0.8, 3)
+
+        rng = np.random.default_rng(0)
+        size = 3000
+        self.circuits = (
+            rng.uniform(1, 400, size),
+            rng.uniform(5, 300, size).round(),
+            rng.choice([0.02, 0.03, 0.04], size),
+            rng.uniform(1, 10, size).round(1),
+            rng.choice([0.01, 0.02, 0.1], size)
+        )
+
+    def test_same_as_criteria(self):
+        for current, distance, max_fall, sc_current, time in zip(
+                *self.circuits):
+            try:
+                expected = max(
+                    self.section.by_amperage_raw(current),
+                    self.section.by_voltage_drop_raw(
+                        current, distance, max_fall),
+                    self.section.by_short_circuit_raw(sc_current, time)
+                )
+            except NotInTableError:
+                with self.assertRaises(NotInTableError):
+                    self.section.select_section_raw(
+                        current, distance, max_fall, sc_current, time)
+                continue
+
+            result = self.section.select_section_raw(
+                current, distance, max_fall, sc_current, time)
+            self.assertEqual(result.section, expected)
+            self.assertEqual(
+                result.section, getattr(result, result.criterion))
+
+    def test_criterion(self):
+        result = self.section.select_section(
+            40*u.ampere, 29*u.meter, 0.03, 4*u.kiloampere, 0.01*u.second)
+        self.assertEqual(result, (10, 4, 4, 2.5, 10, 'amperage'))
+
+        result = self.section.select_section(
+            20*u.ampere, 29*u.meter, 0.03, 4*u.kiloampere, 0.01*u.second)
+        self.assertEqual(result, (2.5, 2.5, 4, 2.5, 4, 'short_circuit'))
+
+        result = self.section.select_section(
+            40*u.ampere, 160*u.meter, 0.03)
+        self.assertEqual(result.criterion, 'voltage_drop')
+        self.assertIsNone(result.short_circuit)
+        self.assertEqual(
+            result.section,
+            self.section.by_voltage_drop(
+                40*u.ampere, 160*u.meter, 0.03).magnitude)
+
+        # Ties go to the first criterion.
+        result = self.section.select_section(20*u.ampere)
+        self.assertEqual(result.amperage, result.min_section)
+        self.assertEqual(result.criterion, 'amperage')
+
+        result = self.section.select_section(1*u.ampere)
+        self.assertEqual(result.amperage, 0.5)
+        self.assertEqual(result.section, 2.5)
+        self.assertEqual(result.criterion, 'min_section')
+
+    def test_keyword_arguments(self):
+        positional = self.section.select_section_raw(100, 50, 0.03, 4, 0.1)
+        for maxsize in (0, 128):
+            ie.memo.configure(maxsize)
+            try:
+                self.assertEqual(self.section.select_section_raw(
+                    100, distance=50, max_fall=0.03,
+                    short_circuit_current=4, fault_elimination_time=0.1),
+                    positional)
+                self.assertEqual(self.section.select_section_raw(
+                    current=100, short_circuit_current=4,
+                    fault_elimination_time=0.1).voltage_drop, None)
+                self.assertEqual(self.section.select_section(
+                    100*u.ampere, distance=50*u.meter, max_fall=0.03),
+                    self.section.select_section_raw(100, 50, 0.03))
+            finally:
+                ie.memo.configure(0)
+                ie.memo.clear()
+
+    def test_ladder_follows_corrections(self):
+        ladder = self.section.ladder()
+        self.assertIs(self.section.ladder(), ladder)
+
+        before = self.section.select_section_raw(100).section
+        self.section.grouping_correction(4)
+        self.assertIsNot(self.section.ladder(), ladder)
+        self.assertEqual(
+            self.section.select_section_raw(100).section,
+            self.section.by_amperage_raw(100))
+        self.assertGreater(
+            self.section.select_section_raw(100).section, before)
+
+    def test_batch_same_as_scalar(self):
+        batch = self.section.select_sections(*self.circuits)
+        dimensioned = self.section.dimension_batch(*self.circuits)
+        np.testing.assert_array_equal(
+            np.ma.getmaskarray(batch.section),
+            np.ma.getmaskarray(dimensioned.phase))
+        np.testing.assert_array_equal(
+            batch.section.filled(0), dimensioned.phase.filled(0))
+
+        for idx, circuit in enumerate(zip(*self.circuits)):
+            if batch.section[idx] is np.ma.masked:
+                continue
+            result = self.section.select_section_raw(*circuit)
+            self.assertEqual(batch.criterion[idx], result.criterion)
+            self.assertEqual(batch.amperage[idx], result.amperage)
+
+    def test_batch_without_criteria(self):
+        result = self.section.select_sections([1, 40, 10000])
+        self.assertIsNone(result.voltage_drop)
+        np.testing.assert_array_equal(
+            result.criterion, ['min_section', 'amperage', 'amperage'])
+        self.assertIs(result.section[2], np.ma.masked)
+
+
+if __name__ == '__main__':
+    unittest.main()
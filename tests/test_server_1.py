@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import instelec as ie
+from instelec.server import Client, RequestError, SizingServer
+u = ie.ureg
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.folder.name, 'instelec.sock')
+        cls.server = SizingServer(cls.path)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        cls.folder.cleanup()
+
+    def setUp(self):
+        self.client = Client(self.path)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_engine_current(self):
+        result = self.client.call(
+            'engine.current', power=8, power_factor=0.8, phase_num=1)
+        self.assertAlmostEqual(result['current'], 36.36, places=2)
+
+    def test_engine_group(self):
+        result = self.client.call('engine_group', engines=[
+            {'power': 8, 'power_factor': 0.8, 'phase_num': 1},
+            {'power': 35, 'power_factor': 0.7, 'phase_num': 3},
+            {'power': 11, 'power_factor': 0.8, 'phase_num': 1},
+        ])
+        self.assertAlmostEqual(result['active'], 39.70, places=2)
+        self.assertAlmostEqual(result['charge_current'], 103.18, places=2)
+        self.assertEqual(len(result['phase_currents']), 3)
+
+    def test_empty_engine_group(self):
+        response = self.client.send(
+            {'id': 1, 'method': 'engine_group', 'params': {'engines': []}})
+        self.assertEqual(response['error']['type'], 'RequestError')
+
+    def test_sections(self):
+        circuit = {'method': 'B1', 'power_factor': 0.8, 'phase_num': 1}
+        current = 36.36363636
+
+        self.assertEqual(self.client.call(
+            'section.by_amperage', current=current, **circuit),
+            {'section': 6})
+        self.assertEqual(self.client.call(
+            'section.by_voltage_drop', current=current, distance=29,
+            max_fall=0.03, **circuit), {'section': 6})
+        self.assertEqual(self.client.call(
+            'section.by_short_circuit', short_circuit_current=4,
+            fault_elimination_time=0.01, **circuit), {'section': 4})
+
+        result = self.client.call(
+            'section.dimension', current=current, distance=29, max_fall=0.03,
+            short_circuit_current=4, fault_elimination_time=0.01, **circuit)
+        self.assertEqual(result['phase'], 6)
+        self.assertEqual(result['protection'], 6)
+
+    def test_corrections(self):
+        result = self.client.call(
+            'section.by_amperage', current=80, method='B1',
+            power_factor=0.8, phase_num=3, grouping=3)
+        self.assertEqual(result['section'], 50)
+
+    def test_batch(self):
+        response = self.client.send([
+            {'id': 'a', 'method': 'engine.current',
+             'params': {'power': 8, 'power_factor': 0.8, 'phase_num': 1}},
+            {'id': 'b', 'method': 'unknown'},
+            {'id': 'c', 'method': 'section.by_amperage',
+             'params': {'current': 1e6, 'method': 'B1',
+                        'power_factor': 0.8, 'phase_num': 3}},
+        ])
+        self.assertEqual([item['id'] for item in response], ['a', 'b', 'c'])
+        self.assertIn('result', response[0])
+        self.assertEqual(response[1]['error']['type'], 'RequestError')
+        self.assertEqual(response[2]['error']['type'], 'NotInTableError')
+
+    def test_errors(self):
+        with self.assertRaises(RequestError):
+            self.client.call('engine.current', power=8)
+        response = self.client.send('not a request')
+        self.assertEqual(response['error']['type'], 'RequestError')
+
+    def test_concurrent_clients(self):
+        results = []
+
+        def run():
+            with Client(self.path) as client:
+                for _ in range(20):
+                    results.append(client.call(
+                        'engine.current', power=8, power_factor=0.8,
+                        phase_num=1)['current'])
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 80)
+        self.assertEqual(len(set(results)), 1)
+
+    def test_stats(self):
+        self.client.call(
+            'engine.current', power=8, power_factor=0.8, phase_num=1)
+        stats = self.client.call('stats')
+        self.assertGreaterEqual(stats['requests'], 1)
+        self.assertGreater(stats['throughput'], 0)
+        self.assertGreaterEqual(stats['max_latency'], stats['mean_latency'])
+
+    def test_reload(self):
+        result = self.client.call('reload')
+        self.assertEqual(result['changed'], [])
+        self.assertEqual(result['generation'], ie.registry.generation)
+
+
+if __name__ == '__main__':
+    unittest.main()
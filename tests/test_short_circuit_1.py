@@ -0,0 +1,100 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.short_circuit import (
+    cumulative_impedances, currents_raw, fault_currents_raw)
+u = ie.ureg
+
+
+class TestShortCircuit(unittest.TestCase):
+    def setUp(self):
+        eng1 = ie.Engine(ie.PowerTriangle(8*u.kilovolt_ampere, 0.8), 1)
+        eng2 = ie.Engine(ie.PowerTriangle(35*u.kilovolt_ampere, 0.7), 3)
+
+        self.load1 = ie.Load(eng1, feeder=ie.Feeder(
+            ie.CupperPVC('B1', 0.8, 1), 29, 0.03, None, 0.01))
+        self.load2 = ie.Load(eng2, feeder=ie.Feeder(
+            ie.CupperPVC('B1', 0.8, 3), 50, 0.03, None, 0.1))
+        self.load3 = ie.Load(eng1)
+        self.ccm1 = ie.Board(
+            [self.load1, self.load2, self.load3], name='CCM1',
+            feeder=ie.Feeder(ie.CupperPVC('B1', 0.74, 3), 160, 0.03,
+                             None, 0.5))
+        self.main = ie.Board([self.ccm1], name='QGBT')
+
+    def test_same_as_loop(self):
+        rng = np.random.default_rng(0)
+        size = 2000
+        parents = np.array(
+            [-1] + [rng.integers(-1, idx) for idx in range(1, size)])
+        impedances = rng.random(size) + 1j*rng.random(size)
+
+        expected = np.zeros(size, dtype=complex)
+        for idx in range(size):
+            node = idx
+            while node >= 0:
+                expected[idx] += impedances[node]
+                node = parents[node]
+
+        np.testing.assert_allclose(
+            cumulative_impedances(parents, impedances), expected)
+
+        # A chain is the deepest tree.
+        chain = cumulative_impedances(np.arange(-1, size - 1), np.ones(size))
+        np.testing.assert_allclose(chain.real, np.arange(1, size + 1))
+
+    def test_invalid_parents(self):
+        with self.assertRaises(ValueError):
+            cumulative_impedances([1, 0], [1, 1])
+        with self.assertRaises(ValueError):
+            cumulative_impedances([-1, 2], [1, 1])
+
+    def test_source_impedance(self):
+        impedance = ie.source_impedance_raw(20, x_over_r=5)
+        self.assertAlmostEqual(impedance.imag, 5*impedance.real)
+        self.assertAlmostEqual(currents_raw(impedance), 20)
+        self.assertAlmostEqual(
+            fault_currents_raw([-1], [0], impedance)[0], 20)
+
+    def test_study(self):
+        source = ie.source_impedance_raw(20)
+        study = ie.short_circuit_study(self.main, source)
+        nodes = study.nodes
+
+        self.assertAlmostEqual(study.current_of(self.main).magnitude, 20)
+        self.assertTrue(np.all(np.diff(study.currents[:2]) < 0))
+        self.assertEqual(
+            study.current_of(self.load3), study.current_of(self.ccm1))
+        self.assertEqual(
+            study.origin_currents[nodes.index(self.load1)],
+            study.currents[nodes.index(self.ccm1)])
+
+        for node in (self.ccm1, self.load1, self.load2):
+            idx = nodes.index(node)
+            feeder = node.feeder
+            expected = feeder.section.by_short_circuit_raw(
+                study.origin_currents[idx], feeder.fault_elimination_time)
+            self.assertLessEqual(study.required[idx], expected)
+            self.assertEqual(
+                study.sufficient[idx],
+                study.required[idx] <= node.sections().phase)
+
+        for node in (self.main, self.load3):
+            self.assertIs(study.required[nodes.index(node)], np.ma.masked)
+            self.assertIs(study.sufficient[nodes.index(node)], np.ma.masked)
+
+        # The feeder of the board is too small for the source.
+        self.assertFalse(study.sufficient[nodes.index(self.ccm1)])
+
+    def test_weaker_source_lower_currents(self):
+        strong = ie.short_circuit_study(
+            self.main, ie.source_impedance_raw(20))
+        weak = ie.short_circuit_study(self.main, ie.source_impedance_raw(10))
+        self.assertTrue(np.all(weak.currents < strong.currents))
+        self.assertTrue(np.all(weak.required.filled(0)
+                               <= strong.required.filled(0)))
+
+if __name__ == '__main__':
+    unittest.main()
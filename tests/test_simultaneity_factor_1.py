@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+import instelec as ie
+from instelec.engines import OutOfRangeError
+u = ie.ureg
+
+
+class TestSimultaneityFactor(unittest.TestCase):
+    def test_single_engine(self):
+        self.assertEqual(ie.simultaneity_factor(1, 1000*u.horsepower), 1.0)
+
+    def test_table_values(self):
+        self.assertEqual(ie.simultaneity_factor(2, 1*u.horsepower), 0.85)
+        self.assertEqual(ie.simultaneity_factor(3, 1*u.horsepower), 0.8)
+        self.assertEqual(ie.simultaneity_factor(50, 30*u.horsepower), 0.5)
+        self.assertEqual(ie.simultaneity_factor(80, 30*u.horsepower), 0.5)
+        self.assertEqual(ie.simultaneity_factor(2, 100*u.horsepower), 0.9)
+
+    def test_shared_limit(self):
+        # 40 HP closes the third interval and opens the fourth.
+        self.assertEqual(ie.simultaneity_factor(2, 40*u.horsepower), 0.8)
+
+    def test_out_of_range(self):
+        with self.assertRaises(OutOfRangeError):
+            ie.simultaneity_factor(2, 2.7*u.horsepower)
+        with self.assertRaises(OutOfRangeError):
+            ie.simultaneity_factor(2, 0.5*u.horsepower)
+
+    def test_batched(self):
+        counts = np.array([1, 2, 3, 50, 80, 2, 1])
+        powers = np.array([0.1, 1, 1, 30, 30, 100, 2.7])*u.horsepower
+
+        factors = ie.simultaneity_factors(counts, powers)
+        expected = [
+            ie.simultaneity_factor(count, power)
+            for count, power in zip(counts, powers)
+        ]
+        np.testing.assert_array_equal(factors, expected)
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from instelec import settings
+from instelec.table_bundle import (
+    InvalidTableError, TableBundle, compile_tables, read_source, validate)
+
+
+class TestTableBundle(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.bundle_path = Path(self.directory.name) / 'tables.npy'
+        compile_tables(settings, self.bundle_path)
+        self.bundle = TableBundle(self.bundle_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tables(self):
+        for filepath, index_col in [
+            (settings.AMPERAGE_TABLE['cupper']['PVC'], 'nominal_sections'),
+            (settings.VOLTAGE_DROP_TABLE, 'section'),
+            (settings.GROUPING_TABLE, None),
+            (settings.TEMPERATURE_TABLE['ambiente'], 'temperatura'),
+            (settings.SIMULTANEITY_TABLE, None),
+        ]:
+            table = self.bundle.table(filepath)
+            pd.testing.assert_frame_equal(
+                table, read_source(filepath, index_col).astype(float),
+                check_index_type=False)
+
+    def test_memory_mapped(self):
+        self.assertIsInstance(self.bundle.data, np.memmap)
+        table = self.bundle.table(settings.VOLTAGE_DROP_TABLE)
+        self.assertFalse(table.to_numpy().flags.writeable)
+
+    def test_unknown_table(self):
+        self.assertIsNone(self.bundle.table(Path('unknown.csv')))
+
+    def test_corrupted(self):
+        data = np.load(self.bundle_path)
+        data[0] += 1
+        np.save(self.bundle_path, data)
+
+        # The hash is only checked when asked for.
+        bundle = TableBundle(self.bundle_path)
+        with self.assertRaises(ValueError):
+            bundle.verify()
+        with self.assertRaises(ValueError):
+            TableBundle(self.bundle_path, verify=True)
+
+    def test_validation(self):
+        table = pd.DataFrame(
+            {'B1_2': [10, 20, 15]}, index=pd.Index([1.5, 2.5, 4]))
+        with self.assertRaises(InvalidTableError):
+            validate('amperage', table, 'table')
+
+        table = pd.DataFrame({'B1': [1, 0.8, 0.9]})
+        with self.assertRaises(InvalidTableError):
+            validate('grouping', table, 'table')
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec import settings
+from instelec.table_registry import registry
+u = ie.ureg
+
+
+def dimension():
+    rng = np.random.default_rng(0)
+    size = 5000
+    section = ie.CupperPVC('B1', 0.8, 3)
+    section.temperature_correction(u.Quantity(40, u.degC))
+    return section.dimension_batch(
+        rng.uniform(1, 600, size),
+        rng.uniform(5, 300, size),
+        rng.uniform(0.01, 0.05, size)
+    )
+
+
+class TestTableDtype(unittest.TestCase):
+    def setUp(self):
+        self.dtype = settings.TABLE_DTYPE
+
+    def tearDown(self):
+        settings.TABLE_DTYPE = self.dtype
+        registry.clear()
+
+    def test_default(self):
+        registry.clear()
+        for key in [('amperage', 'cupper', 'PVC'), ('voltage_drop',),
+                    ('temperature', 'ambiente'), ('grouping',)]:
+            table = registry.get(*key)
+            self.assertTrue(all(table.dtypes == np.float64), key)
+
+        # Not rounded, as the float16 tables were.
+        section = ie.CupperPVC('B1', 0.8, 3)
+        section.temperature_correction(u.Quantity(40, u.degC))
+        self.assertEqual(section.amperage.correction, 0.87)
+
+    def test_float32(self):
+        registry.clear()
+        expected = dimension()
+
+        settings.TABLE_DTYPE = 'float32'
+        registry.clear()
+        table = registry.get('amperage', 'cupper', 'PVC')
+        self.assertTrue(all(table.dtypes == np.float32))
+
+        result = dimension()
+        for field in ('amperage', 'voltage_drop', 'phase'):
+            np.testing.assert_array_equal(
+                getattr(result, field).filled(0),
+                getattr(expected, field).filled(0))
+
+    def test_invalid(self):
+        settings.TABLE_DTYPE = 'float16'
+        registry.clear()
+        with self.assertRaises(ValueError):
+            registry.get('voltage_drop')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.condutor_dimensioning.exceptions import NotInTableError
+from instelec.condutor_dimensioning.temperature_correction import (
+    TemperatureCorrectionAmbient, TemperatureCorrectionGround)
+u = ie.ureg
+
+
+class TestTemperatureCorrection(unittest.TestCase):
+    def setUp(self):
+        self.pvc = TemperatureCorrectionAmbient('PVC')
+        self.table = self.pvc.table['PVC']
+
+    def test_step(self):
+        # The factor of the first temperature tabulated not below.
+        for temperature in range(0, 61):
+            expected = next(
+                factor for value, factor in self.table.items()
+                if value >= temperature)
+            self.assertEqual(
+                self.pvc.correction_factors_raw(temperature), expected)
+
+    def test_not_supported(self):
+        # PVC has no factors above 60 °C.
+        for temperature in (61, 65, 80, 100, np.nan):
+            with self.assertRaises(NotInTableError):
+                self.pvc.correction_factors_raw(temperature)
+        with self.assertRaises(NotInTableError):
+            TemperatureCorrectionGround('EPR').correction_factor(
+                u.Quantity(81, u.degC))
+
+    def test_linear(self):
+        for value, factor in self.table.dropna().items():
+            self.assertAlmostEqual(
+                self.pvc.correction_factors_raw(value, 'linear'), factor)
+
+        self.assertAlmostEqual(
+            self.pvc.correction_factors_raw(42.5, 'linear'),
+            (self.table[40] + self.table[45])/2)
+        self.assertAlmostEqual(
+            self.pvc.correction_factors_raw(0, 'linear'), self.table[10])
+
+    def test_array(self):
+        temperatures = np.array([0, 12, 30, 47.5, 60, 60.5, 75, np.nan])
+        for interpolation in ('step', 'linear'):
+            factors = self.pvc.correction_factors_raw(
+                temperatures, interpolation)
+            np.testing.assert_array_equal(
+                factors.mask, [False]*5 + [True]*3)
+
+            for temperature, factor in zip(temperatures[:5], factors[:5]):
+                self.assertEqual(factor, self.pvc.correction_factors_raw(
+                    temperature, interpolation))
+
+    def test_quantity_array(self):
+        factors = TemperatureCorrectionAmbient('EPR').correction_factor(
+            u.Quantity(np.array([20, 70, 85]), u.degC))
+        self.assertEqual(factors.count(), 2)
+
+    def test_unknown_interpolation(self):
+        with self.assertRaises(ValueError):
+            self.pvc.correction_factors_raw(30, 'cubic')
+
+    def test_section(self):
+        section = ie.CupperPVC('B1', 0.8, 3)
+        section.temperature_correction(u.Quantity(42.5, u.degC), 'linear')
+        self.assertAlmostEqual(
+            section.amperage.correction,
+            (self.table[40] + self.table[45])/2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+import instelec as ie
+from instelec.condutor_dimensioning.batch import by_voltage_drop_table
+from instelec.condutor_dimensioning.exceptions import NotInTableError
+from instelec.settings import VOLTAGE_FF_RAW
+
+
+def scan(voltage_drop, current, distance, max_fall, power_factor):
+    """
+    The search row by row the impedance keys replace.
+    """
+    sin = np.sqrt(1 - power_factor**2)
+    for section, resistance, reactance in zip(
+            voltage_drop.sections,
+            voltage_drop.resistance,
+            voltage_drop.reactance):
+        impedance = resistance*power_factor + reactance*sin
+        fall = np.sqrt(3)*current*distance*impedance/(10*VOLTAGE_FF_RAW)
+        if fall <= 100*max_fall:
+            return float(section)
+    return None
+
+
+class TestImpedanceSearch(unittest.TestCase):
+    def test_keys_are_sorted_and_cached(self):
+        voltage_drop = ie.CupperPVC('B1', 0.8, 3).voltage_drop
+        keys = voltage_drop.impedance_keys(0.8)
+
+        self.assertTrue(np.all(np.diff(keys) >= 0))
+        self.assertIs(keys, voltage_drop.impedance_keys(0.8))
+
+    def test_keys_cache_is_bounded(self):
+        voltage_drop = ie.CupperPVC('B1', 0.8, 3).voltage_drop
+        size = voltage_drop.IMPEDANCE_KEYS_CACHE_SIZE
+        keys = voltage_drop.impedance_keys(0.8)
+
+        for power_factor in np.linspace(0.5, 0.99, 2*size):
+            voltage_drop.impedance_keys(float(power_factor))
+            # The one used last is kept.
+            voltage_drop.impedance_keys(0.8)
+        self.assertEqual(len(voltage_drop._impedance_keys), size)
+        self.assertIs(voltage_drop.impedance_keys(0.8), keys)
+
+        # The batches do not store the keys of their power factors.
+        section = ie.CupperPVC('B1', 0.8, 3)
+        by_voltage_drop_table(
+            section, np.ones(100), np.ones(100), np.full(100, 0.04),
+            np.linspace(0.5, 1, 100))
+        self.assertEqual(len(section.voltage_drop._impedance_keys), 0)
+
+    def test_keys_cache_shared_between_threads(self):
+        voltage_drop = ie.CupperPVC('B1', 0.8, 3).voltage_drop
+        size = voltage_drop.IMPEDANCE_KEYS_CACHE_SIZE
+        power_factors = [float(pf) for pf in np.linspace(0.5, 0.99, 2*size)]
+        errors = []
+
+        def run(offset):
+            try:
+                for _ in range(20):
+                    for pf in power_factors[offset:] + power_factors[:offset]:
+                        voltage_drop.impedance_keys(pf)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [
+            threading.Thread(target=run, args=(offset,))
+            for offset in range(0, 2*size, size//2)
+        ]
+        # Switching threads often makes the races likely.
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(voltage_drop._impedance_keys), size)
+
+    def test_same_as_scan(self):
+        rng = np.random.default_rng(0)
+        for _ in range(500):
+            power_factor = float(rng.choice([0.7, 0.85, 1.0]))
+            voltage_drop = ie.CupperPVC('B1', power_factor, 3).voltage_drop
+            args = (rng.uniform(1, 1500), rng.uniform(1, 400),
+                    float(rng.choice([0.02, 0.04])), power_factor)
+
+            try:
+                section = voltage_drop.get_section_raw(*args)
+            except NotInTableError:
+                section = None
+            self.assertEqual(section, scan(voltage_drop, *args))
+
+    def test_batch_with_many_power_factors(self):
+        rng = np.random.default_rng(1)
+        size = 2000
+        section = ie.CupperPVC('B1', 0.8, 3)
+        args = (rng.uniform(1, 1500, size), rng.uniform(1, 400, size),
+                rng.choice([0.02, 0.04], size), rng.uniform(0.6, 1, size))
+
+        result = by_voltage_drop_table(section, *args)
+        for idx, circuit in enumerate(zip(*args)):
+            expected = scan(section.voltage_drop, *circuit)
+            if expected is None:
+                self.assertIs(result[idx], np.ma.masked)
+            else:
+                self.assertEqual(result[idx], expected)
+
+    def test_no_current(self):
+        voltage_drop = ie.CupperPVC('B1', 0.8, 3).voltage_drop
+        self.assertEqual(
+            voltage_drop.get_section_raw(0, 100, 0.04, 0.8),
+            voltage_drop.sections[0])
+
+
+if __name__ == '__main__':
+    unittest.main()